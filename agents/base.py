@@ -0,0 +1,40 @@
+import asyncio
+
+
+class AsyncAgent:
+    """Interface assíncrona comum aos agentes.
+
+    Cada agente expõe suas fontes em ``sources()`` e sabe buscar uma fonte
+    isolada em ``fetch_source(source)``, devolvendo as notícias encontradas
+    sem filtrar pelo cache. O motor de coleta chama ``afetch_source`` para
+    todas as fontes de todos os agentes ao mesmo tempo; agentes que tiverem
+    um cliente realmente assíncrono podem sobrescrever esse método.
+
+    Agentes com ``isolated = True`` (navegador, parsing pesado) rodam num
+    processo separado quando o motor tem um ``ProcessAgentPool``; o
+    processo recria o agente com ``process_spec()``.
+    """
+
+    name = None
+    isolated = False
+
+    def sources(self):
+        return [{"name": self.name, "url": self.url}]
+
+    def process_spec(self):
+        """``(fábrica, argumentos)`` que recriam o agente em outro processo."""
+        return type(self), ()
+
+    def fetch_source(self, source):
+        raise NotImplementedError
+
+    def hubs(self):
+        """``{fonte: (hub, tópico)}`` das fontes que podem receber notícias por WebSub."""
+        return {}
+
+    def parse_pushed(self, source, content):
+        """Extrai as notícias de um feed entregue pelo hub WebSub da fonte."""
+        raise NotImplementedError
+
+    async def afetch_source(self, source):
+        return await asyncio.to_thread(self.fetch_source, source)
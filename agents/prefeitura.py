@@ -1,55 +1,60 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import json
 import os
-import time
-import requests
-import hashlib
+from agents.base import AsyncAgent
+from core import api_capture
+from core.browser_pool import get_browser_pool
+from core.delivery import get_worker
+from core.digest import escape_html
+from core.seen_store import compute_key, get_seen_store
 
 TELEGRAM_TOKEN = "xxxxxxx"
 TELEGRAM_CHAT_ID = "xxxxxxx"
 
-CACHE_FILE = "../news_cache.json"
+API_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "prefeitura_api.json")
 
-class PrefeituraCampinasAgent:
-    def __init__(self):
-        self.cache = self._load_cache()
+class PrefeituraCampinasAgent(AsyncAgent):
+    isolated = True
+
+    def __init__(self, api=None):
+        self._cache = None
         self.name = "Prefeitura de Campinas"
         self.url = "https://campinas.sp.gov.br/mais-noticias/"
+        self.api = api or api_capture.load_mapping(API_FILE)
+
+    def process_spec(self):
+        return type(self), (self.api,)
     
+    @property
+    def cache(self):
+        """Registro de vistos, aberto no primeiro uso: o processo do pool só busca e nunca chega a abri-lo."""
+        if self._cache is None:
+            self._cache = self._load_cache()
+        return self._cache
+
     def _load_cache(self):
-        if os.path.exists(CACHE_FILE):
-            try:
-                with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    if content.strip():
-                        return set(json.loads(content))
-            except json.JSONDecodeError:
-                print("Erro no cache. Criando novo arquivo...")
-        return set()
+        return get_seen_store()
 
     def _save_cache(self):
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(list(self.cache), f, ensure_ascii=False, indent=4)
+        self.cache.commit()
 
-    def _compute_hash(self, text):
-        value = text.encode("utf-8")
-        return hashlib.md5(value).hexdigest()
+    def fetch_source(self, source):
+        if self.api:
+            try:
+                news_list = api_capture.fetch_api(self.api, self.name)
+                if news_list:
+                    print(f"Notícias encontradas via API ({self.name}): {len(news_list)}")
+                    return news_list
+                print(f"API sem notícias ({self.name}); usando o navegador.")
+            except Exception as e:
+                print(f"API mudou ({self.name}): {str(e)}; usando o navegador.")
+        return self._fetch_browser(source)
 
-    def fetch_news(self):
-        options = webdriver.ChromeOptions()
-        options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        
-        driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-        driver.get(self.url)
-        
-        try:
+    def _fetch_browser(self, source):
+        with get_browser_pool().driver() as driver:
+            driver.get(source["url"])
+            
             WebDriverWait(driver, 10).until(
                 EC.presence_of_all_elements_located((By.CSS_SELECTOR, "li.mt-5.divisor.ng-star-inserted"))
             )
@@ -69,15 +74,28 @@ class PrefeituraCampinasAgent:
                         "source": self.name,
                         "date": date
                     }
-                    news_hash = self._compute_hash(title + link)
-                    if news_hash not in self.cache:
-                        news_list.append(news_item)
-                        self.cache.add(news_hash)
+                    news_list.append(news_item)
                 except Exception as e:
                     print(f"Erro ao extrair notícia: {str(e)}")
+            if news_list:
+                self._discover_api(driver, news_list[0])
             return news_list
-        finally:
-            driver.quit()
+
+    def _discover_api(self, driver, sample):
+        mapping = api_capture.discover(driver, sample, self.name)
+        if mapping and mapping != self.api:
+            self.api = mapping
+            api_capture.save_mapping(API_FILE, mapping)
+
+    def fetch_news(self):
+        news_list = []
+        for source in self.sources():
+            for news_item in self.fetch_source(source):
+                news_hash = compute_key(news_item["title"], news_item["link"])
+                if news_hash not in self.cache:
+                    news_list.append(news_item)
+                    self.cache.add(news_hash)
+        return news_list
 
     def send_telegram(self, news_list):
         if not news_list:
@@ -86,29 +104,14 @@ class PrefeituraCampinasAgent:
         
         for news in news_list:
             message = (
-                f"📌 <b>{news['title']}</b>\n"
-                f"📅 Data: {news['date']}\n"
-                f"🔗 Link: {news['link']}\n"
-                f"📢 Fonte: {news['source']}"
+                f"📌 <b>{escape_html(news['title'])}</b>\n"
+                f"📅 Data: {escape_html(news['date'])}\n"
+                f"🔗 Link: {escape_html(news['link'])}\n"
+                f"📢 Fonte: {escape_html(news['source'])}"
             )
             
-            url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-            payload = {
-                "chat_id": TELEGRAM_CHAT_ID,
-                "text": message,
-                "parse_mode": "HTML"
-            }
-            
-            try:
-                response = requests.post(url, json=payload)
-                if response.status_code == 200:
-                    print(f"Notícia enviada: {news['title']}")
-                else:
-                    print(f"Falha ao enviar notícia: {response.text}")
-            except Exception as e:
-                print(f"Erro ao enviar: {str(e)}")
-            
-            time.sleep(5)
+            get_worker(TELEGRAM_TOKEN).enqueue(TELEGRAM_CHAT_ID, message, parse_mode="HTML")
+            print(f"Notícia enfileirada: {news['title']}")
 
     def run(self):
         print(f"Iniciando busca por notícias do {self.name}...")
@@ -123,4 +126,5 @@ class PrefeituraCampinasAgent:
 
 if __name__ == "__main__":
     agent = PrefeituraCampinasAgent()
-    agent.run()
\ No newline at end of file
+    agent.run()
+    get_worker(TELEGRAM_TOKEN).flush()
\ No newline at end of file
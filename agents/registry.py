@@ -0,0 +1,55 @@
+import importlib
+import threading
+
+from agents.base import AsyncAgent
+
+# Agentes com classe própria, declarados sem importar o módulo: selenium,
+# webdriver_manager e companhia só são carregados quando a primeira fonte do
+# agente é buscada (ou nem isso, se ele roda no pool de processos).
+REGISTERED_AGENTS = [
+    {
+        "name": "Prefeitura de Campinas",
+        "url": "https://campinas.sp.gov.br/mais-noticias/",
+        "factory": "agents.prefeitura:PrefeituraCampinasAgent",
+        "isolated": True
+    },
+]
+
+
+def load_factory(path):
+    """Resolve ``"pacote.modulo:Classe"`` importando o módulo só agora."""
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def build_registered(path):
+    return load_factory(path)()
+
+
+class LazyAgent(AsyncAgent):
+    """Representa um agente registrado até a primeira busca, sem importar o módulo dele."""
+
+    def __init__(self, name, url, factory, isolated=False):
+        self.name = name
+        self.url = url
+        self.factory = factory
+        self.isolated = isolated
+        self._agent = None
+        self._lock = threading.Lock()
+
+    @property
+    def agent(self):
+        with self._lock:
+            if self._agent is None:
+                self._agent = load_factory(self.factory)()
+            return self._agent
+
+    def fetch_source(self, source):
+        return self.agent.fetch_source(source)
+
+    def process_spec(self):
+        return build_registered, (self.factory,)
+
+
+def registered_agents():
+    return [LazyAgent(**entry) for entry in REGISTERED_AGENTS]
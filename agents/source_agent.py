@@ -0,0 +1,155 @@
+import time
+from agents.base import AsyncAgent
+from core.delivery import get_worker
+from core.digest import escape_html
+from core.scheduler import AdaptiveScheduler
+from core.seen_store import compute_key, get_seen_store
+from core.sources import compile_sources, load_definitions
+
+TELEGRAM_TOKEN = "xxxxxxxxxx"
+TELEGRAM_CHAT_ID = "xxxxxxx"
+
+class SourceAgent(AsyncAgent):
+    """Agente genérico que monitora as fontes declaradas em ``sources.json``.
+
+    Um site novo é só uma definição a mais no arquivo; o agente reúne as
+    fontes do mesmo grupo (campo ``agent``, ou o próprio ``name``).
+    """
+
+    telegram_token = TELEGRAM_TOKEN
+    telegram_chat_id = TELEGRAM_CHAT_ID
+
+    def __init__(self, name, compiled_sources=None):
+        self._cache = None
+        self.name = name
+        if compiled_sources is None:
+            definitions = [d for d in load_definitions() if d.get("agent", d["name"]) == name]
+            compiled_sources = compile_sources(definitions)
+        self.compiled = {source.name: source for source in compiled_sources}
+        self.news_sources = [source.definition for source in compiled_sources]
+
+    @property
+    def cache(self):
+        """Registro de vistos, aberto no primeiro uso: o processo do pool só busca e nunca chega a abri-lo."""
+        if self._cache is None:
+            self._cache = self._load_cache()
+        return self._cache
+
+    def _load_cache(self):
+        return get_seen_store()
+
+    def _save_cache(self):
+        self.cache.commit()
+
+    @property
+    def isolated(self):
+        return any(source.get("process") for source in self.news_sources)
+
+    def process_spec(self):
+        return build_agent, (self.name, self.news_sources)
+
+    def sources(self):
+        return self.news_sources
+
+    def hubs(self):
+        return {name: source.hub for name, source in self.compiled.items() if source.hub}
+
+    def parse_pushed(self, source, content):
+        return self.compiled[source["name"]].parse_feed(content)
+
+    def _seen(self, news_item):
+        return compute_key(news_item["title"], news_item["link"]) in self.cache
+
+    def fetch_source(self, source):
+        """Erros sobem para o motor, que registra a falha e aplica o recuo do agendador."""
+        print(f"\nVerificando fonte: {source['name']}")
+        # Fontes com "process" rodam no pool, sem o registro de vistos: o stream lê a listagem inteira.
+        seen = None if source.get("process") else self._seen
+        return self.compiled[source["name"]].fetch(seen=seen)
+
+    def _new_items(self, items):
+        news_list = []
+        for news_item in items:
+            news_hash = compute_key(news_item["title"], news_item["link"])
+            if news_hash not in self.cache:
+                news_list.append(news_item)
+                self.cache.add(news_hash)
+        return news_list
+
+    def fetch_news(self):
+        news_list = []
+        for source in self.news_sources:
+            try:
+                items = self.fetch_source(source)
+            except Exception as e:
+                print(f"Erro no scraping ({source['name']}): {str(e)}")
+                continue
+            news_list.extend(self._new_items(items))
+        return news_list
+
+    def send_telegram(self, news_list):
+        if not news_list:
+            print(f"Nenhuma notícia nova encontrada para {self.name}.")
+            return
+        for news in news_list:
+            message = f"📌 <b>{escape_html(news['title'])}</b>\n"
+            if news.get("date"):
+                message += f"📅 Data: {escape_html(news['date'])}\n"
+            if news.get("category"):
+                message += f"📢 Categoria: {escape_html(news['category'])}\n"
+            message += (
+                f"🔗 Link: {escape_html(news['link'])}\n"
+                f"💬 Fonte: {escape_html(news['source'])}"
+            )
+            get_worker(self.telegram_token).enqueue(self.telegram_chat_id, message, parse_mode="HTML")
+            print(f"Notícia enfileirada: {news['title']}")
+
+    def run(self):
+        print(f"Iniciando busca por notícias do {self.name}...")
+        news_list = self.fetch_news()
+        if news_list:
+            print(f"\n{len(news_list)} notícias novas encontradas!")
+            self.send_telegram(news_list)
+            self._save_cache()
+        else:
+            print(f"Nenhuma notícia nova detectada para {self.name}.")
+
+    def monitor(self, scheduler=None):
+        """Roda só este agente (``python -m agents.<módulo>``), com cada fonte no ritmo do ``AdaptiveScheduler``."""
+        scheduler = scheduler or AdaptiveScheduler()
+        sources = {source["name"]: source for source in self.news_sources}
+        for name in sources:
+            scheduler.add(name)
+        while True:
+            due = scheduler.pop_due()
+            if not due:
+                wait = max(0, scheduler.next_due() - time.time())
+                print(f"Aguardando {wait:.0f}s para a próxima fonte...")
+                time.sleep(wait)
+                continue
+            news_list = []
+            for name in due:
+                try:
+                    new_items = self._new_items(self.fetch_source(sources[name]))
+                except Exception as e:
+                    print(f"Erro no scraping ({name}): {str(e)}")
+                    scheduler.record(name, 0, error=True)
+                    continue
+                scheduler.record(name, len(new_items))
+                news_list.extend(new_items)
+            self.send_telegram(news_list)
+            self._save_cache()
+
+
+def build_agent(name, definitions):
+    """Recria o agente a partir das definições (usado pelo processo do pool)."""
+    return SourceAgent(name, compile_sources(definitions))
+
+
+def load_source_agents(path=None):
+    """Um ``SourceAgent`` por grupo de fontes, com todas as definições compiladas de uma vez."""
+    definitions = load_definitions(path) if path else load_definitions()
+    groups = {}
+    for source in compile_sources(definitions):
+        groups.setdefault(source.definition.get("agent", source.name), []).append(source)
+    return [SourceAgent(name, compiled) for name, compiled in groups.items()]
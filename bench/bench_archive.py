@@ -0,0 +1,101 @@
+"""Carga e latência de busca do arquivo de notícias com muitas linhas.
+
+Uso, a partir da raiz do projeto:
+
+    python -m bench.bench_archive [notícias]
+
+Gera ``notícias`` (padrão 1.000.000) notícias sintéticas num banco
+temporário, com títulos e resumos montados de um vocabulário com acentos,
+inserindo em lotes pelo mesmo ``NewsArchive.add`` do manager, e mede
+consultas típicas de produção: termo raro, termo comum, termo sem acento,
+prefixo, filtro por fonte e por período. Cada consulta roda 20 vezes e o
+relatório mostra a mediana e o pior caso.
+"""
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from core.archive import NewsArchive
+from core.dates import TZ
+
+SOURCES = ["G1 Campinas (RSS)", "G1 Nacional (RSS)", "Hora Campinas", "Jornal Local", "SAMPI Campinas",
+           "Prefeitura de Campinas"]
+WORDS = (
+    "prefeitura campinas vacinação dengue saúde rodovia anhanguera acidente caminhão trânsito chuva "
+    "árvores cambuí taquaral unicamp vestibular indígena polícia furto cabos energia sousas brt "
+    "corredor ouro verde ponte preta guarani série reforço feira artesanato convivência sanasa "
+    "manutenção água bairros hospital mário gatti pronto socorro infantil câmara projeto hortas "
+    "urbanas festival inverno joaquim egídio programação motoristas aplicativo protesto avenida "
+    "defesa civil alerta umidade escolas estaduais laboratórios robótica viracopos passageiros "
+    "recorde feriado temperatura região metropolitana operação buraco vagas cursos qualificação"
+).split()
+RARE = "quilombola"
+RUNS = 20
+
+
+def synthetic(count, seed=7):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=TZ)
+    step = timedelta(days=730) / count
+    for index in range(count):
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 11))).capitalize()
+        summary = " ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 30)))
+        if index % 50000 == 0:
+            title += f" {RARE}"
+        yield {
+            "title": title,
+            "link": f"https://example.com/noticia/{index}",
+            "source": SOURCES[index % len(SOURCES)],
+            "summary": summary,
+            "date": (start + step * index).strftime("%d/%m/%Y %H:%M")
+        }
+
+
+def timed(archive, **kwargs):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        results = archive.search(**kwargs)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), max(times), len(results)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workdir = tempfile.mkdtemp(prefix="bench_archive_")
+    try:
+        archive = NewsArchive(os.path.join(workdir, "archive.db"), batch_size=5000)
+        start = time.perf_counter()
+        for index, news in enumerate(synthetic(count)):
+            archive.add(news, str(index))
+        archive.commit()
+        elapsed = time.perf_counter() - start
+        size = os.path.getsize(archive.path) / (1024 * 1024)
+        print(f"{count} notícias inseridas em {elapsed:.1f}s ({count / elapsed:.0f}/s), banco com {size:.0f} MB\n")
+        queries = [
+            ("termo raro", {"query": RARE}),
+            ("termo comum", {"query": "dengue"}),
+            ("duas palavras", {"query": "vacinação infantil"}),
+            ("sem acento", {"query": "vacinacao camara"}),
+            ("prefixo", {"query": "robó*"}),
+            ("termo + fonte", {"query": "dengue", "source": "Hora Campinas"}),
+            ("termo + período", {"query": "hospital", "since": "01/06/2024", "until": "30/06/2024"}),
+            ("termo raro + período", {"query": RARE, "since": "01/01/2025", "until": "31/03/2025"}),
+            ("só período", {"since": "01/06/2024", "until": "02/06/2024"}),
+            ("só fonte", {"source": "Jornal Local"}),
+        ]
+        for label, kwargs in queries:
+            median, worst, found = timed(archive, **kwargs)
+            print(f"  {label:<22} mediana {median * 1000:6.2f} ms   pior {worst * 1000:6.2f} ms   {found} resultados")
+        archive.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""Benchmark offline do ciclo completo do monitor.
+
+Uso, a partir da raiz do projeto:
+
+    python -m bench.bench_cycle [--cycles 3] [--latency 0.05] [--items 10] [--sources 10]
+
+Sobe um ``ReplayServer`` local com as páginas gravadas em
+``bench/fixtures`` (G1 RSS e site, Hora Campinas, Jornal Local, SAMPI e a
+API da Prefeitura), aponta as definições de ``sources.json`` e o worker do
+Telegram para ele e roda ``engine.run_cycle`` + ``manager.process_results``
+como o ``monitor()``. Nada sai para a internet e o estado (SQLite e
+registro de eventos) fica num diretório temporário.
+
+Relata, por ciclo, latência, requisições e notícias enviadas; por agente,
+o tempo de busca e o tempo só de parsing; no fim, o pico de RSS e a vazão
+de mensagens aceitas pela API falsa do Telegram.
+
+``--items N`` repete os itens de cada página N vezes e ``--sources N``
+clona cada fonte N vezes (os fatores se multiplicam). Páginas ampliadas
+recebem títulos sintéticos distintos, para que a deduplicação e o
+agrupamento de notícias parecidas não escondam o volume. Com ``--fresh``
+cada ciclo traz só notícias novas; sem ele, do segundo ciclo em diante as
+fontes respondem 304, como num monitor estável.
+"""
+import argparse
+import copy
+import json
+import logging
+import os
+import random
+import re
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import redirect_stdout
+from datetime import datetime
+from io import StringIO
+
+from bs4 import BeautifulSoup
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+import manager
+from agents.prefeitura import PrefeituraCampinasAgent
+from agents.source_agent import SourceAgent, load_source_agents
+from bench.server import ReplayServer, shift_dates
+from core import api_capture, archive, delivery, events, seen_store, validators
+from core.dates import TZ
+from core.engine import FetchEngine
+from core.process_pool import ProcessAgentPool
+from core.http import connection_stats
+from core.near_duplicates import NearDuplicateIndex
+from core.scheduler import AdaptiveScheduler
+from core.sources import load_definitions
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+HTML = "text/html; charset=utf-8"
+RSS = "application/rss+xml; charset=utf-8"
+JSON = "application/json; charset=utf-8"
+FIXTURE_FILES = {
+    "G1 Campinas (RSS)": ("g1_campinas_rss.xml", RSS),
+    "G1 Nacional (RSS)": ("g1_nacional_rss.xml", RSS),
+    "G1 Campinas (Site)": ("g1_campinas.html", HTML),
+    "Hora Campinas": ("hora_campinas.html", HTML),
+    "Jornal Local": ("jornal_local.html", HTML),
+    "SAMPI Campinas": ("sampi.html", HTML),
+}
+PREFEITURA_FIXTURE = "prefeitura_api.json"
+PREFEITURA_MAPPING = {
+    "path": ["content"],
+    "title_key": "titulo",
+    "link_key": "slug",
+    "link_template": "https://campinas.sp.gov.br/noticia/{}",
+    "date_key": "dataPublicacao"
+}
+
+_SYLLABLES = "ba ca da fe gi lo mu na pe ri sa to vu xa zo tra pla cre dis mon lan ter quo bri".split()
+VOCABULARY = [a + b + c for a in _SYLLABLES for b in _SYLLABLES for c in _SYLLABLES]
+_MARKER = re.compile(r"§([TL])(\d+)§")
+_RSS_ITEM = re.compile(r"<item>.*?</item>", re.S)
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def _title(variant, index):
+    rng = random.Random(variant * 1_000_003 + index)
+    return " ".join(rng.choice(VOCABULARY) for _ in range(7)).capitalize()
+
+
+def _mark_html(node, definition, index):
+    selector = definition["fields"]["title"].get("selector")
+    title_node = node.select_one(selector) if selector else node
+    strings = [s for s in title_node.find_all(string=True) if s.strip()]
+    for position, string in enumerate(strings):
+        string.replace_with(f"§T{index}§" if position == 0 else "")
+    for tag in [node] + node.find_all(href=True):
+        if tag.get("href"):
+            tag["href"] += f"§L{index}§"
+
+
+def template_page(kind, text, definition, copies):
+    """Repete os itens da página ``copies`` vezes, trocando título e link por marcadores."""
+    if kind == RSS:
+        items = _RSS_ITEM.findall(text)
+        start, end = text.index(items[0]), text.rindex(items[-1]) + len(items[-1])
+        marked = []
+        for index in range(len(items) * copies):
+            item = re.sub(r"<title>.*?</title>", f"<title>§T{index}§</title>", items[index % len(items)], flags=re.S)
+            marked.append(re.sub(r"(<(link|guid)[^>]*>[^<]*)(</\2>)", rf"\1§L{index}§\3", item))
+        return text[:start] + "\n".join(marked) + text[end:]
+    if kind == JSON:
+        payload = json.loads(text)
+        records = api_capture._records_at(payload, definition["path"])
+        originals = list(records)
+        records.clear()
+        for index in range(len(originals) * copies):
+            record = dict(originals[index % len(originals)])
+            record[definition["title_key"]] = f"§T{index}§"
+            record[definition["link_key"]] = f"{record[definition['link_key']]}§L{index}§"
+            records.append(record)
+        return json.dumps(payload, ensure_ascii=False)
+    soup = BeautifulSoup(text, "html.parser")
+    items = soup.select(definition["item"])
+    index = 0
+    for item in items:
+        previous = item
+        for copy_number in range(copies):
+            node = item if copy_number == 0 else copy.copy(item)
+            if copy_number:
+                previous.insert_after(node)
+                previous = node
+            _mark_html(node, definition, index)
+            index += 1
+    return str(soup)
+
+
+def render(template, variant):
+    def replace(match):
+        if match.group(1) == "T":
+            return _title(variant, int(match.group(2)))
+        return f"-{variant}-{match.group(2)}"
+    return _MARKER.sub(replace, template)
+
+
+def load_fixture(filename):
+    with open(os.path.join(FIXTURES, filename), "r", encoding="utf-8") as f:
+        return shift_dates(f.read())
+
+
+def build_pages(args):
+    """Monta (definição, caminho, tipo, modelo) para cada fonte servida."""
+    synthetic = args.items > 1 or args.sources > 1 or args.fresh
+    pages = []
+    for template in load_definitions():
+        if template["name"] not in FIXTURE_FILES:
+            continue
+        filename, kind = FIXTURE_FILES[template["name"]]
+        text = load_fixture(filename)
+        if synthetic:
+            text = template_page(kind, text, template, args.items)
+        for clone in range(args.sources):
+            definition = dict(template)
+            if clone:
+                definition["name"] = f"{template['name']} #{clone}"
+            definition["agent"] = template.get("agent", template["name"])
+            pages.append((definition, f"/{_slug(template['name'])}/{clone}/", kind, text))
+    text = load_fixture(PREFEITURA_FIXTURE)
+    if synthetic:
+        text = template_page(JSON, text, PREFEITURA_MAPPING, args.items)
+    pages.append(({"name": "Prefeitura de Campinas"}, "/prefeitura/api/noticias", JSON, text))
+    return pages, synthetic
+
+
+def serve(server, pages, synthetic, cycle):
+    bodies = {}
+    for number, (definition, path, kind, text) in enumerate(pages):
+        body = render(text, cycle * len(pages) + number) if synthetic else text
+        server.add_page(path, body, kind)
+        bodies[definition["name"]] = body
+    return bodies
+
+
+def parse_times(agents, bodies):
+    """Tempo só de parsing por agente, sobre as páginas servidas no último ciclo."""
+    now = datetime.now(TZ)
+    times = defaultdict(float)
+    with redirect_stdout(StringIO()):
+        for agent in agents:
+            if isinstance(agent, SourceAgent):
+                for name, source in agent.compiled.items():
+                    start = time.perf_counter()
+                    if source.type == "rss":
+                        source.parse_feed(bodies[name].encode("utf-8"), now=now)
+                    else:
+                        source.parse(bodies[name], now=now)
+                    times[agent.name] += time.perf_counter() - start
+            else:
+                start = time.perf_counter()
+                api_capture.apply_mapping(json.loads(bodies[agent.name]), agent.api, agent.name)
+                times[agent.name] += time.perf_counter() - start
+    return times
+
+
+def peak_rss_mb():
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline do ciclo do monitor.")
+    parser.add_argument("--cycles", type=int, default=3, help="ciclos a executar (padrão 3)")
+    parser.add_argument("--latency", type=float, default=0.05, help="atraso por resposta, em segundos")
+    parser.add_argument("--jitter", type=float, default=0.0, help="atraso extra aleatório até este valor")
+    parser.add_argument("--items", type=int, default=1, help="multiplica os itens de cada página")
+    parser.add_argument("--sources", type=int, default=1, help="multiplica as fontes de sources.json")
+    parser.add_argument("--fresh", action="store_true", help="todo ciclo traz só notícias novas")
+    parser.add_argument("--no-rate-limit", action="store_true", help="desliga os limites do Telegram no worker")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="roda os agentes isolados num pool com este número de processos (padrão: no processo)")
+    parser.add_argument("--drain", type=float, default=10.0, help="espera máxima pelo envio ao fim, em segundos")
+    parser.add_argument("--mode", choices=("digest", "single"), default=manager.DELIVERY_MODE,
+                        help="modo de entrega do manager (padrão: o de manager.py)")
+    parser.add_argument("--digest-window", type=float, default=1.0,
+                        help="janela do modo resumo no worker, em segundos (padrão 1)")
+    parser.add_argument("--enrich", type=float, default=0.0,
+                        help="prazo do enriquecimento pelas matérias (padrão 0, desligado: os links são dos sites reais)")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("urllib3").setLevel(logging.ERROR)
+    workdir = tempfile.mkdtemp(prefix="bench_cycle_")
+    db_file = os.path.join(workdir, "news_state.db")
+    seen_store._store = seen_store.SeenStore(db_file, legacy_files=())
+    validators._store = validators.ValidatorStore(db_file)
+    events._log = events.EventLog(os.path.join(workdir, "events.jsonl"))
+    archive._archive = archive.NewsArchive(os.path.join(workdir, "archive.db"))
+    if args.no_rate_limit:
+        delivery.GLOBAL_RATE = delivery.CHAT_RATE = delivery.GROUP_RATE = 1e6
+        delivery.GROUP_BURST = 1e6
+
+    server = ReplayServer(latency=args.latency, jitter=args.jitter).start()
+    manager.DELIVERY_MODE = args.mode
+    manager.ENRICH_DEADLINE = args.enrich
+    worker = delivery.get_worker(manager.TELEGRAM_BOT_TOKEN, api_url=server.base_url)
+    worker.digest_window = args.digest_window
+
+    pages, synthetic = build_pages(args)
+    definitions = [dict(d, url=server.base_url + path, type=d.get("type", "html")) for d, path, _, _ in pages[:-1]]
+    sources_file = os.path.join(workdir, "sources.json")
+    with open(sources_file, "w", encoding="utf-8") as f:
+        json.dump(definitions, f, ensure_ascii=False)
+    prefeitura = PrefeituraCampinasAgent()
+    prefeitura.api = dict(PREFEITURA_MAPPING, endpoint=server.base_url + pages[-1][1])
+    agents = load_source_agents(sources_file) + [prefeitura]
+
+    pool = ProcessAgentPool(workers=args.processes) if args.processes else None
+    engine = FetchEngine(max_concurrency=manager.MAX_CONCURRENCY, pool=pool)
+    scheduler = AdaptiveScheduler()
+    clusters = NearDuplicateIndex()
+    for agent in agents:
+        for source in agent.sources():
+            scheduler.add(source["name"])
+    store = seen_store.get_seen_store()
+    print(f"Fontes: {len(pages)} | itens por página: ×{args.items} | latência {args.latency * 1000:.0f} ms")
+
+    fetch_times = defaultdict(float)
+    total_sent = 0
+    bodies = {}
+    for cycle in range(args.cycles):
+        if cycle == 0 or args.fresh:
+            bodies = serve(server, pages, synthetic, cycle)
+        server.take_requests()
+        start = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            results = engine.run_cycle(agents)
+            fetched = time.perf_counter() - start
+            sent = manager.process_results(results, store, scheduler, clusters)
+        elapsed = time.perf_counter() - start
+        total_sent += sent
+        errors = sum(1 for result in results if result.error is not None)
+        for result in results:
+            fetch_times[result.agent.name] += result.elapsed
+        print(
+            f"Ciclo {cycle + 1}: {elapsed * 1000:.0f} ms (coleta {fetched * 1000:.0f} ms), "
+            f"{server.take_requests()} requisições, {sum(len(r.items) for r in results)} itens, "
+            f"{sent} enviados, {errors} erros"
+        )
+
+    print("\nPor agente (busca somada em todos os ciclos / parsing de uma página):")
+    for name, parse in sorted(parse_times(agents, bodies).items()):
+        print(f"  {name:<24} busca {fetch_times[name] * 1000:8.0f} ms   parsing {parse * 1000:7.1f} ms")
+
+    drain_start = time.perf_counter()
+    drained = worker.flush(timeout=args.drain)
+    drain = time.perf_counter() - drain_start
+    posts = [stamp for stamp, method, _ in server.telegram]
+    span = posts[-1] - posts[0] if len(posts) > 1 else 0
+    print(f"\nTelegram: {worker.items_sent}/{total_sent} notícias entregues em {len(posts)} chamadas à API, "
+          f"{worker.queue_depth()} na fila ({'fila vazia' if drained else 'tempo esgotado'} após {drain:.1f}s)")
+    if span:
+        print(f"Vazão: {(len(posts) - 1) / span:.1f} mensagens/s")
+    for host, stats in connection_stats().items():
+        print(f"Conexões {host}: {stats['requests']} requisições, {stats['connections']} conexões, "
+              f"reaproveitamento {stats['reuse_ratio']:.0%}")
+    rss = peak_rss_mb()
+    print(f"Pico de RSS: {rss:.0f} MB" if rss is not None else "Pico de RSS: indisponível")
+
+    server.close()
+    store.close()
+    events.get_event_log().close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
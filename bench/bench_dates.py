@@ -0,0 +1,73 @@
+"""Custo e cobertura do parser de datas sobre datas reais das fontes.
+
+Uso, a partir da raiz do projeto:
+
+    python -m bench.bench_dates [rodadas]
+
+Compara o laço original de ``strptime`` com ``core.dates.parse_date`` sem
+memoização (cache limpo a cada rodada) e com o cache aquecido, sobre as
+strings de ``bench/fixtures/dates.txt`` repetidas ``rodadas`` vezes
+(padrão 2000). A cobertura conta as strings que viram uma data de verdade,
+sem cair em ``datetime.now()``.
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+from core.dates import TZ, _classify, parse_date
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+LEGACY_FORMATS = [
+    "%a, %d %b %Y %H:%M:%S %z",
+    "%d/%m/%Y %Hh%M",
+    "%Hh%M"
+]
+
+
+def legacy_parse_date(date_str):
+    for fmt in LEGACY_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def load_corpus():
+    with open(os.path.join(FIXTURES, "dates.txt"), "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def measure(func, corpus, rounds, before_round=None):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        if before_round:
+            before_round()
+        for text in corpus:
+            func(text)
+    return (time.perf_counter() - start) / (rounds * len(corpus))
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    corpus = load_corpus()
+    now = datetime.now(TZ)
+
+    legacy_hits = sum(1 for text in corpus if legacy_parse_date(text) is not None)
+    hits = sum(1 for text in corpus if parse_date(text, now) is not None)
+
+    legacy = measure(legacy_parse_date, corpus, rounds)
+    cold = measure(lambda text: parse_date(text, now), corpus, max(1, rounds // 10), _classify.cache_clear)
+    warm = measure(lambda text: parse_date(text, now), corpus, rounds)
+
+    print(f"Corpus: {len(corpus)} strings, {rounds} rodadas")
+    print(f"Cobertura: original {legacy_hits}/{len(corpus)}, core.dates {hits}/{len(corpus)}")
+    print(f"Original (strptime + exceções): {legacy * 1e6:.2f} µs por data")
+    print(f"core.dates sem cache:           {cold * 1e6:.2f} µs por data")
+    print(f"core.dates com cache:           {warm * 1e6:.2f} µs por data")
+    print(f"Cache: {_classify.cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
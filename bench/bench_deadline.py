@@ -0,0 +1,164 @@
+"""Prazo por ciclo, buscas duplicadas (hedge) e adiamento de fontes lentas, contra um servidor local.
+
+Uso, a partir da raiz do projeto:
+
+    python -m bench.bench_deadline [--cycles 100] [--budget 1.0] [--stall 0.04]
+
+Sobe um servidor de feeds RSS com três tipos de fonte: ``--fast`` fontes
+rápidas (20 ms), uma fonte instável que em ``--stall`` das requisições
+trava por 2 s antes de responder, e uma fonte travada que sempre leva
+``--hung`` segundos. Roda os mesmos ciclos com o hedge desligado e
+ligado e mostra, por modo: tempo até o primeiro lote de resultados,
+duração do ciclo (nunca acima de ``--budget``), quantas vezes a fonte
+instável foi adiada, o p95 dela e quantas cópias foram disparadas e
+venceram. O hedge só ajuda quando as travadas ficam abaixo de 5% das
+buscas: acima disso o próprio p95 da fonte já é o travamento. No fim
+confere que o resultado da fonte travada chega depois, por
+``wait_results``.
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+
+from agents.source_agent import SourceAgent
+from core import engine as engine_module
+from core import seen_store, validators
+from core.engine import FetchEngine
+from core.metrics import FETCH_HEDGES
+from core.sources import compile_sources
+
+STALL_SECONDS = 2.0
+FAST_SECONDS = 0.02
+
+
+class FeedServer:
+    def __init__(self, stall, hung, seed=25):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+        self.server.daemon_threads = True
+        self.server.stall = stall
+        self.server.hung = hung
+        self.server.seed = seed
+        self.server.count = 0
+        self.server.lock = threading.Lock()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def reset(self):
+        """Recomeça a sequência de travamentos, para os dois modos verem a mesma."""
+        self.server.rng = random.Random(self.server.seed)
+
+    def start(self):
+        self.reset()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.count += 1
+            count = server.count
+            stalled = self.path.startswith("/instavel") and server.rng.random() < server.stall
+        if self.path.startswith("/travada"):
+            time.sleep(server.hung)
+        elif stalled:
+            time.sleep(STALL_SECONDS)
+        else:
+            time.sleep(FAST_SECONDS)
+        body = (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>Feed</title>'
+            f"<item><title>Notícia {count} de {self.path}</title><link>http://exemplo.com/{count}</link></item>"
+            "</channel></rss>"
+        ).encode("utf-8")
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def run(agents, cycles, budget, hedge):
+    engine_module.HEDGE_MIN_SAMPLES = 10 if hedge else 10 ** 9
+    engine = FetchEngine(max_concurrency=16)
+    first_batch, durations, deferred, unstable = [], [], 0, []
+    hedges_before = {label: FETCH_HEDGES.labels(label).value for label in ("primary", "hedge")}
+    for _ in range(cycles):
+        start = time.perf_counter()
+        first, seen = None, set()
+        with redirect_stdout(StringIO()):
+            for batch in engine.iter_cycle(agents, only={"Instável", *(f"Rápida {i}" for i in range(len(agents) - 1))},
+                                           budget=budget):
+                first = first if first is not None else time.perf_counter() - start
+                seen.update(result.source["name"] for result in batch)
+                unstable += [result.elapsed for result in batch if result.source["name"] == "Instável"]
+        durations.append(time.perf_counter() - start)
+        first_batch.append(first or 0.0)
+        deferred += "Instável" not in seen
+    # As buscas adiadas terminam sozinhas; espera para não misturar com o próximo modo.
+    with redirect_stdout(StringIO()):
+        time.sleep(STALL_SECONDS + 0.2)
+        engine.wait_results(0)
+    unstable.sort()
+    hedges = {label: FETCH_HEDGES.labels(label).value - hedges_before[label] for label in hedges_before}
+    return {
+        "first": statistics.median(first_batch), "cycle": statistics.median(durations), "worst": max(durations),
+        "deferred": deferred, "p95": unstable[int(len(unstable) * 0.95)] if unstable else None, "hedges": hedges
+    }, engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prazo por ciclo, hedge e adiamento contra um servidor local.")
+    parser.add_argument("--cycles", type=int, default=100)
+    parser.add_argument("--budget", type=float, default=1.0, help="prazo de cada ciclo, em segundos")
+    parser.add_argument("--fast", type=int, default=8, help="fontes rápidas")
+    parser.add_argument("--stall", type=float, default=0.04, help="fração das requisições da fonte instável que trava")
+    parser.add_argument("--hung", type=float, default=3.0, help="duração da fonte travada, em segundos")
+    args = parser.parse_args()
+
+    seen_store._store = seen_store.SeenStore(":memory:", legacy_files=())
+    validators._store = validators.ValidatorStore(":memory:")
+    server = FeedServer(args.stall, args.hung).start()
+    definitions = [{"name": f"Rápida {i}", "type": "rss", "url": f"{server.base_url}/rapida/{i}"} for i in range(args.fast)]
+    definitions.append({"name": "Instável", "type": "rss", "url": f"{server.base_url}/instavel"})
+    agents = [SourceAgent(d["name"], compile_sources([d])) for d in definitions]
+    hung = SourceAgent("Travada", compile_sources([{"name": "Travada", "type": "rss", "url": f"{server.base_url}/travada"}]))
+    try:
+        print(f"{args.cycles} ciclos, prazo {args.budget:.1f}s, {args.fast} fontes rápidas, "
+              f"fonte instável travando {args.stall:.0%} das vezes por {STALL_SECONDS:.0f}s\n")
+        for hedge in (False, True):
+            server.reset()
+            stats, engine = run(agents, args.cycles, args.budget, hedge)
+            print(f"  hedge {'ligado   ' if hedge else 'desligado'}: primeiro lote {stats['first'] * 1000:5.0f} ms, "
+                  f"ciclo mediano {stats['cycle'] * 1000:5.0f} ms (pior {stats['worst'] * 1000:.0f} ms), "
+                  f"instável adiada {stats['deferred']}x, p95 dela {stats['p95'] * 1000:.0f} ms, "
+                  f"cópias vencedoras {stats['hedges']['hedge']}/{sum(stats['hedges'].values())}")
+
+        start = time.perf_counter()
+        with redirect_stdout(StringIO()):
+            batches = list(engine.iter_cycle(agents + [hung], budget=args.budget))
+            closed = time.perf_counter() - start
+            late = engine.wait_results(args.hung + 2)
+        print(f"\nCom a fonte travada ({args.hung:.0f}s): ciclo fechou em {closed * 1000:.0f} ms "
+              f"com {sum(len(b) for b in batches)} fontes; adiadas que chegaram depois por wait_results: "
+              + (", ".join(f"{r.source['name']} ({r.elapsed:.1f}s)" for r in late) or "nenhuma"))
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Enriquecimento de notícias pelo ``<head>`` das matérias, contra um servidor local.
+
+Uso, a partir da raiz do projeto:
+
+    python -m bench.bench_enrich [--items 40] [--slow 10] [--deadline 1.0] [--body-kb 300]
+
+Sobe um servidor com matérias sintéticas: um ``<head>`` com as tags Open
+Graph seguido de um corpo de ``--body-kb`` KB, enviado aos pedaços com um
+pequeno atraso entre eles. ``--slow`` matérias só começam a responder
+depois do prazo. Mede três passadas do ``Enricher``:
+
+1. cache vazio: tempo total (nunca acima do prazo), notícias completadas
+   e bytes lidos por página, comparados com o tamanho da página inteira;
+2. as mesmas notícias de novo, com parâmetros ``utm_*`` nos links: tudo
+   sai do cache (as lentas, como falha, por alguns minutos), e só as que
+   ficaram sem vez na fila são buscadas; na terceira vez, nenhuma;
+3. a página inteira baixada sem parar no ``</head>``, para referência.
+"""
+import argparse
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.enrichment import Enricher, canonical_url
+from core.http import get_session
+
+CHUNK = 16 * 1024
+CHUNK_DELAY = 0.005
+SLOW_DELAY = 10.0
+
+
+class ArticleServer:
+    def __init__(self, body_kb):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _ArticleHandler)
+        self.server.daemon_threads = True
+        self.server.body = ("<p>" + "Texto da matéria. " * 60 + "</p>\n").encode("utf-8") * (body_kb * 1024 // 1100 + 1)
+        self.server.requests = 0
+        self.server.lock = threading.Lock()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class _ArticleHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+        path = self.path.split("?", 1)[0]
+        if path.startswith("/lento/"):
+            time.sleep(SLOW_DELAY)
+        slug = path.rsplit("/", 1)[-1]
+        head = (
+            '<!DOCTYPE html><html lang="pt-BR"><head><meta charset="utf-8">'
+            f"<title>Matéria {slug}</title>"
+            + '<link rel="stylesheet" href="/estilo.css">' * 20
+            + f'<meta property="og:title" content="Matéria {slug}">'
+            f'<meta property="og:image" content="{self.server_url}/img/{slug}.jpg">'
+            f'<meta property="og:description" content="Resumo da matéria {slug}, com acentuação: ação e São Paulo.">'
+            '<meta property="article:published_time" content="2025-04-13T08:15:00-03:00">'
+            f'<link rel="canonical" href="{self.server_url}{path}">'
+            + "<script>var x = 1;</script>" * 40
+            + "</head><body>"
+        ).encode("utf-8")
+        page = head + self.server.body + b"</body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(page)))
+        self.end_headers()
+        try:
+            for start in range(0, len(page), CHUNK):
+                self.wfile.write(page[start:start + CHUNK])
+                time.sleep(CHUNK_DELAY)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    @property
+    def server_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+
+def news_for(base_url, items, slow, tracking=False):
+    """Notícias com ``slow`` matérias lentas espalhadas pela lista."""
+    suffix = "?utm_source=telegram&utm_medium=bot" if tracking else ""
+    step = items // slow if slow else items + 1
+    return [
+        {"title": f"Notícia {i}", "link": f"{base_url}/{'lento' if i % step == 0 and i // step < slow else 'noticia'}/{i}{suffix}",
+         "source": "Bench"}
+        for i in range(items)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Enriquecimento pelo <head> das matérias, contra um servidor local.")
+    parser.add_argument("--items", type=int, default=40)
+    parser.add_argument("--slow", type=int, default=10, help="matérias que só respondem depois do prazo")
+    parser.add_argument("--deadline", type=float, default=1.0)
+    parser.add_argument("--body-kb", type=int, default=300)
+    args = parser.parse_args()
+
+    server = ArticleServer(args.body_kb).start()
+    enricher = Enricher(deadline=args.deadline)
+    try:
+        news = news_for(server.base_url, args.items, args.slow)
+        start = time.perf_counter()
+        enriched = enricher.enrich(news)
+        elapsed = time.perf_counter() - start
+        time.sleep(0.2)
+        status = enricher.status()
+        fetched = max(1, status["fetched"])
+        print(f"Cache vazio: {enriched}/{len(news)} notícias completadas em {elapsed * 1000:.0f} ms "
+              f"(prazo {args.deadline * 1000:.0f} ms), {server.server.requests} requisições, "
+              f"{status['timeout']} desistências por prazo, {status['skipped']} sem vez na fila")
+        print(f"  lidos {status['bytes'] / fetched / 1024:.1f} KB por página")
+        sample = next(n for n in news if n.get("image"))
+        print(f"  exemplo: image={sample['image']} date={sample['date']}\n  summary={sample['summary']}")
+
+        requests_before = server.server.requests
+        again = news_for(server.base_url, args.items, args.slow, tracking=True)
+        start = time.perf_counter()
+        enriched = enricher.enrich(again)
+        elapsed = time.perf_counter() - start
+        print(f"\nDe novo, com utm_* nos links: {enriched}/{len(again)} completadas em {elapsed * 1000:.1f} ms, "
+              f"{server.server.requests - requests_before} requisições novas (as que ficaram sem vez), "
+              f"{enricher.status()['cache']} acertos no cache")
+        print(f"  {again[-1]['link']} -> {canonical_url(again[-1]['link'])}")
+
+        time.sleep(0.2)
+        requests_before = server.server.requests
+        start = time.perf_counter()
+        enriched = enricher.enrich(news_for(server.base_url, args.items, args.slow))
+        print(f"Terceira vez: {enriched}/{args.items} completadas em {(time.perf_counter() - start) * 1000:.2f} ms, "
+              f"{server.server.requests - requests_before} requisições novas")
+
+        start = time.perf_counter()
+        response = get_session().get(f"{server.base_url}/noticia/inteira")
+        print(f"\nPágina inteira, para referência: {len(response.content) / 1024:.0f} KB em "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms")
+    finally:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Custo do roteamento de notícias por assinatura conforme o número de assinaturas cresce.
+
+Uso, a partir da raiz do projeto:
+
+    python -m bench.bench_router [assinaturas]
+
+Gera até ``assinaturas`` (padrão 10.000) assinaturas sintéticas, cada uma
+com de 1 a 5 palavras-chave (palavras soltas ou expressões de duas
+palavras) e, às vezes, filtro de fonte ou de categoria, e roteia as
+mesmas notícias sintéticas com 100, 1.000 e o total de assinaturas. Para
+cada tamanho mostra o tempo de compilação do autômato e a mediana e o
+p99 por notícia, e compara com o laço ingênuo que testa cada palavra-chave
+de cada assinatura (``in`` sobre o texto normalizado), conferindo que os
+dois chegam aos mesmos chats.
+"""
+import random
+import statistics
+import sys
+import time
+
+from core.subscriptions import Subscription, SubscriptionRouter, fold
+
+SOURCES = ["G1 Campinas (RSS)", "Hora Campinas", "Jornal Local", "SAMPI Campinas", "Prefeitura de Campinas"]
+CATEGORIES = ["Cidades", "Polícia", "Trânsito", "Política", "Esportes", "Saúde"]
+WORDS = (
+    "prefeitura campinas vacinação dengue saúde rodovia anhanguera acidente caminhão trânsito chuva "
+    "árvores cambuí taquaral unicamp vestibular indígena polícia furto cabos energia sousas brt "
+    "corredor ouro verde ponte preta guarani série reforço feira artesanato convivência sanasa "
+    "manutenção água bairros hospital mário gatti pronto socorro infantil câmara projeto hortas "
+    "urbanas festival inverno joaquim egídio programação motoristas aplicativo protesto avenida "
+    "defesa civil alerta umidade escolas estaduais laboratórios robótica viracopos passageiros "
+    "recorde feriado temperatura região metropolitana operação buraco vagas cursos qualificação"
+).split()
+ITEMS = 2000
+
+
+def vocabulary(rng, size=4000):
+    """Palavras reais mais termos inventados, para que 10 mil assinaturas não repitam tudo."""
+    syllables = ["ba", "ca", "de", "fi", "go", "lu", "ma", "ne", "pi", "ro", "sa", "tu", "vi", "xa", "zé"]
+    words = list(WORDS)
+    while len(words) < size:
+        words.append("".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return words
+
+
+def synthetic_subscriptions(count, rng, words):
+    for index in range(count):
+        keywords = []
+        for _ in range(rng.randint(1, 5)):
+            keyword = rng.choice(words)
+            if rng.random() < 0.3:
+                keyword += " " + rng.choice(words)
+            keywords.append(keyword.capitalize() if rng.random() < 0.5 else keyword)
+        yield Subscription(
+            f"-100{index % 500:04d}", name=f"assinatura {index}", keywords=keywords,
+            sources=[rng.choice(SOURCES)] if rng.random() < 0.2 else (),
+            categories=[rng.choice(CATEGORIES)] if rng.random() < 0.1 else ()
+        )
+
+
+def synthetic_news(count, rng, words):
+    for index in range(count):
+        yield {
+            "title": " ".join(rng.choice(WORDS if rng.random() < 0.8 else words) for _ in range(rng.randint(6, 12))).capitalize(),
+            "summary": " ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 30))),
+            "link": f"https://example.com/noticia/{index}",
+            "source": rng.choice(SOURCES),
+            "category": rng.choice(CATEGORIES)
+        }
+
+
+def naive_route(subscriptions, news):
+    text = fold(f"{news.get('title', '')} {news.get('summary') or ''}")
+    chats = []
+    for subscription in subscriptions:
+        if subscription.chat_id in chats or not subscription.accepts(news):
+            continue
+        if not subscription.keywords or any(keyword in text for keyword in subscription.keywords):
+            chats.append(subscription.chat_id)
+    return chats
+
+
+def timed(route, news_list):
+    times, routed = [], []
+    for news in news_list:
+        start = time.perf_counter()
+        routed.append(route(news))
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.99)], routed
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rng = random.Random(22)
+    words = vocabulary(rng)
+    subscriptions = list(synthetic_subscriptions(total, rng, words))
+    news_list = list(synthetic_news(ITEMS, rng, words))
+    print(f"{ITEMS} notícias, até {total} assinaturas\n")
+    for count in sorted({100, 1000, total}):
+        if count > total:
+            continue
+        selected = subscriptions[:count]
+        start = time.perf_counter()
+        router = SubscriptionRouter(selected)
+        compiled = time.perf_counter() - start
+        median, p99, routed = timed(router.route, news_list)
+        naive_median, naive_p99, expected = timed(lambda news: naive_route(selected, news), news_list[:200])
+        mismatches = sum(1 for got, want in zip(routed, expected) if set(got) != set(want))
+        fanout = sum(len(chats) for chats in routed) / len(routed)
+        print(f"  {count:>6} assinaturas ({len(router.automaton.keywords)} palavras-chave, "
+              f"{len(router.automaton.goto)} estados, compilado em {compiled * 1000:.0f} ms)")
+        print(f"         autômato: mediana {median * 1e6:7.1f} µs   p99 {p99 * 1e6:7.1f} µs   "
+              f"{fanout:.1f} chats por notícia")
+        print(f"         ingênuo:  mediana {naive_median * 1e6:7.1f} µs   p99 {naive_p99 * 1e6:7.1f} µs   "
+              f"divergências {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
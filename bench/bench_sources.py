@@ -0,0 +1,75 @@
+"""Custo de carga e memória do motor de fontes com muitas definições sintéticas.
+
+Uso, a partir da raiz do projeto:
+
+    python -m bench.bench_sources [quantidade]
+
+Clona as definições HTML de ``sources.json`` até ``quantidade`` fontes
+(padrão 500), cada uma com nome e URL próprios, e mede o tempo de
+compilação, a memória retida pelas fontes compiladas e o tempo de parsing
+por fonte usando as páginas gravadas em ``bench/fixtures``.
+"""
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from io import StringIO
+
+from core.parsing import BACKEND
+from core.sources import compile_sources, load_definitions
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FIXTURE_FILES = {
+    "G1 Campinas (Site)": "g1_campinas.html",
+    "Hora Campinas": "hora_campinas.html",
+    "Jornal Local": "jornal_local.html",
+    "SAMPI Campinas": "sampi.html",
+}
+
+
+def synthetic_definitions(count):
+    templates = [d for d in load_definitions() if d["name"] in FIXTURE_FILES]
+    definitions = []
+    for i in range(count):
+        template = templates[i % len(templates)]
+        definition = dict(template)
+        definition["name"] = f"{template['name']} #{i}"
+        definition["agent"] = definition["name"]
+        definition["url"] = f"{template['url'].rstrip('/')}/cidade-{i}/"
+        definition["template"] = template["name"]
+        definitions.append(definition)
+    return definitions
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    definitions = synthetic_definitions(count)
+    pages = {}
+    for name, fixture in FIXTURE_FILES.items():
+        with open(os.path.join(FIXTURES, fixture), "r", encoding="utf-8") as f:
+            pages[name] = f.read()
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    compiled = compile_sources(definitions)
+    compile_time = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    items = 0
+    with redirect_stdout(StringIO()):
+        for source in compiled:
+            items += len(source.parse(pages[source.definition["template"]]))
+    parse_time = time.perf_counter() - start
+
+    print(f"Fontes: {count} (backend {BACKEND})")
+    print(f"Compilação: {compile_time * 1000:.1f} ms ({compile_time / count * 1e6:.0f} µs por fonte)")
+    print(f"Memória retida: {retained / 1024:.0f} KiB ({retained / count:.0f} bytes por fonte)")
+    print(f"Parsing: {parse_time:.2f} s para {items} itens ({parse_time / count * 1000:.2f} ms por fonte)")
+
+
+if __name__ == "__main__":
+    main()
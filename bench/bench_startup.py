@@ -0,0 +1,93 @@
+"""Tempo de partida do manager: imports, registro de vistos e agendamento, com e sem snapshot.
+
+Uso, a partir da raiz do projeto:
+
+    python -m bench.bench_startup [chaves]
+
+Mede, num processo novo, quanto custa importar o ``manager`` e quais
+módulos pesados (selenium, feedparser, bs4) já vêm carregados. Depois
+monta um banco temporário com ``chaves`` (padrão 200.000) notícias vistas
+nos últimos dias e compara a abertura do ``SeenStore`` relendo a tabela
+inteira com a abertura a partir de um snapshot mapeado em memória, com
+mais 1% de chaves gravadas depois do snapshot. O agendamento salvo também
+é conferido na volta.
+"""
+import hashlib
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+from core.scheduler import AdaptiveScheduler
+from core.seen_store import SeenStore
+from core.snapshot import Snapshot, write_snapshot
+
+HEAVY_MODULES = ("selenium", "webdriver_manager", "feedparser", "bs4", "soupsieve")
+IMPORT_SCRIPT = (
+    "import sys, time; start = time.perf_counter(); import manager; "
+    "print(round((time.perf_counter() - start) * 1000)); "
+    f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+)
+
+
+def fill(path, count, now):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, first_seen REAL NOT NULL) WITHOUT ROWID")
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO seen (key, first_seen) VALUES (?, ?)",
+            ((hashlib.md5(str(i).encode()).hexdigest(), now - 6 * 86400 * (1 - i / count)) for i in range(count))
+        )
+    conn.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], capture_output=True, text=True).stdout.split("\n")
+    print(f"import manager: {output[0]} ms; módulos pesados carregados: {output[1] or 'nenhum'}")
+
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    try:
+        db_file = os.path.join(workdir, "news_state.db")
+        snap_file = os.path.join(workdir, "news_state.snap")
+        now = time.time()
+        fill(db_file, count, now)
+
+        start = time.perf_counter()
+        store = SeenStore(db_file, legacy_files=())
+        cold = time.perf_counter() - start
+        scheduler = AdaptiveScheduler()
+        for index in range(50):
+            scheduler.add(f"fonte {index}", due=now + index * 10)
+        start = time.perf_counter()
+        write_snapshot(store, scheduler, snap_file)
+        written = time.perf_counter() - start
+        extra = [hashlib.md5(f"novo {i}".encode()).hexdigest() for i in range(count // 100)]
+        for key in extra:
+            store.add(key)
+        store.close()
+        print(f"\n{count} chaves: abertura relendo o banco {cold * 1000:.0f} ms")
+        print(f"snapshot gravado em {written * 1000:.0f} ms ({os.path.getsize(snap_file) / 1024:.0f} KB)")
+
+        start = time.perf_counter()
+        snapshot = Snapshot(snap_file)
+        warm_store = SeenStore(db_file, legacy_files=(), snapshot=snapshot)
+        restored = AdaptiveScheduler()
+        for index in range(50):
+            restored.add(f"fonte {index}")
+        restored.restore(snapshot.scheduler)
+        warm = time.perf_counter() - start
+        missing = sum(1 for key in extra if key not in warm_store)
+        due_ok = all(restored.state[key]["due"] == state["due"] for key, state in scheduler.state.items())
+        print(f"abertura com snapshot (+{len(extra)} chaves relidas do banco): {warm * 1000:.0f} ms")
+        print(f"chaves: {len(warm_store)} (faltando {missing}); vencimentos retomados: {'sim' if due_ok else 'não'}")
+        warm_store.close()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
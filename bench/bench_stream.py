@@ -0,0 +1,55 @@
+"""Bytes lidos e tempo de parsing do modo stream conforme a quantidade de notícias novas.
+
+Uso, a partir da raiz do projeto:
+
+    python -m bench.bench_stream [rodadas]
+
+Para cada página gravada em ``bench/fixtures`` com ``stream`` em
+``sources.json``, simula listagens em que só as N primeiras notícias são
+novas (as demais já estão no cache) e mede quantos bytes o modo stream lê
+antes de parar e quanto tempo gasta, contra o parsing da página inteira.
+Os tempos são a média de ``rodadas`` execuções (padrão 50).
+"""
+import os
+import sys
+import time
+
+from bench.parity_parsing import CASES, FIXTURE_NOW, FIXTURES
+from core.sources import STREAM_CHUNK, CompiledSource, load_definitions
+
+NEW_COUNTS = (0, 1, 3, 10, 20)
+
+
+def average(function, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = function()
+    return (time.perf_counter() - start) / rounds, result
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    definitions = {definition["name"]: definition for definition in load_definitions()}
+    for name, fixture, _ in CASES:
+        source = CompiledSource(definitions[name])
+        if not source.stream_unit:
+            continue
+        with open(os.path.join(FIXTURES, fixture), "rb") as f:
+            raw = f.read()
+        chunks = [raw[i:i + STREAM_CHUNK] for i in range(0, len(raw), STREAM_CHUNK)]
+        text = raw.decode("utf-8")
+        full, items = average(lambda: source.parse(text, now=FIXTURE_NOW), rounds)
+        print(f"{name}: página inteira {len(raw)} bytes, {full * 1000:.2f} ms, {len(items)} itens")
+        for new in NEW_COUNTS:
+            seen = {(news["title"], news["link"]) for news in items[new:]}
+            elapsed, (result, received, stopped) = average(
+                lambda: source.parse_stream(chunks, lambda news: (news["title"], news["link"]) in seen,
+                                            "utf-8", now=FIXTURE_NOW),
+                rounds
+            )
+            print(f"  {new:>2} novas: {received:>6} bytes ({received / len(raw):4.0%}), "
+                  f"{elapsed * 1000:6.2f} ms, {len(result):>2} itens{' (parou cedo)' if stopped else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Teste de ponta a ponta do push WebSub contra o hub local.
+
+Uso, a partir da raiz do projeto:
+
+    python -m bench.bench_websub [--lease 3] [--pushes 20]
+
+Sobe o ``LocalHub`` de ``bench.websub_hub`` e um ``WebSubSubscriber`` em
+portas livres, com o registro de vistos e os validadores num diretório
+temporário, e percorre o caminho do manager:
+
+1. a primeira busca do feed encontra o hub e a fonte é assinada;
+2. cada publicação chega como ``FetchResult`` e mostra a latência entre
+   publicar e a notícia estar pronta para a deduplicação;
+3. uma entrega com assinatura errada é descartada;
+4. com prazo curto (``--lease``), a assinatura é renovada sozinha;
+5. com o hub recusando renovações, a assinatura caduca e a fonte volta
+   ao polling (``maintain`` a devolve e ``active`` fica falso).
+"""
+import argparse
+import os
+import shutil
+import socket
+import statistics
+import tempfile
+import time
+
+import requests
+
+from agents.source_agent import SourceAgent
+from bench.websub_hub import LocalHub
+from core import seen_store, validators, websub
+from core.engine import FetchEngine
+from core.sources import compile_sources
+
+SOURCE = "Feed local (WebSub)"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until(condition, timeout, step=0.02):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(step)
+    return condition()
+
+
+def check(label, ok):
+    print(f"  {'OK   ' if ok else 'FALHA'} {label}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de ponta a ponta do WebSub com o hub local.")
+    parser.add_argument("--lease", type=int, default=3, help="prazo das assinaturas imposto pelo hub")
+    parser.add_argument("--pushes", type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_websub_")
+    db_file = os.path.join(workdir, "news_state.db")
+    seen_store._store = seen_store.SeenStore(db_file, legacy_files=())
+    validators._store = validators.ValidatorStore(db_file)
+    hub = LocalHub(lease_seconds=args.lease).start()
+    port = free_port()
+    subscriber = websub.WebSubSubscriber(f"http://127.0.0.1:{port}", port=port, host="127.0.0.1").start()
+    results = []
+    try:
+        hub.publish("Notícia publicada antes da assinatura")
+        definition = {"name": SOURCE, "type": "rss", "url": hub.feed_url, "websub": True}
+        agent = SourceAgent(SOURCE, compile_sources([definition]))
+        polled = FetchEngine().run_cycle([agent])[0]
+        print(f"Primeira busca por polling: {len(polled.items)} notícias; hub anunciado: {agent.hubs().get(SOURCE)}\n")
+
+        subscriber.discover([agent])
+        results.append(check("assinatura confirmada pelo hub", wait_until(lambda: subscriber.active(SOURCE), 5)))
+
+        latencies, received = [], 0
+        for index in range(args.pushes):
+            start = time.perf_counter()
+            hub.publish(f"Notícia empurrada {index}")
+            pushed = subscriber.wait(5)
+            latencies.append(time.perf_counter() - start)
+            received += sum(len(result.items) for result in pushed)
+        results.append(check(f"{received}/{args.pushes} notícias recebidas por push", received == args.pushes))
+        latencies.sort()
+        print(f"        latência publicar -> FetchResult: mediana {statistics.median(latencies) * 1000:.1f} ms, "
+              f"pior {latencies[-1] * 1000:.1f} ms (polling a cada 300 s: média de 150 s)")
+
+        callback = subscriber.callback_url + subscriber.subscriptions[SOURCE].path
+        requests.post(callback, data=hub.feed(hub.entries[:1]), headers={"X-Hub-Signature": "sha256=" + "0" * 64})
+        results.append(check("entrega com assinatura errada descartada", subscriber.wait(0.5) == []))
+
+        first_expiry = subscriber.expires(SOURCE)
+        verifications = hub.verifications
+        lapsed = []
+        deadline = time.time() + args.lease * 2
+        while time.time() < deadline:
+            lapsed += subscriber.maintain()
+            time.sleep(0.05)
+        results.append(check(
+            f"assinatura renovada sozinha ({hub.verifications - verifications} confirmações em {args.lease * 2}s)",
+            subscriber.active(SOURCE) and subscriber.expires(SOURCE) > first_expiry and not lapsed
+        ))
+
+        hub.deny = True
+        wait_until(lambda: bool(lapsed.extend(subscriber.maintain()) or lapsed), args.lease * 2, step=0.05)
+        results.append(check("hub recusou a renovação e a fonte voltou ao polling",
+                             lapsed == [SOURCE] and not subscriber.active(SOURCE)))
+        print(f"\nSituação da assinatura: {subscriber.status()[SOURCE]}")
+    finally:
+        subscriber.close()
+        hub.close()
+        seen_store._store.close()
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(f"\n{sum(results)}/{len(results)} verificações passaram.")
+
+
+if __name__ == "__main__":
+    main()
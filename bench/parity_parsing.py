@@ -0,0 +1,156 @@
+"""Confere que cada backend de parsing extrai exatamente o mesmo que o código original.
+
+Uso, a partir da raiz do projeto:
+
+    python -m bench.parity_parsing
+
+A referência é a extração original dos agentes (BeautifulSoup com
+html.parser sobre a página inteira); as definições de ``sources.json``,
+compiladas com cada backend disponível em ``core.parsing``, precisam
+reproduzir a mesma lista de notícias para as páginas gravadas em
+``bench/fixtures``. Fontes com ``stream`` também são conferidas no modo
+stream, com a página entregue em pedaços. Sai com código 1 se houver
+divergência.
+
+As páginas gravadas são de 13/04/2025; o relógio é fixado em
+``FIXTURE_NOW`` para que as regras de data deem o mesmo resultado em
+qualquer dia.
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+from core.parsing import HAS_LXML, LexborHTMLParser
+from core.dates import TZ, parse_date
+from core.sources import STREAM_CHUNK, CompiledSource, load_definitions
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+FIXTURE_NOW = datetime(2025, 4, 13, 12, 0, tzinfo=TZ)
+
+
+def reference_g1(definition, text):
+    soup = BeautifulSoup(text, "html.parser")
+    news_list = []
+    for post in soup.select(".feed-post-body"):
+        title_tag = post.select_one(".feed-post-body-title")
+        time_tag = post.select_one(".feed-post-datetime")
+        if not title_tag or not time_tag:
+            continue
+        title = title_tag.get_text(strip=True)
+        link = post.select_one("a")["href"]
+        pub_date_str = time_tag.get_text(strip=True)
+        pub_date = parse_date(pub_date_str, FIXTURE_NOW)
+        if pub_date.date() == FIXTURE_NOW.date():
+            news_list.append({
+                "title": title,
+                "link": link,
+                "source": definition["name"],
+                "date": pub_date.strftime("%d/%m/%Y %H:%M")
+            })
+    return news_list
+
+
+def reference_hora(definition, text):
+    soup = BeautifulSoup(text, "html.parser")
+    news_list = []
+    for article in soup.select("article.jeg_post"):
+        title_tag = article.select_one("h3.jeg_post_title a")
+        if not title_tag:
+            continue
+        summary_tag = article.select_one(".jeg_post_excerpt p")
+        date_tag = article.select_one(".jeg_meta_date a")
+        news_list.append({
+            "title": title_tag.get_text(strip=True),
+            "link": title_tag.get("href"),
+            "summary": summary_tag.get_text(strip=True) if summary_tag else "Sem resumo disponível.",
+            "date": date_tag.get_text(strip=True) if date_tag else "Data não disponível.",
+            "source": definition["name"],
+        })
+    return news_list
+
+
+def reference_jornal(definition, text):
+    soup = BeautifulSoup(text, "html.parser")
+    news_list = []
+    for post in soup.select(".entry-title a"):
+        title_text = post.get_text(strip=True)
+        link_tag = post.get("href")
+        if not title_text or not link_tag:
+            continue
+        if not link_tag.startswith("http"):
+            link_tag = definition["url"].rstrip("/") + link_tag
+        news_list.append({
+            "title": title_text,
+            "link": link_tag,
+            "source": definition["name"],
+            "date": FIXTURE_NOW.strftime("%d/%m/%Y %H:%M")
+        })
+    return news_list
+
+
+def reference_sampi(definition, text):
+    soup = BeautifulSoup(text, "html.parser")
+    news_list = []
+    for block in soup.select(".container .row a.hoverActive"):
+        title_tag = block.find("h3")
+        category_tag = block.find("span")
+        news_list.append({
+            "title": title_tag.get_text(strip=True) if title_tag else "Título não encontrado",
+            "link": block.get("href", "Link não encontrado"),
+            "source": definition["name"],
+            "category": category_tag.get_text(strip=True) if category_tag else "Categoria não encontrada"
+        })
+    return news_list
+
+
+CASES = [
+    ("G1 Campinas (Site)", "g1_campinas.html", reference_g1),
+    ("Hora Campinas", "hora_campinas.html", reference_hora),
+    ("Jornal Local", "jornal_local.html", reference_jornal),
+    ("SAMPI Campinas", "sampi.html", reference_sampi),
+]
+
+
+def main():
+    backends = ["html.parser"]
+    if HAS_LXML:
+        backends.append("lxml")
+    if LexborHTMLParser is not None:
+        backends.append("selectolax")
+    failures = 0
+    definitions = {definition["name"]: definition for definition in load_definitions()}
+    for name, fixture, reference in CASES:
+        definition = definitions[name]
+        with open(os.path.join(FIXTURES, fixture), "r", encoding="utf-8") as f:
+            text = f.read()
+        start = time.perf_counter()
+        expected = reference(definition, text)
+        baseline = time.perf_counter() - start
+        print(f"{name}: {len(expected)} itens (original {baseline * 1000:.1f} ms)")
+        for backend in backends:
+            source = CompiledSource(definition, backend=backend)
+            start = time.perf_counter()
+            result = source.parse(text, now=FIXTURE_NOW)
+            elapsed = time.perf_counter() - start
+            status = "OK" if result == expected else "DIVERGENTE"
+            if result != expected:
+                failures += 1
+            print(f"  {backend:<12} {status:<10} {elapsed * 1000:.1f} ms")
+        source = CompiledSource(definition)
+        if source.stream_unit:
+            raw = text.encode("utf-8")
+            chunks = [raw[i:i + STREAM_CHUNK] for i in range(0, len(raw), STREAM_CHUNK)]
+            start = time.perf_counter()
+            result = source.parse_stream(chunks, lambda news: False, "utf-8", now=FIXTURE_NOW)[0]
+            elapsed = time.perf_counter() - start
+            if result != expected:
+                failures += 1
+            print(f"  {'stream':<12} {'OK' if result == expected else 'DIVERGENTE':<10} {elapsed * 1000:.1f} ms")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
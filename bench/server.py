@@ -0,0 +1,154 @@
+"""Servidor HTTP local que substitui os sites e a API do Telegram nos benchmarks.
+
+As páginas são registradas com ``add_page`` e servidas com ETag, então o
+``conditional_get`` dos agentes recebe 304 quando nada mudou, como nos
+sites reais. Qualquer ``POST /bot<token>/<método>`` é aceito como se fosse
+a API do Telegram e contado em ``telegram``. ``latency`` (mais um
+``jitter`` aleatório) atrasa cada resposta para simular a rede.
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Dia em que as páginas de ``bench/fixtures`` foram gravadas.
+FIXTURE_DAY = date(2025, 4, 13)
+MONTHS = [
+    "janeiro", "fevereiro", "março", "abril", "maio", "junho",
+    "julho", "agosto", "setembro", "outubro", "novembro", "dezembro"
+]
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+MONTH_ABBR = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+_RFC822_DAY = re.compile(r"\b(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun), (\d{2}) (%s) (\d{4})\b" % "|".join(MONTH_ABBR))
+_NUMERIC_DAY = re.compile(r"\b(\d{2})/(\d{2})/(\d{4})\b")
+_LONG_DAY = re.compile(r"\b(\d{1,2}) de (%s) de (\d{4})\b" % "|".join(MONTHS))
+_ISO_DAY = re.compile(r"\"(\d{4})-(\d{2})-(\d{2})")
+_BOT_PATH = re.compile(r"^/bot[^/]+/(\w+)$")
+
+
+def shift_dates(text, today=None):
+    """Move as datas das páginas gravadas para que ``FIXTURE_DAY`` vire ``today``.
+
+    Cobre os formatos que aparecem nas fixtures (RFC 822, "13/04/2025",
+    "13 de abril de 2025" e ISO nos JSON); as horas não mudam.
+    """
+    delta = (today or date.today()) - FIXTURE_DAY
+
+    def rfc822(match):
+        day = date(int(match.group(3)), MONTH_ABBR.index(match.group(2)) + 1, int(match.group(1))) + delta
+        return f"{WEEKDAYS[day.weekday()]}, {day.day:02d} {MONTH_ABBR[day.month - 1]} {day.year}"
+
+    def numeric(match):
+        day = date(int(match.group(3)), int(match.group(2)), int(match.group(1))) + delta
+        return day.strftime("%d/%m/%Y")
+
+    def long(match):
+        day = date(int(match.group(3)), MONTHS.index(match.group(2)) + 1, int(match.group(1))) + delta
+        return f"{day.day} de {MONTHS[day.month - 1]} de {day.year}"
+
+    def iso(match):
+        day = date(int(match.group(1)), int(match.group(2)), int(match.group(3))) + delta
+        return f'"{day.isoformat()}'
+
+    for pattern, replace in ((_RFC822_DAY, rfc822), (_NUMERIC_DAY, numeric), (_LONG_DAY, long), (_ISO_DAY, iso)):
+        text = pattern.sub(replace, text)
+    return text
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server.replay
+        server.wait()
+        page = server.hit(self.path)
+        if page is None:
+            self._reply(404)
+            return
+        content_type, body, etag = page
+        if self.headers.get("If-None-Match") == etag:
+            self._reply(304, headers={"ETag": etag})
+            return
+        self._reply(200, body, {"Content-Type": content_type, "ETag": etag})
+
+    def do_POST(self):
+        server = self.server.replay
+        length = int(self.headers.get("Content-Length", 0))
+        payload = self.rfile.read(length) if length else b""
+        match = _BOT_PATH.match(self.path)
+        if match is None:
+            self._reply(404)
+            return
+        server.record_telegram(match.group(1), payload)
+        body = json.dumps({"ok": True, "result": {"message_id": len(server.telegram)}}).encode("utf-8")
+        self._reply(200, body, {"Content-Type": "application/json"})
+
+
+class ReplayServer:
+    def __init__(self, latency=0.0, jitter=0.0, port=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.pages = {}
+        self.requests = Counter()
+        self.telegram = []
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.replay = self
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    def add_page(self, path, body, content_type="text/html; charset=utf-8"):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        self.pages[path] = (content_type, body, etag)
+        return self.base_url + path
+
+    def wait(self):
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+    def hit(self, path):
+        with self.lock:
+            self.requests[path] += 1
+        return self.pages.get(path)
+
+    def record_telegram(self, method, payload):
+        with self.lock:
+            self.telegram.append((time.monotonic(), method, len(payload)))
+
+    def take_requests(self):
+        """Requisições GET desde a última chamada (uma contagem por ciclo)."""
+        with self.lock:
+            total = sum(self.requests.values())
+            self.requests.clear()
+        return total
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
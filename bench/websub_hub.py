@@ -0,0 +1,166 @@
+"""Hub WebSub local, no lugar do hub real, para testar o push sem internet.
+
+Uso, a partir da raiz do projeto:
+
+    python -m bench.websub_hub [--port 8765] [--every 30] [--lease 600]
+
+Serve um feed RSS em ``/feed.xml`` que anuncia o próprio hub
+(``<atom:link rel="hub">``) e aceita assinaturas em ``/hub``: confirma cada
+uma com um GET no callback (``hub.challenge``) e, a cada publicação,
+entrega ao callback um feed só com as entradas novas, assinado com o
+segredo do assinante em ``X-Hub-Signature``. Rodando sozinho publica uma
+notícia sintética a cada ``--every`` segundos; aponte uma fonte com
+``"websub": true`` para ``http://127.0.0.1:<porta>/feed.xml`` e configure
+``WEBSUB_CALLBACK_URL`` no manager. ``bench.bench_websub`` usa a classe
+``LocalHub`` para o teste de ponta a ponta.
+"""
+import argparse
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from datetime import datetime
+from email.utils import format_datetime
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+import requests
+
+from core.dates import TZ
+
+
+class LocalHub:
+    """Feed + hub no mesmo servidor. ``deny`` faz o hub recusar novas assinaturas e renovações."""
+
+    def __init__(self, port=0, lease_seconds=None):
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _HubHandler)
+        self.server.daemon_threads = True
+        self.server.hub = self
+        self.port = self.server.server_address[1]
+        self.base = f"http://127.0.0.1:{self.port}"
+        self.feed_url = self.base + "/feed.xml"
+        self.hub_url = self.base + "/hub"
+        self.lease_seconds = lease_seconds
+        self.entries = []
+        self.subscribers = {}
+        self.verifications = 0
+        self.deny = False
+        self.lock = threading.Lock()
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def feed(self, entries):
+        items = "".join(
+            f"<item><title>{escape(entry['title'])}</title><link>{escape(entry['link'])}</link>"
+            f"<pubDate>{format_datetime(entry['published'])}</pubDate></item>"
+            for entry in entries
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+            "<title>Feed local</title>"
+            f'<atom:link rel="hub" href="{self.hub_url}"/>'
+            f'<atom:link rel="self" href="{self.feed_url}"/>'
+            f"{items}</channel></rss>"
+        ).encode("utf-8")
+
+    def subscribe(self, params):
+        """Confirma a assinatura em outra thread, como um hub real (a resposta ao POST é 202)."""
+        callback = params["hub.callback"]
+        lease = int(self.lease_seconds or params.get("hub.lease_seconds") or 600)
+        challenge = secrets.token_hex(8)
+        mode = "denied" if self.deny else "subscribe"
+        query = {"hub.mode": mode, "hub.topic": params["hub.topic"]}
+        if mode == "subscribe":
+            query.update({"hub.challenge": challenge, "hub.lease_seconds": str(lease)})
+        else:
+            query["hub.reason"] = "hub local configurado para recusar"
+        try:
+            response = requests.get(callback, params=query, timeout=5)
+        except requests.RequestException:
+            return
+        with self.lock:
+            self.verifications += 1
+            if mode == "subscribe" and response.status_code == 200 and response.text == challenge:
+                self.subscribers[callback] = {
+                    "topic": params["hub.topic"], "secret": params.get("hub.secret"), "expires": time.time() + lease
+                }
+
+    def publish(self, title, link=None):
+        """Acrescenta uma entrada ao feed e a entrega a cada assinante ativo; devolve quantos aceitaram."""
+        entry = {"title": title, "link": link or f"{self.base}/noticia/{len(self.entries)}",
+                 "published": datetime.now(TZ)}
+        with self.lock:
+            self.entries.insert(0, entry)
+            subscribers = [(c, s) for c, s in self.subscribers.items() if s["expires"] > time.time()]
+        body = self.feed([entry])
+        delivered = 0
+        for callback, subscriber in subscribers:
+            headers = {"Content-Type": "application/rss+xml"}
+            if subscriber["secret"]:
+                digest = hmac.new(subscriber["secret"].encode("utf-8"), body, hashlib.sha256).hexdigest()
+                headers["X-Hub-Signature"] = f"sha256={digest}"
+            response = requests.post(callback, data=body, headers=headers, timeout=5)
+            delivered += response.status_code // 100 == 2
+        return delivered
+
+
+class _HubHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        hub = self.server.hub
+        if self.path.split("?", 1)[0] != "/feed.xml":
+            self.send_error(404)
+            return
+        with hub.lock:
+            body = hub.feed(hub.entries[:20])
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        hub = self.server.hub
+        length = int(self.headers.get("Content-Length") or 0)
+        params = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        if self.path != "/hub" or params.get("hub.mode") != "subscribe" or not params.get("hub.callback"):
+            self.send_error(400)
+            return
+        self.send_response(202)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+        threading.Thread(target=hub.subscribe, args=(params,), daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hub WebSub local com um feed RSS de teste.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--every", type=float, default=30.0, help="segundos entre publicações")
+    parser.add_argument("--lease", type=int, default=None, help="prazo imposto às assinaturas, em segundos")
+    args = parser.parse_args()
+    hub = LocalHub(args.port, lease_seconds=args.lease).start()
+    print(f"Feed em {hub.feed_url}, hub em {hub.hub_url}")
+    count = 0
+    try:
+        while True:
+            time.sleep(args.every)
+            count += 1
+            delivered = hub.publish(f"Notícia de teste {count} publicada às {datetime.now(TZ):%H:%M:%S}")
+            print(f"Notícia {count} entregue a {delivered} assinantes.")
+    except KeyboardInterrupt:
+        hub.close()
+
+
+if __name__ == "__main__":
+    main()
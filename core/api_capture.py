@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+from core.http import get_session
+from core.metrics import PARSE_SECONDS
+
+RESOURCE_SCRIPT = """
+return performance.getEntriesByType("resource")
+    .filter(e => e.initiatorType === "xmlhttprequest" || e.initiatorType === "fetch")
+    .map(e => e.name);
+"""
+DATE_KEYS = ("dataPublicacao", "data_publicacao", "publishedAt", "published_at", "dataCriacao", "data", "date")
+
+
+def capture_xhr_urls(driver):
+    """URLs pedidas via XHR/fetch pela página carregada no navegador."""
+    try:
+        return list(dict.fromkeys(driver.execute_script(RESOURCE_SCRIPT) or []))
+    except Exception as e:
+        logging.error(f"Erro ao capturar requisições da página: {str(e)}")
+        return []
+
+
+def _find_records(payload, path=()):
+    """Percorre o JSON e devolve (caminho, lista) para cada lista de objetos."""
+    if isinstance(payload, list) and payload and all(isinstance(item, dict) for item in payload):
+        yield path, payload
+    elif isinstance(payload, dict):
+        for key, value in payload.items():
+            yield from _find_records(value, path + (key,))
+
+
+def _records_at(payload, path):
+    for key in path:
+        payload = payload[key]
+    return payload
+
+
+def learn_mapping(endpoint, payload, sample):
+    """Descobre quais campos do JSON correspondem a title/link/date.
+
+    ``sample`` é uma notícia extraída do HTML renderizado; procura-se no
+    JSON o registro cujo valor é igual ao título e, nele, o campo contido
+    no link, que vira um modelo de URL. Devolve None se não encontrar.
+    """
+    for path, records in _find_records(payload):
+        for record in records:
+            title_key = next((k for k, v in record.items() if isinstance(v, str) and v.strip() == sample["title"]), None)
+            if title_key is None:
+                continue
+            candidates = [
+                (len(str(value)), key) for key, value in record.items()
+                if key != title_key and len(str(value)) > 2 and str(value) in sample["link"]
+            ]
+            if not candidates:
+                continue
+            link_key = max(candidates)[1]
+            link_template = sample["link"].replace(str(record[link_key]), "{}", 1)
+            date_key = next((k for k in DATE_KEYS if k in record), None)
+            return {
+                "endpoint": endpoint,
+                "path": list(path),
+                "title_key": title_key,
+                "link_key": link_key,
+                "link_template": link_template,
+                "date_key": date_key
+            }
+    return None
+
+
+def _format_date(value):
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).strftime("%d/%m/%Y")
+    except ValueError:
+        return str(value)
+
+
+def apply_mapping(payload, mapping, source_name):
+    news_list = []
+    for record in _records_at(payload, mapping["path"]):
+        title = record.get(mapping["title_key"])
+        link_value = record.get(mapping["link_key"])
+        if not title or link_value is None:
+            continue
+        date = record.get(mapping["date_key"]) if mapping.get("date_key") else None
+        news_list.append({
+            "title": str(title).strip(),
+            "link": mapping["link_template"].format(link_value),
+            "source": source_name,
+            "date": _format_date(date) if date else "Não informada"
+        })
+    return news_list
+
+
+def discover(driver, sample, source_name):
+    """Testa cada XHR da página e devolve o primeiro mapeamento que reproduz ``sample``."""
+    session = get_session()
+    for url in capture_xhr_urls(driver):
+        try:
+            response = session.get(url, headers={"Accept": "application/json"})
+            payload = response.json()
+        except Exception:
+            continue
+        mapping = learn_mapping(url, payload, sample)
+        if mapping and apply_mapping(payload, mapping, source_name):
+            logging.info(f"API descoberta para {source_name}: {url}")
+            return mapping
+    return None
+
+
+def fetch_api(mapping, source_name):
+    """Caminho rápido: busca o JSON direto e converte para o formato de notícia."""
+    response = get_session().get(mapping["endpoint"], headers={"Accept": "application/json"})
+    response.raise_for_status()
+    start = time.perf_counter()
+    news_list = apply_mapping(response.json(), mapping, source_name)
+    PARSE_SECONDS.labels(source_name).observe(time.perf_counter() - start)
+    return news_list
+
+
+def load_mapping(path):
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            logging.error(f"Erro ao decodificar {path}. A API será redescoberta.")
+    return None
+
+
+def save_mapping(path, mapping):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(mapping, f, ensure_ascii=False, indent=4)
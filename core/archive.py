@@ -0,0 +1,230 @@
+"""Arquivo local das notícias aceitas, com busca de texto completo (SQLite FTS5).
+
+Uso, a partir da raiz do projeto:
+
+    python -m core.archive dengue
+    python -m core.archive "vacinação infantil" --source "Hora Campinas" --since "há 7 dias"
+    python -m core.archive --since 01/04/2025 --until 13/04/2025 --limit 50
+
+A busca ignora acentos e maiúsculas ("vacinacao" encontra "Vacinação"),
+exige todas as palavras e aceita prefixo com ``*`` ("vacin*"). Datas
+aceitam os mesmos formatos de ``core.dates`` ("ontem", "há 3 dias",
+"01/04/2025", "2025-04-01"). Os resultados vêm do mais novo para o mais
+antigo.
+"""
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import timedelta
+
+from core.dates import parse_date
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ARCHIVE_FILE = os.path.join(BASE_DIR, "news_archive.db")
+BATCH_SIZE = 200
+SEARCH_LIMIT = 20
+COLUMNS = ("id", "title", "link", "source", "summary", "category", "date", "published", "archived")
+_TERM = re.compile(r"[^\W_]+\*?")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    link TEXT NOT NULL,
+    source TEXT,
+    summary TEXT,
+    category TEXT,
+    date TEXT,
+    published REAL NOT NULL,
+    archived REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS articles_published ON articles (published);
+CREATE INDEX IF NOT EXISTS articles_source ON articles (source, published);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, content='articles', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+END;
+"""
+
+
+def match_query(text):
+    """Converte o texto do usuário numa consulta FTS5 segura: todas as palavras, ``*`` como prefixo."""
+    terms = []
+    for term in _TERM.findall(text):
+        prefix = term.endswith("*")
+        terms.append('"%s"%s' % (term.rstrip("*"), "*" if prefix else ""))
+    return " ".join(terms)
+
+
+def _timestamp(value, end_of_day=False):
+    """Timestamp de ``value``; com ``end_of_day``, uma data sem hora vale até o fim do dia."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if hasattr(value, "timestamp"):
+        return value.timestamp()
+    parsed = parse_date(value)
+    if parsed is None:
+        raise ValueError(f"data não reconhecida: {value!r}")
+    if end_of_day and (parsed.hour, parsed.minute, parsed.second, parsed.microsecond) == (0, 0, 0, 0):
+        parsed += timedelta(days=1, microseconds=-1)
+    return parsed.timestamp()
+
+
+class NewsArchive:
+    """Notícias aceitas (título, link, fonte, data, resumo) em SQLite, com índice FTS5.
+
+    ``add`` acumula as linhas e grava em lote a cada ``batch_size`` notícias
+    ou no ``commit``; o índice FTS5 de título e resumo é mantido por
+    trigger na mesma transação. ``published`` é a data da notícia quando
+    ``core.dates`` a reconhece, senão a hora do arquivamento.
+    """
+
+    def __init__(self, path=ARCHIVE_FILE, batch_size=BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.pending = []
+
+    def add(self, news, key=None):
+        now = time.time()
+        published = parse_date(news["date"]) if news.get("date") else None
+        row = (
+            key or news["link"], news["title"], news["link"], news.get("source"), news.get("summary"),
+            news.get("category"), news.get("date"), published.timestamp() if published else now, now
+        )
+        with self.lock:
+            self.pending.append(row)
+            if len(self.pending) >= self.batch_size:
+                self.commit()
+
+    def commit(self):
+        with self.lock:
+            if not self.pending:
+                return
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO articles "
+                    "(key, title, link, source, summary, category, date, published, archived) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    self.pending
+                )
+            self.pending = []
+
+    def search(self, query=None, source=None, since=None, until=None, limit=SEARCH_LIMIT):
+        """Notícias que contêm todas as palavras de ``query``, da mais nova para a mais antiga.
+
+        ``since`` e ``until`` aceitam timestamp, ``datetime`` ou texto em
+        qualquer formato de ``core.dates``.
+
+        Com palavras, o FTS5 percorre as ocorrências do id mais alto para o
+        mais baixo e para no ``limit``; um período vira antes um intervalo de
+        ids (pelo índice de ``published``), para que a busca não atravesse
+        as ocorrências mais novas que o período. Sem palavras, os índices
+        de ``published`` e de ``(source, published)`` dão a ordem.
+        """
+        since = _timestamp(since)
+        until = _timestamp(until, end_of_day=True)
+        conditions, params = [], []
+        match = match_query(query) if query else ""
+        with self.lock:
+            if match:
+                tables = "articles_fts JOIN articles a ON a.id = articles_fts.rowid"
+                conditions.append("articles_fts MATCH ?")
+                params.append(match)
+                order = "articles_fts.rowid DESC"
+                if since is not None or until is not None:
+                    low, high = self.conn.execute(
+                        "SELECT MIN(id), MAX(id) FROM articles WHERE published BETWEEN ? AND ?",
+                        (float("-inf") if since is None else since, float("inf") if until is None else until)
+                    ).fetchone()
+                    if low is None:
+                        return []
+                    conditions.append("articles_fts.rowid BETWEEN ? AND ?")
+                    params.extend((low, high))
+            else:
+                tables = "articles a"
+                order = "a.published DESC"
+            if source:
+                conditions.append("a.source = ?")
+                params.append(source)
+            if since is not None:
+                conditions.append("a.published >= ?")
+                params.append(since)
+            if until is not None:
+                conditions.append("a.published <= ?")
+                params.append(until)
+            where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+            sql = f"SELECT {', '.join('a.' + c for c in COLUMNS)} FROM {tables}{where} ORDER BY {order} LIMIT ?"
+            rows = self.conn.execute(sql, params + [limit]).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def get_archive():
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = NewsArchive()
+        return _archive
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.archive", description="Busca no arquivo de notícias.")
+    parser.add_argument("query", nargs="?", default="", help="palavras a procurar no título e no resumo")
+    parser.add_argument("--source", help="só notícias desta fonte (nome exato)")
+    parser.add_argument("--since", help='a partir desta data ("ontem", "há 7 dias", "01/04/2025")')
+    parser.add_argument("--until", help="até esta data")
+    parser.add_argument("--limit", type=int, default=SEARCH_LIMIT, help=f"máximo de resultados (padrão {SEARCH_LIMIT})")
+    parser.add_argument("--json", action="store_true", help="uma notícia por linha em JSON")
+    parser.add_argument("--db", default=ARCHIVE_FILE, help="arquivo do banco")
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.db):
+        print(f"Arquivo {args.db} não encontrado.", file=sys.stderr)
+        return 1
+    archive = NewsArchive(args.db)
+    start = time.perf_counter()
+    try:
+        results = archive.search(args.query, args.source, args.since, args.until, args.limit)
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+    for news in results:
+        if args.json:
+            print(json.dumps(news, ensure_ascii=False))
+            continue
+        print(f"{news['date'] or '-'} | {news['source']} | {news['title']}\n    {news['link']}")
+    if not args.json:
+        print(f"\n{len(results)} resultado(s) em {elapsed * 1000:.1f} ms.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
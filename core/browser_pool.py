@@ -0,0 +1,153 @@
+import atexit
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MAX_PAGES = 50
+MAX_RSS_MB = 700
+PAGE_LOAD_TIMEOUT = 30
+BLOCKED_URLS = [
+    "*.css", "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.mp4"
+]
+
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
+
+def driver_path():
+    """Resolve o chromedriver uma única vez por processo."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+class _Browser:
+    def __init__(self):
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.fonts": 2
+        })
+        self.driver = webdriver.Chrome(service=Service(driver_path()), options=options)
+        self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+        self.pages = 0
+
+    def rss_mb(self):
+        if psutil is None:
+            return 0
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logging.error(f"Erro ao encerrar o navegador: {str(e)}")
+
+
+class BrowserPool:
+    """Navegadores headless de longa duração, reaproveitados entre ciclos.
+
+    Cada navegador é reciclado depois de ``max_pages`` páginas ou quando o
+    Chrome passa de ``max_rss_mb`` (medido com psutil, se instalado).
+    Imagens, fontes e CSS são bloqueados via CDP.
+    """
+
+    def __init__(self, size=1, max_pages=MAX_PAGES, max_rss_mb=MAX_RSS_MB):
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.idle = queue.LifoQueue()
+        self.slots = threading.Semaphore(size)
+        self.all = set()
+        self.lock = threading.Lock()
+        atexit.register(self.close)
+
+    def _create(self):
+        browser = _Browser()
+        with self.lock:
+            self.all.add(browser)
+        return browser
+
+    def _discard(self, browser):
+        with self.lock:
+            self.all.discard(browser)
+        browser.quit()
+
+    @contextmanager
+    def driver(self):
+        self.slots.acquire()
+        try:
+            try:
+                browser = self.idle.get_nowait()
+            except queue.Empty:
+                browser = self._create()
+            try:
+                yield browser.driver
+            except TimeoutException:
+                browser.pages += 1
+                self._release(browser)
+                raise
+            except Exception:
+                self._discard(browser)
+                raise
+            else:
+                browser.pages += 1
+                self._release(browser)
+        finally:
+            self.slots.release()
+
+    def _release(self, browser):
+        if browser.pages >= self.max_pages:
+            logging.info(f"Reciclando navegador após {browser.pages} páginas.")
+            self._discard(browser)
+        elif self.max_rss_mb and browser.rss_mb() > self.max_rss_mb:
+            logging.info(f"Reciclando navegador por uso de memória ({browser.rss_mb():.0f} MB).")
+            self._discard(browser)
+        else:
+            self.idle.put(browser)
+
+    def close(self):
+        with self.lock:
+            browsers = list(self.all)
+            self.all.clear()
+        for browser in browsers:
+            browser.quit()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool()
+        return _pool
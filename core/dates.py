@@ -0,0 +1,150 @@
+import re
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+TZ = ZoneInfo("America/Sao_Paulo")
+
+MONTHS = {
+    "janeiro": 1, "fevereiro": 2, "marco": 3, "março": 3, "abril": 4, "maio": 5, "junho": 6,
+    "julho": 7, "agosto": 8, "setembro": 9, "outubro": 10, "novembro": 11, "dezembro": 12,
+    "jan": 1, "fev": 2, "mar": 3, "abr": 4, "mai": 5, "jun": 6,
+    "jul": 7, "ago": 8, "set": 9, "out": 10, "nov": 11, "dez": 12
+}
+UNITS = {
+    "segundo": "seconds", "segundos": "seconds", "s": "seconds",
+    "minuto": "minutes", "minutos": "minutes", "min": "minutes",
+    "hora": "hours", "horas": "hours", "h": "hours",
+    "dia": "days", "dias": "days",
+    "semana": "weeks", "semanas": "weeks"
+}
+NUMBERS = {"um": 1, "uma": 1, "dois": 2, "duas": 2, "três": 3, "tres": 3}
+
+_TIME = r"(?:\s*(?:,|-|às|as|a partir das)?\s*(?P<hour>\d{1,2})\s*[h:]\s*(?P<minute>\d{2})?(?:\s*min)?)?"
+_PATTERNS = [
+    ("rfc822", re.compile(
+        r"(?:[a-z]{3},\s*)?\d{1,2}\s+[a-z]{3}\s+\d{4}\s+\d{1,2}:\d{2}(?::\d{2})?"
+        r"(?:\s*(?:[+-]\d{4}|gmt|ut|utc|[a-z]{3}))?"
+    )),
+    ("iso", re.compile(
+        r"\d{4}-\d{2}-\d{2}(?:[t ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:z|[+-]\d{2}:?\d{2})?)?"
+    )),
+    ("numeric", re.compile(
+        r"(?P<day>\d{1,2})/(?P<month>\d{1,2})/(?P<year>\d{2,4})" + _TIME
+    )),
+    ("long", re.compile(
+        r"(?:[^\W\d_-]+(?:-feira)?,\s*)?(?P<day>\d{1,2})\s+(?:de\s+)?(?P<month>[^\W\d_]+)\.?\s+(?:de\s+)?(?P<year>\d{4})" + _TIME
+    )),
+    ("relative", re.compile(
+        r"(?:há|ha)\s+(?:cerca de\s+)?(?P<amount>\d+|um|uma|dois|duas|três|tres)\s*(?P<unit>[a-z]+)(?:\s+atrás)?"
+        r"|(?P<amount2>\d+)\s*(?P<unit2>[a-z]+)\s+atrás"
+    )),
+    ("day", re.compile(
+        r"(?P<word>hoje|ontem|anteontem)" + _TIME
+    )),
+    ("time", re.compile(
+        r"(?P<hour>\d{1,2})\s*[h:]\s*(?P<minute>\d{2})"
+    )),
+    ("now", re.compile(r"agora(?: mesmo)?|neste momento")),
+]
+DAY_OFFSETS = {"hoje": 0, "ontem": 1, "anteontem": 2}
+
+
+def _clock(match):
+    hour = int(match.group("hour")) if match.group("hour") else 0
+    minute = int(match.group("minute")) if match.group("minute") else 0
+    return hour, minute
+
+
+@lru_cache(maxsize=8192)
+def _classify(text):
+    """Reconhece a forma da data uma vez por string; o resultado não depende do relógio.
+
+    Devolve ``("abs", datetime)``, ``("ago", timedelta)``,
+    ``("day", dias_atrás, h, m, tem_hora)``, ``("clock", h, m)`` ou None.
+    Frases relativas guardam só o deslocamento, que é aplicado ao relógio
+    em ``parse_date``.
+    """
+    for kind, pattern in _PATTERNS:
+        match = pattern.fullmatch(text)
+        if match is None:
+            continue
+        if kind in ("rfc822", "iso"):
+            try:
+                value = parsedate_to_datetime(text) if kind == "rfc822" else datetime.fromisoformat(text.upper())
+            except ValueError:
+                return None
+            return ("abs", value.replace(tzinfo=TZ) if value.tzinfo is None else value.astimezone(TZ))
+        if kind in ("numeric", "long"):
+            month = match.group("month")
+            month = int(month) if month.isdigit() else MONTHS.get(month)
+            if not month:
+                return None
+            year = int(match.group("year"))
+            year += 2000 if year < 100 else 0
+            hour, minute = _clock(match)
+            try:
+                return ("abs", datetime(year, month, int(match.group("day")), hour, minute, tzinfo=TZ))
+            except ValueError:
+                return None
+        if kind == "relative":
+            amount = match.group("amount") or match.group("amount2")
+            unit = UNITS.get(match.group("unit") or match.group("unit2"))
+            if unit is None:
+                return None
+            amount = int(amount) if amount.isdigit() else NUMBERS[amount]
+            try:
+                return ("ago", timedelta(**{unit: amount}))
+            except OverflowError:
+                return None
+        if kind == "day":
+            hour, minute = _clock(match)
+            if hour > 23 or minute > 59:
+                return None
+            return ("day", DAY_OFFSETS[match.group("word")], hour, minute, match.group("hour") is not None)
+        if kind == "time":
+            hour, minute = _clock(match)
+            if hour > 23 or minute > 59:
+                return None
+            return ("clock", hour, minute)
+        if kind == "now":
+            return ("ago", timedelta(0))
+    return None
+
+
+def normalize(text):
+    return " ".join(text.strip().lower().split())
+
+
+def parse_date(text, now=None):
+    """Converte datas absolutas e relativas em datetime com fuso America/Sao_Paulo.
+
+    Aceita RFC 822 (RSS), ISO 8601, "13/04/2025 08h15", "13 de abril de
+    2025", "há 2 horas", "ontem às 18h30", "hoje", "14h05" e "agora".
+    Devolve None quando não reconhece o texto, em vez de inventar a hora
+    atual.
+    """
+    if not text:
+        return None
+    parsed = _classify(normalize(text))
+    if parsed is None:
+        return None
+    now = now or datetime.now(TZ)
+    kind = parsed[0]
+    if kind == "abs":
+        return parsed[1]
+    if kind == "ago":
+        try:
+            return now - parsed[1]
+        except OverflowError:
+            return None
+    if kind == "day":
+        _, offset, hour, minute, has_time = parsed
+        day = now - timedelta(days=offset)
+        if not has_time:
+            return day.replace(hour=0, minute=0, second=0, microsecond=0) if offset else now
+        return day.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    _, hour, minute = parsed
+    value = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return value - timedelta(days=1) if value > now + timedelta(minutes=5) else value
@@ -0,0 +1,294 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+from core.digest import MEDIA_GROUP_MAX, media_group, pack
+from core.events import get_event_log
+from core.http import get_session
+from core.metrics import DELIVERY_DELAY, MESSAGES, SEND_SECONDS
+
+TELEGRAM_API_URL = "https://api.telegram.org"
+
+# Limites documentados pelo Telegram: ~30 mensagens/s por bot, 1 mensagem/s
+# por chat e no máximo 20 mensagens/min em grupos e canais.
+GLOBAL_RATE = 30.0
+CHAT_RATE = 1.0
+GROUP_RATE = 20.0 / 60.0
+GROUP_BURST = 20
+MAX_ATTEMPTS = 3
+# Modo resumo: depois de um envio, notícias de um chat esperam até
+# DIGEST_WINDOW segundos e seguem juntas na próxima mensagem.
+DIGEST_WINDOW = 30.0
+DIGEST_MAX_ITEMS = 50
+MEDIA_GROUPS = True
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now=None):
+        """Segundos até haver uma ficha disponível (0 se já houver)."""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def consume(self, now=None):
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        self.tokens -= 1
+
+
+class _ChatState:
+    def __init__(self, chat_id, digest_window=0.0):
+        self.pending = deque()
+        self.blocked_until = 0.0
+        self.last_sent = float("-inf")
+        self.digest_window = digest_window
+        self.buckets = [TokenBucket(CHAT_RATE, 1)]
+        if str(chat_id).startswith("-"):
+            self.buckets.append(TokenBucket(GROUP_RATE, GROUP_BURST))
+
+    def ready_at(self, now):
+        wait = max(bucket.wait_time(now) for bucket in self.buckets)
+        ready = max(now + wait, self.blocked_until)
+        if self.digest_window and "item" in self.pending[0]:
+            ready = max(ready, self.last_sent + self.digest_window)
+        return ready
+
+
+class TelegramDeliveryWorker:
+    """Fila de envio ao Telegram drenada por uma thread de longa duração.
+
+    Quem detecta notícias só chama ``enqueue`` e segue em frente. A thread
+    mantém uma única sessão HTTP, respeita os limites por chat e global com
+    token buckets e, num HTTP 429, espera o ``retry_after`` indicado pela API
+    apenas para o chat afetado.
+
+    Notícias enfileiradas com ``enqueue_item`` (modo resumo) são montadas na
+    hora do envio: tudo o que estiver pendente para o chat vai no menor
+    número de mensagens de até 4096 caracteres, ou num ``sendMediaGroup``
+    quando há fotos. A primeira notícia sai assim que o chat estiver livre;
+    as seguintes esperam ``digest_window`` segundos e seguem juntas.
+    """
+
+    def __init__(self, token, api_url=TELEGRAM_API_URL, session=None,
+                 digest_window=DIGEST_WINDOW, media_groups=MEDIA_GROUPS):
+        self.token = token
+        self.api_url = api_url.rstrip("/")
+        self.session = session or get_session()
+        self.digest_window = digest_window
+        self.media_groups = media_groups
+        self.inbox = queue.Queue()
+        self.global_bucket = TokenBucket(GLOBAL_RATE, GLOBAL_RATE)
+        self.chats = {}
+        self.sent = 0
+        self.items_sent = 0
+        self.failed = 0
+        self.rate_limited = 0
+        self._unfinished = 0
+        self._idle = threading.Condition()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="telegram-delivery", daemon=True)
+            self._thread.start()
+        return self
+
+    def enqueue(self, chat_id, text, parse_mode="HTML", agent=None):
+        """Põe a mensagem na fila; ``agent`` só identifica a origem no registro de eventos."""
+        self._put({
+            "chat_id": chat_id, "method": "sendMessage",
+            "payload": {"chat_id": chat_id, "text": text, "parse_mode": parse_mode},
+            "enqueued": time.monotonic(), "agent": agent
+        })
+
+    def enqueue_item(self, chat_id, news, agent=None):
+        """Põe uma notícia na fila do modo resumo; o texto é montado na hora do envio."""
+        self._put({"chat_id": chat_id, "item": news, "enqueued": time.monotonic(), "agent": agent})
+
+    def _put(self, entry):
+        with self._idle:
+            self._unfinished += 1
+        self.inbox.put(entry)
+        self.start()
+
+    def queue_depth(self):
+        return self._unfinished
+
+    def flush(self, timeout=None):
+        """Bloqueia até a fila esvaziar; usado ao encerrar scripts avulsos."""
+        with self._idle:
+            return self._idle.wait_for(lambda: self._unfinished == 0, timeout)
+
+    def _done(self, count=1):
+        with self._idle:
+            self._unfinished -= count
+            if self._unfinished == 0:
+                self._idle.notify_all()
+
+    def _drain_inbox(self, timeout):
+        try:
+            message = self.inbox.get(timeout=timeout) if timeout > 0 else self.inbox.get_nowait()
+        except queue.Empty:
+            return
+        while True:
+            chat = self.chats.get(message["chat_id"])
+            if chat is None:
+                chat = self.chats[message["chat_id"]] = _ChatState(message["chat_id"], self.digest_window)
+            chat.pending.append(message)
+            try:
+                message = self.inbox.get_nowait()
+            except queue.Empty:
+                return
+
+    def _next_chat(self, now):
+        best, best_at = None, None
+        for chat in self.chats.values():
+            if not chat.pending:
+                continue
+            ready_at = chat.ready_at(now)
+            if best is None or ready_at < best_at:
+                best, best_at = chat, ready_at
+        if best is None:
+            return None, None
+        return best, max(best_at, now + self.global_bucket.wait_time(now))
+
+    def _run(self):
+        while True:
+            now = time.monotonic()
+            chat, ready_at = self._next_chat(now)
+            if chat is None:
+                self._drain_inbox(timeout=1.0)
+                continue
+            if ready_at > now:
+                self._drain_inbox(timeout=ready_at - now)
+                continue
+            self._drain_inbox(timeout=0)
+            message = self._next_message(chat)
+            now = time.monotonic()
+            self.global_bucket.consume(now)
+            for bucket in chat.buckets:
+                bucket.consume(now)
+            chat.last_sent = now
+            self._deliver(chat, message)
+
+    def _message(self, chat_id, method, payload, entries):
+        return {"chat_id": chat_id, "method": method, "payload": payload, "entries": entries, "attempts": 0}
+
+    def _requeue(self, chat, entries):
+        for entry in reversed(entries):
+            chat.pending.appendleft(entry)
+
+    def _next_message(self, chat):
+        """Tira da fila do chat a próxima chamada à API, montando o resumo se for o caso."""
+        head = chat.pending.popleft()
+        if "entries" in head:
+            return head
+        if "item" not in head:
+            return self._message(head["chat_id"], head["method"], head["payload"], [head])
+        entries = [head]
+        while chat.pending and "item" in chat.pending[0] and len(entries) < DIGEST_MAX_ITEMS:
+            entries.append(chat.pending.popleft())
+        chat_id = head["chat_id"]
+        if self.media_groups:
+            photos = [e for e in entries if e["item"].get("image") and not e.get("text_only")][:MEDIA_GROUP_MAX]
+            if len(photos) >= 2:
+                chosen = {id(e) for e in photos}
+                self._requeue(chat, [e for e in entries if id(e) not in chosen])
+                return self._message(chat_id, "sendMediaGroup", media_group(chat_id, [e["item"] for e in photos]), photos)
+        text, count = pack([e["item"] for e in entries])[0]
+        self._requeue(chat, entries[count:])
+        payload = {"chat_id": chat_id, "text": text, "parse_mode": "HTML", "disable_web_page_preview": count > 1}
+        return self._message(chat_id, "sendMessage", payload, entries[:count])
+
+    def _deliver(self, chat, message):
+        message["attempts"] += 1
+        start = time.monotonic()
+        try:
+            response = self.session.post(f"{self.api_url}/bot{self.token}/{message['method']}", json=message["payload"])
+        except Exception as e:
+            logging.error(f"Erro ao enviar para o Telegram: {str(e)}")
+            self._retry_or_drop(chat, message, delay=2 ** message["attempts"])
+            return
+        now = time.monotonic()
+        SEND_SECONDS.labels().observe(now - start)
+        if response.status_code == 200:
+            self.sent += 1
+            self.items_sent += len(message["entries"])
+            MESSAGES.labels("sent").inc()
+            self._record(message, "sent", now)
+            self._done(len(message["entries"]))
+            return
+        if response.status_code == 429:
+            self.rate_limited += 1
+            MESSAGES.labels("rate_limited").inc()
+            try:
+                retry_after = response.json()["parameters"]["retry_after"]
+            except Exception:
+                retry_after = 5
+            logging.warning(f"Telegram limitou o chat {message['chat_id']}; aguardando {retry_after}s.")
+            get_event_log().emit("rate_limited", message["entries"][0]["agent"], chat_id=message["chat_id"], retry_after=retry_after)
+            chat.blocked_until = time.monotonic() + retry_after
+            chat.pending.appendleft(message)
+            return
+        if response.status_code >= 500:
+            self._retry_or_drop(chat, message, delay=2 ** message["attempts"])
+            return
+        if message["method"] == "sendMediaGroup":
+            logging.warning(f"Álbum recusado pelo Telegram ({response.status_code}); enviando como texto.")
+            for entry in message["entries"]:
+                entry["text_only"] = True
+            self._requeue(chat, message["entries"])
+            return
+        logging.error(f"Falha ao enviar notícia: {response.text}")
+        self.failed += 1
+        MESSAGES.labels("failed").inc()
+        self._record(message, "failed", now)
+        self._done(len(message["entries"]))
+
+    def _record(self, message, result, now):
+        events = get_event_log()
+        for entry in message["entries"]:
+            if result == "sent":
+                DELIVERY_DELAY.labels().observe(now - entry["enqueued"])
+            events.emit(
+                "delivery", entry["agent"], chat_id=message["chat_id"], result=result, method=message["method"],
+                batch=len(message["entries"]), attempts=message["attempts"], delay=round(now - entry["enqueued"], 3)
+            )
+
+    def _retry_or_drop(self, chat, message, delay):
+        if message["attempts"] >= MAX_ATTEMPTS:
+            logging.error(f"Mensagem descartada após {MAX_ATTEMPTS} tentativas.")
+            self.failed += 1
+            MESSAGES.labels("failed").inc()
+            self._record(message, "failed", time.monotonic())
+            self._done(len(message["entries"]))
+            return
+        chat.blocked_until = time.monotonic() + delay
+        chat.pending.appendleft(message)
+
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+def get_worker(token, api_url=TELEGRAM_API_URL):
+    """Devolve o worker compartilhado para o token, criando-o na primeira chamada."""
+    with _workers_lock:
+        worker = _workers.get(token)
+        if worker is None:
+            worker = _workers[token] = TelegramDeliveryWorker(token, api_url)
+        return worker.start()
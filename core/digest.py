@@ -0,0 +1,84 @@
+import html
+
+MESSAGE_LIMIT = 4096
+CAPTION_LIMIT = 1024
+MEDIA_GROUP_MAX = 10
+HEADER_ONE = "📰 <b>Nova notícia</b>"
+HEADER_MANY = "📰 <b>Novas notícias</b>"
+
+
+def escape_html(text):
+    return html.escape(str(text), quote=False)
+
+
+def format_single(news):
+    """Mensagem HTML de uma notícia só (``DELIVERY_MODE = "single"``); o link vai escapado no ``href``."""
+    message = (
+        f"📰 <b>Nova notícia encontrada!</b>\n\n"
+        f"📌 <b>Título:</b> {escape_html(news['title'])}\n"
+        f'🔗 <b>Link:</b> <a href="{html.escape(news["link"], quote=True)}">Clique aqui</a>\n'
+        f"📅 <b>Data:</b> {escape_html(news.get('date', 'Não informada'))}\n"
+        f"📸 <b>Imagem:</b> {escape_html(news.get('image', 'Sem imagem'))}"
+    )
+    if news.get("other_sources"):
+        message += f"\n🔁 <b>Também em:</b> {escape_html(', '.join(news['other_sources']))}"
+    return message
+
+
+def _link(news, limit):
+    title = news["title"]
+    if len(title) > limit:
+        title = title[:limit - 1].rstrip() + "…"
+    return f'<a href="{html.escape(news["link"], quote=True)}">{escape_html(title)}</a>'
+
+
+def format_line(news):
+    line = f"• {_link(news, 300)}"
+    if news.get("date"):
+        line += f" <i>{escape_html(news['date'])}</i>"
+    if news.get("other_sources"):
+        line += f"\n   🔁 também em {escape_html(', '.join(news['other_sources']))}"
+    return line
+
+
+def pack(news_list, limit=MESSAGE_LIMIT):
+    """Agrupa notícias no menor número de mensagens HTML de até ``limit`` caracteres.
+
+    Dentro de cada mensagem as notícias ficam sob o nome da fonte, na ordem
+    em que chegaram. Devolve ``[(texto, quantidade)]``; a quantidade diz
+    quantos itens do início de ``news_list`` cada mensagem consumiu. O
+    limite é aplicado ao HTML com marcação, então o texto visível sempre
+    fica abaixo dele; títulos longos são cortados para que um item sozinho
+    caiba numa mensagem.
+    """
+    messages = []
+    index = 0
+    while index < len(news_list):
+        body, count, source = "", 0, None
+        for news in news_list[index:]:
+            block = ""
+            if news["source"] != source:
+                block += f"\n\n<b>{escape_html(news['source'])}</b>"
+            block += "\n" + format_line(news)
+            if count and len(HEADER_MANY) + len(body) + len(block) > limit:
+                break
+            body += block
+            source = news["source"]
+            count += 1
+        messages.append(((HEADER_MANY if count > 1 else HEADER_ONE) + body, count))
+        index += count
+    return messages
+
+
+def media_group(chat_id, news_list):
+    """Payload de ``sendMediaGroup`` com uma foto por notícia (de 2 a ``MEDIA_GROUP_MAX``)."""
+    media = []
+    for news in news_list[:MEDIA_GROUP_MAX]:
+        caption = f"{_link(news, 300)}\n<i>{escape_html(news['source'])}</i>"
+        media.append({
+            "type": "photo",
+            "media": news["image"],
+            "caption": caption[:CAPTION_LIMIT],
+            "parse_mode": "HTML"
+        })
+    return {"chat_id": chat_id, "media": media}
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from core.http import CancelToken, set_cancel_token
+from core.metrics import FETCH_DEFERRED, FETCH_ERRORS, FETCH_HEDGES, FETCH_SECONDS
+
+HEDGE_QUANTILE = 0.95
+HEDGE_WINDOW = 50
+HEDGE_MIN_SAMPLES = 10
+HEDGE_MIN_DELAY = 0.5
+
+
+class FetchResult:
+    __slots__ = ("agent", "source", "items", "error", "elapsed")
+
+    def __init__(self, agent, source, items, error, elapsed):
+        self.agent = agent
+        self.source = source
+        self.items = items
+        self.error = error
+        self.elapsed = elapsed
+
+
+class FetchEngine:
+    """Busca todas as fontes de todos os agentes em paralelo.
+
+    Cada par (agente, fonte) vira uma tarefa num event loop próprio, numa
+    thread de fundo; no máximo ``max_concurrency`` rodam ao mesmo tempo.
+    Com um ``pool``, os agentes marcados como ``isolated`` rodam em outro
+    processo e os demais continuam aqui.
+
+    ``iter_cycle`` entrega os resultados em lotes, à medida que as fontes
+    terminam, e para de esperar quando o ``budget`` do ciclo acaba: as
+    fontes que ainda estão rodando são adiadas, sem bloquear o resto, e
+    o resultado delas chega depois em ``wait_results``. Uma busca em
+    processo que passa do p95 recente da fonte (as últimas
+    ``HEDGE_WINDOW`` buscas, no mínimo ``HEDGE_MIN_DELAY``) ganha uma
+    cópia; a primeira que terminar vale e a outra é cancelada.
+    """
+
+    def __init__(self, max_concurrency=16, pool=None):
+        self.max_concurrency = max_concurrency
+        self.pool = pool
+        self.latencies = {}
+        self.results = queue.Queue()
+        self.loop = None
+        self.semaphore = None
+        self.lock = threading.Lock()
+
+    def _ensure_loop(self):
+        with self.lock:
+            if self.loop is None:
+                loop = asyncio.new_event_loop()
+                # Folga para as cópias das buscas lentas não esperarem vaga atrás das originais.
+                loop.set_default_executor(ThreadPoolExecutor(max_workers=self.max_concurrency * 2))
+                threading.Thread(target=loop.run_forever, daemon=True).start()
+                self.semaphore = asyncio.run_coroutine_threadsafe(self._semaphore(), loop).result()
+                self.loop = loop
+            return self.loop
+
+    async def _semaphore(self):
+        return asyncio.Semaphore(self.max_concurrency)
+
+    def hedge_delay(self, name):
+        """Latência alvo da fonte (p95 recente), ou None sem histórico suficiente."""
+        recent = sorted(self.latencies.get(name, ()))
+        if len(recent) < HEDGE_MIN_SAMPLES:
+            return None
+        return max(HEDGE_MIN_DELAY, recent[min(len(recent) - 1, int(HEDGE_QUANTILE * len(recent)))])
+
+    async def _attempt(self, agent, source, token):
+        set_cancel_token(token)
+        return await agent.afetch_source(source)
+
+    async def _hedged(self, agent, source):
+        name = source["name"]
+        tokens = [CancelToken()]
+        tasks = [asyncio.ensure_future(self._attempt(agent, source, tokens[0]))]
+        delay = self.hedge_delay(name)
+        done = ()
+        if delay is not None:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                logging.info(f"{name} passou de {delay:.1f}s (p95 recente); disparando uma segunda busca.")
+                # A cópia não usa os validadores: a original pode já ter gravado o ETag novo e a cópia levaria um 304.
+                tokens.append(CancelToken(conditional=False))
+                tasks.append(asyncio.ensure_future(self._attempt(agent, source, tokens[1])))
+        pending = set(tasks)
+        winner = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            winner = next((task for task in tasks if task in done and task.exception() is None), None)
+            if winner is not None:
+                break
+        for task, token in zip(tasks, tokens):
+            if task is not winner and not task.done():
+                token.cancel()
+                task.cancel()
+        if len(tasks) > 1:
+            FETCH_HEDGES.labels("hedge" if winner is tasks[1] else "primary").inc()
+        if winner is None:
+            raise tasks[0].exception()
+        return winner.result()
+
+    async def _fetch_one(self, agent, source):
+        async with self.semaphore:
+            start = time.monotonic()
+            try:
+                if self.pool is not None and agent.isolated:
+                    items = await asyncio.to_thread(self.pool.run, agent, source)
+                else:
+                    items = await self._hedged(agent, source)
+                error = None
+            except Exception as e:
+                items, error = [], e
+                FETCH_ERRORS.labels(source["name"]).inc()
+                logging.error(f"Erro ao buscar {source['name']}: {str(e)}")
+            elapsed = time.monotonic() - start
+            FETCH_SECONDS.labels(source["name"]).observe(elapsed)
+            self.latencies.setdefault(source["name"], deque(maxlen=HEDGE_WINDOW)).append(elapsed)
+            return FetchResult(agent, source, items or [], error, elapsed)
+
+    def iter_cycle(self, agents, only=None, budget=None):
+        """Gera listas de ``FetchResult`` conforme as fontes terminam, até acabar o ``budget`` (segundos).
+
+        Cada lote traz tudo o que terminou enquanto o anterior era
+        processado. Fontes que passam do prazo continuam rodando e o
+        resultado delas vai para ``wait_results``.
+        """
+        loop = self._ensure_loop()
+        pending = {
+            asyncio.run_coroutine_threadsafe(self._fetch_one(agent, source), loop): source["name"]
+            for agent in agents
+            for source in agent.sources()
+            if only is None or source["name"] in only
+        }
+        deadline = None if budget is None else time.monotonic() + budget
+        waiting = set(pending)
+        while waiting:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            done, waiting = wait(waiting, timeout=remaining, return_when=FIRST_COMPLETED)
+            if done:
+                yield [future.result() for future in done]
+        if waiting:
+            names = sorted(pending[future] for future in waiting)
+            logging.warning(f"Prazo do ciclo esgotado; adiando {len(names)} fontes: {', '.join(names)}")
+            for future in waiting:
+                FETCH_DEFERRED.labels(pending[future]).inc()
+                future.add_done_callback(lambda f: self.results.put(f.result()))
+
+    def run_cycle(self, agents, only=None, budget=None):
+        """Busca as fontes dos agentes; ``only`` limita aos nomes de fonte informados."""
+        return [result for batch in self.iter_cycle(agents, only, budget) for result in batch]
+
+    def wait_results(self, timeout):
+        """Espera até ``timeout`` segundos por resultados que chegaram fora de um ciclo (fontes adiadas, WebSub)."""
+        try:
+            results = [self.results.get(timeout=max(0, timeout))]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                results.append(self.results.get_nowait())
+            except queue.Empty:
+                return results
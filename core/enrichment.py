@@ -0,0 +1,253 @@
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from urllib3.exceptions import ReadTimeoutError
+
+from core.dates import parse_date
+from core.http import CONNECT_TIMEOUT, get_session
+from core.metrics import REGISTRY
+from core.parsing import HtmlParser, compile_selector
+from core.sources import DATE_OUTPUT
+
+ENRICH_CONCURRENCY = 8
+ENRICH_DEADLINE = 3.0
+CACHE_SIZE = 4096
+CACHE_TTL = 6 * 3600
+NEGATIVE_TTL = 600
+HEAD_CHUNK = 4096
+MAX_HEAD_BYTES = 256 * 1024
+TRACKING_PREFIXES = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+_HEAD_END = re.compile(rb"</head\s*>|<body[\s>]", re.IGNORECASE)
+_META_CHARSET = re.compile(rb"<meta[^>]+charset=[\"']?([\w-]+)", re.IGNORECASE)
+_HEADER_CHARSET = re.compile(r"charset=[\"']?([\w-]+)", re.IGNORECASE)
+META = compile_selector("meta")
+CANONICAL = compile_selector('link[rel="canonical"]')
+PROPERTIES = {
+    "og:image": "image",
+    "og:image:url": "image",
+    "twitter:image": "image",
+    "og:description": "summary",
+    "description": "summary",
+    "article:published_time": "published",
+    "og:url": "canonical"
+}
+
+
+def canonical_url(url):
+    """URL sem fragmento, parâmetros de rastreamento nem barra final, com host em minúsculas."""
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PREFIXES)
+    ))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/") or "/", query, ""))
+
+
+class TTLCache:
+    """LRU com prazo de validade por entrada; seguro entre threads."""
+
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, now=None):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, value, ttl=None, now=None):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.entries[key] = (now + (self.ttl if ttl is None else ttl), value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def read_head(url, deadline_at):
+    """Baixa a página só até ``</head>`` (ou ``<body>``) e devolve ``(html do head, bytes lidos)``.
+
+    A conexão é fechada assim que o fim do ``<head>`` chega, ao passar de
+    ``MAX_HEAD_BYTES`` ou quando o prazo ``deadline_at`` (``time.monotonic``)
+    vence; nesse último caso levanta ``TimeoutError``.
+    """
+    remaining = deadline_at - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError(url)
+    response = get_session(retries=False).get(url, stream=True, timeout=(min(CONNECT_TIMEOUT, remaining), remaining))
+    try:
+        response.raise_for_status()
+        buffer, received = bytearray(), 0
+        try:
+            for chunk in response.iter_content(HEAD_CHUNK):
+                start = max(0, len(buffer) - 16)
+                buffer += chunk
+                received += len(chunk)
+                end = _HEAD_END.search(buffer, start)
+                if end is not None:
+                    del buffer[end.start():]
+                    break
+                if len(buffer) >= MAX_HEAD_BYTES:
+                    break
+                if time.monotonic() >= deadline_at:
+                    raise TimeoutError(url)
+        except requests.ConnectionError as e:
+            # Um timeout no meio do corpo chega do requests como ConnectionError.
+            if e.args and isinstance(e.args[0], ReadTimeoutError):
+                raise TimeoutError(url) from e
+            raise
+    finally:
+        response.close()
+    charset = _HEADER_CHARSET.search(response.headers.get("Content-Type", ""))
+    if charset is None:
+        charset = _META_CHARSET.search(buffer)
+        encoding = charset.group(1).decode("ascii") if charset else "utf-8"
+    else:
+        encoding = charset.group(1)
+    try:
+        return bytes(buffer).decode(encoding, errors="replace"), received
+    except LookupError:
+        return bytes(buffer).decode("utf-8", errors="replace"), received
+
+
+def parse_head(markup, parser=None):
+    """Metadados Open Graph do ``<head>``: ``image``, ``summary``, ``published`` e ``canonical``."""
+    document = (parser or HtmlParser()).parse(markup)
+    found = {}
+    for node in document.select(META):
+        key = PROPERTIES.get((node.attr("property") or node.attr("name") or "").lower())
+        content = (node.attr("content") or "").strip()
+        if key and content and key not in found:
+            found[key] = content
+    link = document.select_one(CANONICAL)
+    if link is not None and link.attr("href") and "canonical" not in found:
+        found["canonical"] = link.attr("href")
+    return found
+
+
+class Enricher:
+    """Completa ``image``, ``summary`` e ``date`` das notícias novas com o ``<head>`` da matéria.
+
+    As páginas são buscadas em paralelo (no máximo ``concurrency``), lendo
+    só até o fim do ``<head>``; o resultado fica num ``TTLCache`` pela URL
+    canônica (a do link e a declarada pela página), então a mesma matéria
+    vista de novo não custa nenhuma requisição. ``enrich`` nunca espera
+    mais que ``deadline`` segundos: o que não ficou pronto segue sem
+    enriquecimento, e as buscas atrasadas desistem no mesmo prazo.
+    """
+
+    def __init__(self, concurrency=ENRICH_CONCURRENCY, deadline=ENRICH_DEADLINE, cache=None):
+        self.deadline = deadline
+        self.cache = cache or TTLCache()
+        self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="enrich")
+        self.parser = HtmlParser()
+        self.lock = threading.Lock()
+        self.counts = {"cache": 0, "fetched": 0, "timeout": 0, "skipped": 0, "error": 0, "bytes": 0}
+
+    def _count(self, key, amount=1):
+        with self.lock:
+            self.counts[key] += amount
+
+    def _lookup(self, url, key, deadline_at):
+        if time.monotonic() >= deadline_at:
+            # Nem chegou a sair da fila: fica de fora do cache para tentar no próximo ciclo.
+            self._count("skipped")
+            return None
+        try:
+            markup, received = read_head(url, deadline_at)
+        except (TimeoutError, requests.Timeout):
+            # Matéria lenta demais: não é buscada de novo por NEGATIVE_TTL, para não ocupar outro prazo.
+            self._count("timeout")
+            self.cache.put(key, {}, ttl=NEGATIVE_TTL)
+            return None
+        except Exception as e:
+            logging.warning(f"Não foi possível enriquecer {url}: {str(e)}")
+            self._count("error")
+            self.cache.put(key, {}, ttl=NEGATIVE_TTL)
+            return {}
+        meta = parse_head(markup, self.parser)
+        self._count("fetched")
+        self._count("bytes", received)
+        self.cache.put(key, meta)
+        if meta.get("canonical"):
+            self.cache.put(canonical_url(meta["canonical"]), meta)
+        return meta
+
+    def enrich(self, news_list, deadline=None):
+        """Preenche os campos que faltam nas notícias; devolve quantas foram completadas."""
+        deadline_at = time.monotonic() + (self.deadline if deadline is None else deadline)
+        pending, ready = {}, {}
+        for news in news_list:
+            if not news.get("link") or (news.get("image") and news.get("summary") and news.get("date")):
+                continue
+            key = canonical_url(news["link"])
+            meta = self.cache.get(key)
+            if meta is not None:
+                self._count("cache")
+                ready[key] = meta
+            elif key not in pending:
+                pending[key] = self.executor.submit(self._lookup, news["link"], key, deadline_at)
+        if pending:
+            wait(pending.values(), timeout=max(0, deadline_at - time.monotonic()))
+            for key, future in pending.items():
+                if future.done() and future.result():
+                    ready[key] = future.result()
+        enriched = 0
+        for news in news_list:
+            meta = ready.get(canonical_url(news["link"])) if news.get("link") else None
+            if meta and _apply(news, meta):
+                enriched += 1
+        return enriched
+
+    def status(self):
+        with self.lock:
+            return dict(self.counts, cached_pages=len(self.cache))
+
+
+def _apply(news, meta):
+    changed = False
+    if not news.get("image") and meta.get("image"):
+        news["image"] = meta["image"]
+        changed = True
+    if not news.get("summary") and meta.get("summary"):
+        news["summary"] = meta["summary"]
+        changed = True
+    if not news.get("date") and meta.get("published"):
+        published = parse_date(meta["published"])
+        if published is not None:
+            news["date"] = published.strftime(DATE_OUTPUT)
+            changed = True
+    return changed
+
+
+_enricher = None
+_enricher_lock = threading.Lock()
+
+
+def get_enricher():
+    """Estágio compartilhado do processo; contadores e tamanho do cache aparecem em ``/status``."""
+    global _enricher
+    with _enricher_lock:
+        if _enricher is None:
+            _enricher = Enricher()
+            REGISTRY.add_section("enrichment", _enricher.status)
+        return _enricher
@@ -0,0 +1,190 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from core.metrics import REGISTRY
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EVENTS_FILE = os.path.join(BASE_DIR, "logs", "events.jsonl")
+MAX_BYTES = 10 * 1024 * 1024
+ROTATE_INTERVAL = 86400
+BACKUP_COUNT = 14
+FLUSH_INTERVAL = 1.0
+WINDOW_SLOTS = 60
+SLOT_SECONDS = 60
+
+
+class _Window:
+    """Soma dos últimos ``WINDOW_SLOTS`` minutos em um anel de contadores."""
+
+    __slots__ = ("counts", "epochs")
+
+    def __init__(self):
+        self.counts = [0] * WINDOW_SLOTS
+        self.epochs = [0] * WINDOW_SLOTS
+
+    def add(self, amount, now):
+        epoch = int(now // SLOT_SECONDS)
+        slot = epoch % WINDOW_SLOTS
+        if self.epochs[slot] != epoch:
+            self.epochs[slot] = epoch
+            self.counts[slot] = 0
+        self.counts[slot] += amount
+
+    def total(self, now):
+        oldest = int(now // SLOT_SECONDS) - WINDOW_SLOTS
+        return sum(count for count, epoch in zip(self.counts, self.epochs) if epoch > oldest)
+
+
+class _AgentStatus:
+    COUNTERS = ("fetches", "errors", "items_seen", "items_new", "sent", "failed")
+
+    def __init__(self):
+        self.totals = dict.fromkeys(self.COUNTERS, 0)
+        self.windows = {name: _Window() for name in self.COUNTERS}
+        self.last = {}
+
+    def add(self, name, amount, now):
+        self.totals[name] += amount
+        self.windows[name].add(amount, now)
+
+    def as_dict(self, now):
+        return {
+            **self.totals,
+            "last_hour": {name: window.total(now) for name, window in self.windows.items()},
+            **{key: datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S") for key, ts in self.last.items()}
+        }
+
+
+class EventLog:
+    """Registro de eventos em JSON Lines, só de acréscimo.
+
+    ``emit`` apenas põe o evento num buffer em memória e atualiza os
+    agregados por agente; uma thread grava o buffer a cada
+    ``flush_interval`` segundos, então o ciclo do monitor nunca espera o
+    disco. O arquivo é rotacionado ao passar de ``max_bytes`` ou de
+    ``rotate_interval`` segundos, mantendo ``backups`` arquivos antigos.
+    """
+
+    def __init__(self, path=EVENTS_FILE, max_bytes=MAX_BYTES, rotate_interval=ROTATE_INTERVAL,
+                 backups=BACKUP_COUNT, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.buffer = deque()
+        self.agents = {}
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.closed = False
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.opened_at = self._first_timestamp()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _first_timestamp(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.loads(f.readline())["ts"]
+        except (OSError, ValueError, KeyError):
+            return time.time()
+
+    def emit(self, event, agent=None, **fields):
+        now = time.time()
+        record = {"ts": round(now, 3), "event": event}
+        if agent is not None:
+            record["agent"] = agent
+        record.update(fields)
+        self.buffer.append(record)
+        if agent is not None:
+            self._aggregate(event, agent, fields, now)
+
+    def _aggregate(self, event, agent, fields, now):
+        with self.lock:
+            status = self.agents.get(agent)
+            if status is None:
+                status = self.agents[agent] = _AgentStatus()
+            if event == "fetch":
+                status.add("fetches", 1, now)
+                status.add("items_seen", fields.get("items", 0), now)
+                status.last["last_fetch"] = now
+                if fields.get("error"):
+                    status.add("errors", 1, now)
+                    status.last["last_error"] = now
+            elif event == "item":
+                status.add("items_new", 1, now)
+                status.last["last_new_item"] = now
+            elif event == "delivery":
+                status.add("sent" if fields.get("result") == "sent" else "failed", 1, now)
+                status.last["last_delivery"] = now
+
+    def status(self):
+        """Situação atual de cada agente, só com o que está em memória."""
+        now = time.time()
+        with self.lock:
+            return {agent: status.as_dict(now) for agent, status in self.agents.items()}
+
+    def _run(self):
+        while not self.closed:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        with self.write_lock:
+            lines = []
+            while self.buffer:
+                lines.append(json.dumps(self.buffer.popleft(), ensure_ascii=False))
+            if not lines:
+                return
+            data = "\n".join(lines) + "\n"
+            try:
+                self._rotate_if_needed(len(data.encode("utf-8")))
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(data)
+            except OSError as e:
+                logging.error(f"Erro ao gravar eventos em {self.path}: {str(e)}")
+
+    def _rotate_if_needed(self, incoming):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            self.opened_at = time.time()
+            return
+        if size + incoming <= self.max_bytes and time.time() - self.opened_at < self.rotate_interval:
+            return
+        root, ext = os.path.splitext(self.path)
+        os.replace(self.path, f"{root}-{datetime.now().strftime('%Y%m%d-%H%M%S')}{ext}")
+        self.opened_at = time.time()
+        for old in sorted(glob.glob(f"{root}-*{ext}"))[:-self.backups or None]:
+            os.remove(old)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.wakeup.set()
+        self.flush()
+
+
+_log = None
+_log_lock = threading.Lock()
+
+
+def get_event_log():
+    """Registro compartilhado do processo; os agregados também aparecem em ``/status``."""
+    global _log
+    with _log_lock:
+        if _log is None:
+            _log = EventLog()
+            REGISTRY.add_section("agents", lambda: _log.status())
+        return _log
@@ -0,0 +1,156 @@
+import contextvars
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # noqa: F401
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 20
+POOL_HOSTS = 32
+POOL_MAXSIZE = 8
+USER_AGENT = "Mozilla/5.0 (compatible; projeto-noticias-telegram)"
+
+
+class RequestCancelled(requests.RequestException):
+    """A tentativa foi cancelada (outra cópia da mesma busca terminou antes)."""
+
+
+class CancelToken:
+    """Cancelamento cooperativo das requisições feitas por uma tentativa de busca.
+
+    Depois de ``cancel``, toda requisição nova da tentativa levanta
+    ``RequestCancelled`` e as respostas abertas em modo stream são
+    fechadas, o que interrompe a leitura do corpo. Uma requisição sem
+    stream que já está esperando o servidor só termina no próprio timeout;
+    o resultado dela é descartado.
+
+    ``conditional=False`` marca uma cópia de busca: ela ignora os
+    validadores salvos (ETag, Last-Modified, digest), que a tentativa
+    original pode ter acabado de atualizar, e sempre baixa a página.
+    """
+
+    def __init__(self, conditional=True):
+        self.conditional = conditional
+        self.cancelled = False
+        self.responses = []
+        self.lock = threading.Lock()
+
+    def check(self):
+        if self.cancelled:
+            raise RequestCancelled("tentativa cancelada")
+
+    def track(self, response):
+        with self.lock:
+            if not self.cancelled:
+                self.responses.append(response)
+                return
+        response.close()
+        self.check()
+
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            responses, self.responses = self.responses, []
+        for response in responses:
+            try:
+                response.close()
+            except Exception:
+                pass
+
+
+_cancel_token = contextvars.ContextVar("cancel_token", default=None)
+
+
+def set_cancel_token(token):
+    """Associa ``token`` às requisições do contexto atual (propaga para ``asyncio.to_thread``)."""
+    _cancel_token.set(token)
+
+
+def conditional_allowed():
+    """False dentro de uma cópia de busca, que não deve enviar If-None-Match/If-Modified-Since."""
+    token = _cancel_token.get()
+    return token is None or token.conditional
+
+
+class _TimeoutSession(requests.Session):
+    """Session que aplica timeouts de conexão e leitura a toda requisição e respeita o ``CancelToken`` do contexto."""
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", (CONNECT_TIMEOUT, READ_TIMEOUT))
+        token = _cancel_token.get()
+        if token is None:
+            return super().request(method, url, **kwargs)
+        token.check()
+        response = super().request(method, url, **kwargs)
+        token.track(response)
+        return response
+
+
+def _build_session(retries=True):
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=1,
+        status=2,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    ) if retries else Retry(0, read=False)
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+    session = _TimeoutSession()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "Connection": "keep-alive"
+    })
+    return session
+
+
+_sessions = {}
+_session_lock = threading.Lock()
+
+
+def get_session(retries=True):
+    """Cliente HTTP único do processo: um pool keep-alive por host, com timeouts e retry.
+
+    ``retries=False`` devolve um segundo cliente, sem novas tentativas,
+    para quem trabalha com prazo: uma nova tentativa depois de um timeout
+    passaria do prazo de qualquer jeito.
+    """
+    with _session_lock:
+        if retries not in _sessions:
+            _sessions[retries] = _build_session(retries)
+        return _sessions[retries]
+
+
+def connection_stats():
+    """Requisições e conexões abertas por host, para conferir o reaproveitamento."""
+    stats = {}
+    adapters = [adapter for session in list(_sessions.values()) for adapter in session.adapters.values()]
+    for adapter in {id(a): a for a in adapters}.values():
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.scheme}://{pool.host}:{pool.port}"
+            entry = stats.setdefault(host, {"requests": 0, "connections": 0})
+            entry["requests"] += pool.num_requests
+            entry["connections"] += pool.num_connections
+    for entry in stats.values():
+        if entry["requests"]:
+            entry["reuse_ratio"] = round(1 - entry["connections"] / entry["requests"], 3)
+        else:
+            entry["reuse_ratio"] = 0.0
+    return stats
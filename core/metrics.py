@@ -0,0 +1,235 @@
+import bisect
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STATUS_HOST = "0.0.0.0"
+STATUS_PORT = 5000
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000)
+
+
+class _CounterChild:
+    __slots__ = ("value", "lock")
+
+    def __init__(self):
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+
+class _HistogramChild:
+    """Contagens por faixa em uma lista alocada uma vez; ``observe`` é uma busca binária e um incremento."""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "max", "lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q):
+        """Estimativa do quantil ``q`` por interpolação linear dentro da faixa."""
+        with self.lock:
+            counts, total, maximum = list(self.counts), self.count, self.max
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for index, count in enumerate(counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else maximum
+                return min(maximum, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return maximum
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg": round(self.sum / self.count, 6) if self.count else None,
+            "p50": _round(self.quantile(0.5)),
+            "p95": _round(self.quantile(0.95)),
+            "max": _round(self.max)
+        }
+
+
+class _Metric:
+    """Métrica com um rótulo opcional; cada valor do rótulo é criado uma única vez."""
+
+    def __init__(self, kind, name, help, label, factory):
+        self.kind = kind
+        self.name = name
+        self.help = help
+        self.label = label
+        self.factory = factory
+        self.children = {}
+        self.lock = threading.Lock()
+
+    def labels(self, value=""):
+        child = self.children.get(value)
+        if child is None:
+            with self.lock:
+                child = self.children.setdefault(value, self.factory())
+        return child
+
+    def prepare(self, values):
+        for value in values:
+            self.labels(value)
+
+
+class MetricsRegistry:
+    """Contadores, medidores e histogramas do processo, exportados em JSON e no formato do Prometheus."""
+
+    def __init__(self):
+        self.metrics = []
+        self.sections = {}
+        self.started = time.time()
+
+    def _register(self, kind, name, help, label, factory):
+        metric = _Metric(kind, name, help, label, factory)
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, label=None):
+        return self._register("counter", name, help, label, _CounterChild)
+
+    def gauge(self, name, help, label=None):
+        return self._register("gauge", name, help, label, _GaugeChild)
+
+    def histogram(self, name, help, label=None, buckets=LATENCY_BUCKETS):
+        return self._register("histogram", name, help, label, lambda: _HistogramChild(buckets))
+
+    def add_section(self, name, provider):
+        """Inclui em ``/status`` o resultado de ``provider()`` sob a chave ``name``."""
+        self.sections[name] = provider
+
+    def snapshot(self):
+        status = {"uptime_seconds": round(time.time() - self.started), "metrics": {}}
+        for metric in self.metrics:
+            values = {}
+            for label, child in list(metric.children.items()):
+                values[label or "total"] = child.summary() if metric.kind == "histogram" else child.value
+            status["metrics"][metric.name] = values
+        for name, provider in list(self.sections.items()):
+            status[name] = provider()
+        return status
+
+    def prometheus(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for label, child in list(metric.children.items()):
+                base = f'{metric.label}="{_escape(label)}"' if metric.label else ""
+                if metric.kind != "histogram":
+                    lines.append(f"{metric.name}{_braces(base)} {child.value}")
+                    continue
+                with child.lock:
+                    counts, total, count = list(child.counts), child.sum, child.count
+                cumulative = 0
+                for bound, bucket in zip(list(child.bounds) + ["+Inf"], counts):
+                    cumulative += bucket
+                    le = f'le="{bound}"'
+                    lines.append(f"{metric.name}_bucket{_braces(base + ',' + le if base else le)} {cumulative}")
+                lines.append(f"{metric.name}_sum{_braces(base)} {total}")
+                lines.append(f"{metric.name}_count{_braces(base)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _round(value):
+    return None if value is None else round(value, 6)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _braces(labels):
+    return "{" + labels + "}" if labels else ""
+
+
+REGISTRY = MetricsRegistry()
+
+FETCH_SECONDS = REGISTRY.histogram("fetch_seconds", "Duração da busca de uma fonte, incluindo o parsing", "source")
+PARSE_SECONDS = REGISTRY.histogram("parse_seconds", "Tempo de parsing de uma página ou resposta", "source")
+FETCH_BYTES = REGISTRY.counter("fetch_bytes_total", "Bytes de corpo lidos das fontes", "source")
+FETCH_ERRORS = REGISTRY.counter("fetch_errors_total", "Buscas que terminaram em erro", "source")
+FETCH_HEDGES = REGISTRY.counter("fetch_hedges_total", "Buscas duplicadas por passar do p95, por vencedora (primary, hedge)", "result")
+FETCH_DEFERRED = REGISTRY.counter("fetch_deferred_total", "Buscas que passaram do prazo do ciclo e foram adiadas", "source")
+ITEMS_SEEN = REGISTRY.counter("items_seen_total", "Itens extraídos das fontes", "source")
+ITEMS_NEW = REGISTRY.counter("items_new_total", "Itens que passaram pela deduplicação", "source")
+ITEMS_ROUTED = REGISTRY.counter("items_routed_total", "Itens encaminhados a cada chat pelas assinaturas", "chat")
+STAGE_SECONDS = REGISTRY.histogram("stage_seconds", "Duração de cada estágio do ciclo do monitor", "stage")
+SEND_SECONDS = REGISTRY.histogram("telegram_send_seconds", "Duração de cada chamada à API do Telegram")
+DELIVERY_DELAY = REGISTRY.histogram("telegram_delivery_delay_seconds", "Tempo entre enfileirar e entregar uma mensagem")
+QUEUE_DEPTH = REGISTRY.histogram("telegram_queue_depth", "Mensagens na fila ao fim de cada ciclo", buckets=COUNT_BUCKETS)
+MESSAGES = REGISTRY.counter("telegram_messages_total", "Mensagens por resultado (sent, failed, rate_limited)", "result")
+MESSAGES.prepare(["sent", "failed", "rate_limited"])
+FETCH_HEDGES.prepare(["primary", "hedge"])
+STAGE_SECONDS.prepare(["cycle", "fetch", "dedup", "cluster", "enrich", "send"])
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        registry = self.server.registry
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path in ("", "/status"):
+            body = json.dumps(registry.snapshot(), ensure_ascii=False, indent=2).encode("utf-8")
+            content_type = "application/json; charset=utf-8"
+        elif path == "/metrics":
+            body = registry.prometheus().encode("utf-8")
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_status_server(port=STATUS_PORT, host=STATUS_HOST, registry=REGISTRY):
+    """Serve ``/status`` (JSON) e ``/metrics`` (Prometheus) numa thread daemon; devolve None se a porta estiver ocupada."""
+    try:
+        server = ThreadingHTTPServer((host, port), _StatusHandler)
+    except OSError as e:
+        logging.error(f"Não foi possível abrir a página de status na porta {port}: {str(e)}")
+        return None
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(f"Página de status em http://{host}:{port}/status (Prometheus em /metrics).")
+    return server
@@ -0,0 +1,170 @@
+import logging
+import random
+import re
+import time
+import unicodedata
+import zlib
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 2
+THRESHOLD = 0.7
+WINDOW = 2 * 86400
+MAX_BUCKET = 32
+MERSENNE_PRIME = (1 << 31) - 1
+
+STOPWORDS = frozenset("""
+a ao aos as com como da das de do dos e em na nas no nos o os ou para pela pelas
+pelo pelos por que se sem sob sobre um uma umas uns apos ate entre ja mais mas
+nao ser sao foi tem vai diz apos contra durante d
+""".split())
+
+_rng = random.Random(20250413)
+_PERMUTATIONS = [
+    (_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+if numpy is not None:
+    _A = numpy.array([a for a, _ in _PERMUTATIONS], dtype=numpy.uint64)[:, None]
+    _B = numpy.array([b for _, b in _PERMUTATIONS], dtype=numpy.uint64)[:, None]
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text):
+    """Minúsculas, sem acentos, sem pontuação e sem stopwords do português.
+
+    A ordem das palavras é mantida: "Ponte Preta vence o Guarani" e
+    "Guarani vence a Ponte Preta" são histórias diferentes.
+    """
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(w for w in _NON_WORD.split(text) if w and w not in STOPWORDS)
+
+
+def shingles(text, size=SHINGLE_SIZE):
+    """Sequências de ``size`` palavras seguidas; números trocados ("10 mortes"/"12 mortes") mudam várias delas."""
+    words = text.split()
+    if len(words) <= size:
+        return {text}
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash(shingle_set):
+    hashes = [zlib.crc32(s.encode("utf-8")) % MERSENNE_PRIME for s in shingle_set]
+    if numpy is not None:
+        values = numpy.array(hashes, dtype=numpy.uint64)[None, :]
+        return tuple(((_A * values + _B) % MERSENNE_PRIME).min(axis=1).tolist())
+    return tuple(
+        min((a * h + b) % MERSENNE_PRIME for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def similarity(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+class NearDuplicateIndex:
+    """Agrupa a mesma história publicada por fontes diferentes.
+
+    Cada título normalizado vira uma assinatura MinHash de ``NUM_PERM``
+    valores, dividida em ``BANDS`` faixas de ``ROWS`` linhas. Só os itens
+    que caem no mesmo balde em alguma faixa são comparados, então o custo
+    de uma consulta depende do número de candidatos, e não do histórico;
+    cada balde guarda no máximo ``MAX_BUCKET`` clusters recentes.
+    Clusters mais antigos que ``window`` saem do índice.
+    """
+
+    def __init__(self, threshold=THRESHOLD, window=WINDOW):
+        self.threshold = threshold
+        self.window = window
+        self.buckets = [{} for _ in range(BANDS)]
+        self.clusters = {}
+        self.next_id = 0
+        self.last_sweep = time.time()
+
+    def _bands(self, signature):
+        for band in range(BANDS):
+            yield band, signature[band * ROWS:(band + 1) * ROWS]
+
+    def _find(self, signature):
+        seen = set()
+        best, best_score = None, self.threshold
+        for band, key in self._bands(signature):
+            for cluster_id in self.buckets[band].get(key, ()):
+                if cluster_id in seen or cluster_id not in self.clusters:
+                    continue
+                seen.add(cluster_id)
+                score = similarity(signature, self.clusters[cluster_id]["signature"])
+                if score >= best_score:
+                    best, best_score = cluster_id, score
+        return best
+
+    def _add(self, signature, news, now):
+        cluster_id = self.next_id
+        self.next_id += 1
+        self.clusters[cluster_id] = {"signature": signature, "news": news, "created": now}
+        for band, key in self._bands(signature):
+            bucket = self.buckets[band].setdefault(key, [])
+            bucket.append(cluster_id)
+            if len(bucket) > MAX_BUCKET:
+                del bucket[0]
+        return cluster_id
+
+    def _sweep(self, now):
+        if now - self.last_sweep < self.window / 24:
+            return
+        self.last_sweep = now
+        cutoff = now - self.window
+        expired = {cid for cid, c in self.clusters.items() if c["created"] < cutoff}
+        if not expired:
+            return
+        for cluster_id in expired:
+            del self.clusters[cluster_id]
+        for buckets in self.buckets:
+            for key in list(buckets):
+                alive = [cid for cid in buckets[key] if cid not in expired]
+                if alive:
+                    buckets[key] = alive
+                else:
+                    del buckets[key]
+
+    def filter(self, news_list, now=None):
+        """Devolve um representante por história.
+
+        Itens que repetem uma história deste lote entram em
+        ``other_sources`` do representante; os que repetem uma história já
+        enviada em ciclos anteriores são descartados, com uma linha no log
+        apontando a notícia enviada antes.
+        """
+        now = time.time() if now is None else now
+        self._sweep(now)
+        batch = set()
+        unique = []
+        for news in news_list:
+            signature = minhash(shingles(normalize(news["title"])))
+            cluster_id = self._find(signature)
+            if cluster_id is not None and self.clusters[cluster_id]["news"]["source"] == news["source"]:
+                cluster_id = None
+            if cluster_id is None:
+                batch.add(self._add(signature, news, now))
+                news.setdefault("other_sources", [])
+                unique.append(news)
+                continue
+            representative = self.clusters[cluster_id]["news"]
+            if cluster_id in batch:
+                if news["source"] not in representative["other_sources"]:
+                    representative["other_sources"].append(news["source"])
+            else:
+                score = similarity(signature, self.clusters[cluster_id]["signature"])
+                logging.info(
+                    f"Descartada como repetição ({score:.2f}): \"{news['title']}\" ({news['source']}) "
+                    f"já enviada como \"{representative['title']}\" ({representative['source']})"
+                )
+        return unique
@@ -0,0 +1,182 @@
+from functools import lru_cache
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    etree = None
+    HAS_LXML = False
+
+
+def default_backend():
+    """O backend mais rápido instalado: selectolax, depois lxml, depois html.parser."""
+    if LexborHTMLParser is not None:
+        return "selectolax"
+    if HAS_LXML:
+        return "lxml"
+    return "html.parser"
+
+
+BACKEND = default_backend()
+
+
+class Selector:
+    """Seletor CSS compilado uma única vez (soupsieve para os backends bs4).
+
+    A compilação do soupsieve só acontece no primeiro uso por um backend
+    bs4; com selectolax, nem o soupsieve nem o bs4 chegam a ser importados.
+    """
+
+    def __init__(self, css):
+        self.css = css
+        self._compiled = None
+
+    @property
+    def compiled(self):
+        if self._compiled is None:
+            import soupsieve
+            self._compiled = soupsieve.compile(self.css)
+        return self._compiled
+
+
+@lru_cache(maxsize=None)
+def compile_selector(css):
+    return Selector(css)
+
+
+def _selector(selector):
+    return selector if isinstance(selector, Selector) else compile_selector(selector)
+
+
+class SoupNode:
+    __slots__ = ("tag",)
+
+    def __init__(self, tag):
+        self.tag = tag
+
+    def select(self, selector):
+        return [SoupNode(tag) for tag in _selector(selector).compiled.select(self.tag)]
+
+    def select_one(self, selector):
+        tag = _selector(selector).compiled.select_one(self.tag)
+        return SoupNode(tag) if tag is not None else None
+
+    def text(self):
+        return self.tag.get_text(strip=True)
+
+    def attr(self, name, default=None):
+        return self.tag.get(name, default)
+
+
+class LexborNode:
+    __slots__ = ("node",)
+
+    def __init__(self, node):
+        self.node = node
+
+    def select(self, selector):
+        return [LexborNode(node) for node in self.node.css(_selector(selector).css)]
+
+    def select_one(self, selector):
+        node = self.node.css_first(_selector(selector).css)
+        return LexborNode(node) if node is not None else None
+
+    def text(self):
+        return self.node.text(deep=True, separator="", strip=True)
+
+    def attr(self, name, default=None):
+        value = self.node.attributes.get(name)
+        return default if value is None else value
+
+
+class StreamingUnits:
+    """Recorta uma página HTML em unidades à medida que o texto chega.
+
+    ``unit`` segue o formato de ``scope`` (``{"name": "article", "class_":
+    "jeg_post"}``). ``feed`` devolve o HTML de cada unidade assim que ela
+    fecha; a unidade é então descartada da árvore, que fica do tamanho do
+    trecho ainda aberto. Unidades dentro de outra unidade saem junto com a
+    de fora.
+    """
+
+    def __init__(self, unit):
+        self.name = unit.get("name")
+        self.css_class = unit.get("class_")
+        self.parser = etree.HTMLPullParser(events=("start", "end"), tag=self.name)
+        self.depth = 0
+
+    def _matches(self, element):
+        if not isinstance(element.tag, str):
+            return False
+        return not self.css_class or self.css_class in (element.get("class") or "").split()
+
+    def _units(self):
+        for event, element in self.parser.read_events():
+            if not self._matches(element):
+                continue
+            if event == "start":
+                self.depth += 1
+                continue
+            self.depth -= 1
+            if self.depth:
+                continue
+            yield etree.tostring(element, method="xml", encoding="unicode", with_tail=False)
+            element.clear(keep_tail=True)
+            parent = element.getparent()
+            while parent is not None and element.getprevious() is not None:
+                del parent[0]
+
+    def feed(self, text):
+        self.parser.feed(text)
+        return self._units()
+
+    def close(self, text=""):
+        if text:
+            self.parser.feed(text)
+        self.parser.close()
+        return self._units()
+
+
+def _class_matcher(css_class):
+    """Casa ``css_class`` mesmo quando o atributo ainda é a string crua "a b c"."""
+    def match(value):
+        if not value:
+            return False
+        values = value.split() if isinstance(value, str) else value
+        return css_class in values
+    return match
+
+
+class HtmlParser:
+    """Parser de HTML compartilhado pelos agentes.
+
+    ``scope`` restringe a árvore montada aos elementos relevantes, no
+    estilo SoupStrainer: ``{"name": "article", "class_": "jeg_post"}``
+    guarda só os ``<article class="jeg_post">`` e seus descendentes. O
+    selectolax monta a árvore inteira, mas em C, o que já é mais barato
+    que o recorte em Python.
+    """
+
+    def __init__(self, scope=None, backend=None):
+        self.backend = backend or BACKEND
+        self.scope = scope
+        self.strainer = None
+        if self.backend == "selectolax":
+            return
+        from bs4 import SoupStrainer
+        if scope:
+            scope = dict(scope)
+            if isinstance(scope.get("class_"), str):
+                scope["class_"] = _class_matcher(scope["class_"])
+            self.strainer = SoupStrainer(**scope)
+
+    def parse(self, markup):
+        if self.backend == "selectolax":
+            return LexborNode(LexborHTMLParser(markup).root)
+        from bs4 import BeautifulSoup
+        return SoupNode(BeautifulSoup(markup, self.backend, parse_only=self.strainer))
@@ -0,0 +1,182 @@
+import atexit
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PROCESS_WORKERS = os.cpu_count() or 2
+TASK_TIMEOUT = 120
+MAX_RSS_MB = 1500
+WATCH_INTERVAL = 0.5
+
+
+class WorkerCrashed(RuntimeError):
+    pass
+
+
+def pack_items(items):
+    """Lista de notícias em JSON colunar: os nomes dos campos vão uma vez só."""
+    fields = sorted({key for item in items for key in item})
+    rows = [[item.get(key) for key in fields] for item in items]
+    return json.dumps([fields, rows], ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def unpack_items(data):
+    """Inverso de ``pack_items``; campos ausentes (ou None) não voltam no dicionário."""
+    fields, rows = json.loads(data)
+    return [{key: value for key, value in zip(fields, row) if value is not None} for row in rows]
+
+
+def _serve(conn):
+    """Laço do processo filho: recebe (agente, fonte), busca e devolve o resultado empacotado."""
+    agents = {}
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        name, factory, args, source = task
+        try:
+            cached = agents.get(name)
+            if cached is None or cached[0] != args:
+                cached = agents[name] = (args, factory(*args))
+            agent = cached[1]
+            conn.send_bytes(b"ok" + pack_items(agent.fetch_source(source) or []))
+        except Exception as e:
+            conn.send_bytes(b"er" + f"{type(e).__name__}: {str(e)}".encode("utf-8"))
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def rss_mb(self):
+        """Memória do processo e dos filhos dele (chromedriver e Chrome, por exemplo)."""
+        if psutil is None:
+            return 0
+        try:
+            process = psutil.Process(self.process.pid)
+            total = process.memory_info().rss
+            for child in process.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total / (1024 * 1024)
+        except psutil.Error:
+            return 0
+
+    def kill(self):
+        if psutil is not None:
+            try:
+                for child in psutil.Process(self.process.pid).children(recursive=True):
+                    child.kill()
+            except psutil.Error:
+                pass
+        self.process.kill()
+        self.process.join(5)
+        self.conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(2)
+        if self.process.is_alive():
+            self.kill()
+
+
+class ProcessAgentPool:
+    """Executa agentes pesados (navegador, parsing grande) em processos separados.
+
+    Cada processo mantém sua própria instância do agente, criada a partir de
+    ``agent.process_spec()``, e devolve as notícias em JSON colunar. Um
+    vigia no processo principal mata e recria o processo que passar de
+    ``timeout`` segundos numa tarefa ou de ``max_rss_mb`` de memória
+    (somando os filhos); a falha fica só naquela fonte, as demais seguem.
+    """
+
+    def __init__(self, workers=PROCESS_WORKERS, timeout=TASK_TIMEOUT, max_rss_mb=MAX_RSS_MB):
+        self.size = workers
+        self.timeout = timeout
+        self.max_rss_mb = max_rss_mb
+        self.context = multiprocessing.get_context("spawn")
+        self.idle = queue.Queue()
+        self.lock = threading.Lock()
+        self.started = 0
+        self.restarts = 0
+        self.closed = False
+        atexit.register(self.close)
+
+    def _acquire(self):
+        with self.lock:
+            if self.idle.empty() and self.started < self.size:
+                self.started += 1
+                return _Worker(self.context)
+        return self.idle.get()
+
+    def _restart(self, worker, reason):
+        logging.error(f"Processo {worker.process.pid} reiniciado: {reason}")
+        worker.kill()
+        with self.lock:
+            self.restarts += 1
+        return _Worker(self.context)
+
+    def run(self, agent, source):
+        """Busca ``source`` com o agente num processo do pool; bloqueia até o fim ou o limite."""
+        factory, args = agent.process_spec()
+        worker = self._acquire()
+        try:
+            worker.conn.send((agent.name, factory, args, source))
+            deadline = time.monotonic() + self.timeout
+            while not worker.conn.poll(WATCH_INTERVAL):
+                if not worker.process.is_alive():
+                    worker = self._restart(worker, "o processo terminou durante a tarefa")
+                    raise WorkerCrashed(f"{source['name']}: o processo terminou inesperadamente")
+                if time.monotonic() > deadline:
+                    worker = self._restart(worker, f"{source['name']} passou de {self.timeout}s")
+                    raise TimeoutError(f"{source['name']}: tempo limite de {self.timeout}s")
+                rss = worker.rss_mb()
+                if rss > self.max_rss_mb:
+                    worker = self._restart(worker, f"{source['name']} usou {rss:.0f} MB")
+                    raise MemoryError(f"{source['name']}: {rss:.0f} MB acima do limite de {self.max_rss_mb} MB")
+            try:
+                data = worker.conn.recv_bytes()
+            except (EOFError, OSError):
+                worker = self._restart(worker, "a conexão foi encerrada")
+                raise WorkerCrashed(f"{source['name']}: o processo terminou inesperadamente")
+            if data[:2] == b"er":
+                raise RuntimeError(data[2:].decode("utf-8"))
+            return unpack_items(data[2:])
+        finally:
+            if self.closed:
+                worker.stop()
+            else:
+                self.idle.put(worker)
+
+    def status(self):
+        return {"workers": self.started, "idle": self.idle.qsize(), "restarts": self.restarts}
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        while True:
+            try:
+                self.idle.get_nowait().stop()
+            except queue.Empty:
+                return
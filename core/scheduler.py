@@ -0,0 +1,117 @@
+import heapq
+import random
+import time
+
+MIN_INTERVAL = 60
+MAX_INTERVAL = 1800
+DEFAULT_INTERVAL = 300
+EWMA_ALPHA = 0.3
+POLL_FRACTION = 0.5
+IDLE_BACKOFF = 1.25
+JITTER = 0.1
+
+
+class AdaptiveScheduler:
+    """Agenda cada fonte pelo ritmo de publicação observado.
+
+    Para cada fonte guarda uma EWMA do intervalo entre notícias novas; a
+    fonte é consultada a cada ``POLL_FRACTION`` desse intervalo, dentro de
+    ``[min_interval, max_interval]``. Ciclos sem novidade (página igual ou
+    sem itens novos) alongam o intervalo em ``IDLE_BACKOFF``; erros dobram
+    o intervalo a cada falha seguida. As próximas execuções ficam num heap
+    de prioridade ordenado pelo horário de vencimento.
+    """
+
+    def __init__(self, min_interval=MIN_INTERVAL, max_interval=MAX_INTERVAL,
+                 default_interval=DEFAULT_INTERVAL, jitter=JITTER):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.jitter = jitter
+        self.heap = []
+        self.state = {}
+
+    def _clamp(self, interval):
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def _push(self, key, due):
+        self.state[key]["due"] = due
+        heapq.heappush(self.heap, (due, key))
+
+    def add(self, key, due=None):
+        if key in self.state:
+            return
+        self.state[key] = {
+            "interval": self.default_interval,
+            "ewma": None,
+            "last_new": None,
+            "errors": 0,
+            "due": None
+        }
+        self._push(key, time.time() if due is None else due)
+
+    def snapshot(self):
+        """Estado de cada fonte (intervalo, EWMA, erros, vencimento) para o snapshot."""
+        return {key: dict(state) for key, state in self.state.items()}
+
+    def restore(self, saved, now=None):
+        """Retoma o agendamento salvo para as fontes já adicionadas; as demais são ignoradas.
+
+        Uma fonte que estava em execução quando o snapshot foi gravado
+        (``due`` vazio) vence imediatamente.
+        """
+        now = time.time() if now is None else now
+        for key, state in saved.items():
+            if key not in self.state:
+                continue
+            self.state[key].update({name: state.get(name) for name in ("interval", "ewma", "last_new", "errors")})
+            self.state[key]["interval"] = self._clamp(self.state[key]["interval"] or self.default_interval)
+            self.state[key]["errors"] = self.state[key]["errors"] or 0
+            self._push(key, now if state.get("due") is None else state["due"])
+
+    def postpone(self, key, due):
+        """Reagenda a fonte para ``due`` sem mexer no intervalo aprendido (fontes com push WebSub)."""
+        self._push(key, due)
+
+    def next_due(self):
+        while self.heap:
+            due, key = self.heap[0]
+            if self.state.get(key, {}).get("due") == due:
+                return due
+            heapq.heappop(self.heap)
+        return None
+
+    def pop_due(self, now=None):
+        """Remove e devolve as fontes vencidas; elas voltam ao heap em ``record``."""
+        now = time.time() if now is None else now
+        keys = []
+        while self.heap and self.heap[0][0] <= now:
+            due, key = heapq.heappop(self.heap)
+            if self.state.get(key, {}).get("due") == due:
+                self.state[key]["due"] = None
+                keys.append(key)
+        return keys
+
+    def record(self, key, new_items, error=False, now=None):
+        now = time.time() if now is None else now
+        state = self.state[key]
+        if error:
+            state["errors"] += 1
+            interval = self._clamp(state["interval"] * 2 ** state["errors"])
+        else:
+            state["errors"] = 0
+            if new_items:
+                if state["last_new"] is not None:
+                    gap = (now - state["last_new"]) / new_items
+                    if state["ewma"] is None:
+                        state["ewma"] = gap
+                    else:
+                        state["ewma"] = EWMA_ALPHA * gap + (1 - EWMA_ALPHA) * state["ewma"]
+                    state["interval"] = self._clamp(state["ewma"] * POLL_FRACTION)
+                state["last_new"] = now
+            else:
+                state["interval"] = self._clamp(state["interval"] * IDLE_BACKOFF)
+            interval = state["interval"]
+        interval *= 1 + random.uniform(-self.jitter, self.jitter)
+        self._push(key, now + interval)
+        return interval
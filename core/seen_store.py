@@ -0,0 +1,156 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from core.fingerprints import FingerprintIndex
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_FILE = os.path.join(BASE_DIR, "news_state.db")
+LEGACY_CACHE_FILES = [
+    os.path.join(BASE_DIR, "news_cache.json"),
+    os.path.join(BASE_DIR, "news_cache_sampi.json")
+]
+LEGACY_MIGRATED = "legacy_migrated"
+BATCH_SIZE = 100
+SEEN_WINDOW = 7 * 86400
+
+
+def compute_key(title, link):
+    """Chave determinística (md5 de título + link), igual à usada pelos agentes."""
+    return hashlib.md5((title + link).encode("utf-8")).hexdigest()
+
+
+class SeenStore:
+    """Registro único das notícias já vistas, persistido em SQLite.
+
+    Cada inserção é um INSERT acumulado em lote, em vez de reescrever o
+    arquivo inteiro; ``commit`` grava o lote pendente. Na primeira abertura
+    os caches JSON antigos são migrados para a tabela, uma única vez: a
+    tabela ``meta`` registra a migração, e uma tabela que esvaziou por
+    expiração não traz as chaves antigas de volta.
+
+    Em memória só ficam as chaves vistas nos últimos ``window`` segundos,
+    num ``FingerprintIndex``. Uma chave que volta a aparecer é renovada
+    (``touch``), e ``first_seen`` passa a ser a última geração em que ela
+    foi vista: uma notícia que fica semanas na listagem continua
+    conhecida, e só as que sumiram pela janela inteira expiram. Linhas
+    fora da janela são apagadas do banco na abertura.
+
+    Com um ``snapshot`` (``core.snapshot``), o índice vem pronto do arquivo
+    mapeado em memória e só as linhas gravadas depois dele são relidas.
+    """
+
+    def __init__(self, path=DB_FILE, legacy_files=LEGACY_CACHE_FILES, batch_size=BATCH_SIZE, window=SEEN_WINDOW,
+                 snapshot=None):
+        self.path = path
+        self.batch_size = batch_size
+        self.window = window
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen ("
+            "key TEXT PRIMARY KEY, first_seen REAL NOT NULL) WITHOUT ROWID"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        self.pending = []
+        self.touched = []
+        self.keys = FingerprintIndex(window=window)
+        empty = self.conn.execute("SELECT 1 FROM seen LIMIT 1").fetchone() is None
+        migrated = self.conn.execute("SELECT 1 FROM meta WHERE name = ?", (LEGACY_MIGRATED,)).fetchone() is not None
+        if empty and not migrated:
+            self._migrate(legacy_files)
+            return
+        if not migrated:
+            # Banco criado antes do registro da migração: as chaves antigas já estão na tabela.
+            self._mark_migrated()
+        cutoff = time.time() - window
+        with self.conn:
+            self.conn.execute("DELETE FROM seen WHERE first_seen < ?", (cutoff,))
+        if snapshot is not None and snapshot.restore_seen(self.keys):
+            rows = self.conn.execute("SELECT key, first_seen FROM seen WHERE first_seen > ?", (snapshot.seen_until,))
+        else:
+            rows = self.conn.execute("SELECT key, first_seen FROM seen")
+        for key, first_seen in rows:
+            if not self.keys.add(key, first_seen):
+                self.keys.touch(key, first_seen)
+
+    def _migrate(self, legacy_files):
+        for cache_file in legacy_files:
+            if not os.path.exists(cache_file):
+                continue
+            try:
+                with open(cache_file, "r", encoding="utf-8") as f:
+                    content = f.read()
+                keys = json.loads(content) if content.strip() else []
+            except json.JSONDecodeError:
+                logging.error(f"Erro ao decodificar {cache_file}; arquivo ignorado na migração.")
+                continue
+            for key in keys:
+                self.add(str(key))
+            logging.info(f"{len(keys)} chaves migradas de {cache_file}.")
+        self.commit()
+        self._mark_migrated()
+
+    def _mark_migrated(self):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (LEGACY_MIGRATED, str(time.time()))
+            )
+
+    def __contains__(self, key):
+        # As threads de busca consultam (modo stream) enquanto o manager insere e as gerações expiram.
+        with self.lock:
+            return key in self.keys
+
+    def __len__(self):
+        with self.lock:
+            return len(self.keys)
+
+    def add(self, key):
+        """Marca a chave como vista; devolve False se ela já existia (e a renova na janela)."""
+        with self.lock:
+            if not self.keys.add(key):
+                if self.keys.touch(key):
+                    self.touched.append((time.time(), key))
+                return False
+            self.pending.append((key, time.time()))
+            if len(self.pending) + len(self.touched) >= self.batch_size:
+                self.commit()
+            return True
+
+    def commit(self):
+        with self.lock:
+            if not self.pending and not self.touched:
+                return
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO seen (key, first_seen) VALUES (?, ?)", self.pending
+                )
+                self.conn.executemany("UPDATE seen SET first_seen = ? WHERE key = ?", self.touched)
+            self.pending = []
+            self.touched = []
+
+    def close(self):
+        self.commit()
+        self.conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_seen_store(snapshot=None):
+    """Instância compartilhada entre o manager e todos os agentes do processo.
+
+    ``snapshot`` só tem efeito na primeira chamada, que cria o registro.
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SeenStore(snapshot=snapshot)
+        return _store
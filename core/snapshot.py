@@ -0,0 +1,97 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_FILE = os.path.join(BASE_DIR, "news_state.snap")
+SNAPSHOT_INTERVAL = 60
+MAGIC = b"NWSNAP01"
+ALIGN = 8
+_HEADER = struct.Struct("<8sdI")
+
+
+def _align(offset):
+    return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+
+def write_snapshot(seen_store, scheduler, path=SNAPSHOT_FILE):
+    """Grava o estado quente do processo em ``path`` (arquivo temporário + ``os.replace``).
+
+    Layout: cabeçalho fixo (magic, criação, tamanho do JSON), um JSON com
+    o agendamento e a descrição das tabelas de impressões digitais, e as
+    tabelas cruas alinhadas em 8 bytes, prontas para ``mmap``.
+    """
+    with seen_store.lock:
+        seen_store.commit()
+        seen_until = time.time()
+        index = seen_store.keys
+        tables = [(epoch, count, bytes(slots)) for epoch, count, slots in index.export_tables()]
+    layout, offset = [], 0
+    for epoch, count, data in tables:
+        layout.append([epoch, count, offset, len(data)])
+        offset = _align(offset + len(data))
+    meta = json.dumps({
+        "seen": {
+            "until": seen_until, "bits": index.bits, "typecode": index.typecode,
+            "window": index.window, "generations": index.generations, "tables": layout
+        },
+        "scheduler": scheduler.snapshot()
+    }, separators=(",", ":")).encode("utf-8")
+    start = _align(_HEADER.size + len(meta))
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, time.time(), len(meta)))
+        f.write(meta)
+        for (_, _, data), (_, _, table_offset, _) in zip(tables, layout):
+            f.seek(start + table_offset)
+            f.write(data)
+    try:
+        os.replace(tmp, path)
+    except OSError as e:
+        logging.error(f"Não foi possível substituir o snapshot {path}: {str(e)}")
+
+
+class Snapshot:
+    """Snapshot aberto com ``mmap`` (cópia na escrita): as tabelas viram ``memoryview`` sem cópia."""
+
+    def __init__(self, path=SNAPSHOT_FILE):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, self.created, meta_length = _HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} não é um snapshot")
+        meta = json.loads(self.mm[_HEADER.size:_HEADER.size + meta_length])
+        self.start = _align(_HEADER.size + meta_length)
+        self.seen = meta["seen"]
+        self.scheduler = meta["scheduler"]
+
+    @property
+    def seen_until(self):
+        return self.seen["until"]
+
+    def restore_seen(self, index):
+        """Carrega as tabelas no ``FingerprintIndex``; devolve False se a configuração mudou."""
+        seen = self.seen
+        if (seen["bits"], seen["typecode"], seen["window"], seen["generations"]) != \
+                (index.bits, index.typecode, index.window, index.generations):
+            return False
+        view = memoryview(self.mm)
+        index.load_tables([
+            (epoch, count, view[self.start + offset:self.start + offset + size].cast(seen["typecode"]))
+            for epoch, count, offset, size in seen["tables"]
+        ])
+        return True
+
+
+def load_snapshot(path=SNAPSHOT_FILE):
+    """Abre o snapshot, ou devolve None se ele não existir ou estiver corrompido."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return Snapshot(path)
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        logging.error(f"Snapshot {path} ignorado: {str(e)}")
+        return None
@@ -0,0 +1,242 @@
+import codecs
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from core.dates import TZ, parse_date
+from core.metrics import FETCH_BYTES, PARSE_SECONDS
+from core.http import get_session
+from core.parsing import HAS_LXML, HtmlParser, StreamingUnits, compile_selector
+from core.validators import conditional_get, save_validators
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCES_FILE = os.path.join(BASE_DIR, "sources.json")
+DATE_OUTPUT = "%d/%m/%Y %H:%M"
+STREAM_CHUNK = 4096
+STOP_AFTER = 5
+
+
+def load_definitions(path=SOURCES_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class _Field:
+    __slots__ = ("name", "selector", "attr", "default", "absolute")
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.selector = compile_selector(spec["selector"]) if spec.get("selector") else None
+        self.attr = spec.get("attr")
+        self.default = spec.get("default")
+        self.absolute = spec.get("absolute", False)
+
+    def extract(self, node, base_url):
+        if self.selector is not None:
+            node = node.select_one(self.selector)
+            if node is None:
+                return self.default
+        value = node.attr(self.attr) if self.attr else node.text()
+        if value is None:
+            return self.default
+        if self.absolute and value and not value.startswith("http"):
+            value = base_url.rstrip("/") + value
+        return value
+
+
+class CompiledSource:
+    """Definição de fonte (um item de ``sources.json``) pronta para uso.
+
+    Seletores, escopo do parser e regras de data são resolvidos uma vez, na
+    carga; ``fetch`` e ``parse`` são os estágios compartilhados por todas as
+    fontes. Campos de uma definição HTML:
+
+    - ``item``: seletor de cada notícia na listagem
+    - ``fields``: ``{nome: {"selector", "attr", "default", "absolute"}}``;
+      sem ``selector`` o campo é lido do próprio item
+    - ``required``: campos que precisam vir preenchidos
+    - ``scope``: recorte opcional da árvore (ver ``HtmlParser``)
+    - ``date``: ``{"only_today", "max_age_hours", "keep_text", "now"}``;
+      itens com data reconhecida fora da janela são descartados já aqui,
+      antes da deduplicação e do envio. ``keep_text`` mantém o texto da
+      página em ``date``; ``now`` carimba a hora da coleta
+    - ``stream``: ``true`` ou ``{"unit", "item", "stop_after"}``; lê a
+      listagem (mais nova primeiro) aos pedaços e para depois de
+      ``stop_after`` itens seguidos já vistos ou fora da janela. ``unit``
+      (padrão: ``scope``) é o bloco recortado a cada vez e ``item`` (padrão:
+      o ``item`` da definição) é aplicado dentro dele
+    - ``websub`` (RSS): guarda em ``hub`` o par ``(hub, tópico)`` anunciado
+      pelo feed (``<link rel="hub">`` e ``rel="self"``), para o manager
+      assinar e receber as entradas por push (``core/websub.py``)
+    """
+
+    def __init__(self, definition, backend=None):
+        self.definition = definition
+        self.name = definition["name"]
+        self.url = definition["url"]
+        self.type = definition.get("type", "html")
+        self.required = definition.get("required", [])
+        date = definition.get("date") or {}
+        self.date_now = date.get("now", False)
+        self.date_rules = bool(date) and not self.date_now
+        self.only_today = date.get("only_today", False)
+        self.max_age = timedelta(hours=date["max_age_hours"]) if date.get("max_age_hours") else None
+        self.keep_text = date.get("keep_text", False)
+        self.websub = self.type == "rss" and definition.get("websub", False)
+        self.hub = None
+        self.hub_checked = False
+        if self.type == "html":
+            self.parser = HtmlParser(scope=definition.get("scope"), backend=backend)
+            self.item = compile_selector(definition["item"])
+            self.fields = [_Field(name, spec) for name, spec in definition["fields"].items()]
+        stream = definition.get("stream")
+        stream = {} if stream is True else stream
+        self.stream_unit = None
+        if isinstance(stream, dict) and self.type == "html" and HAS_LXML:
+            self.stream_unit = stream.get("unit") or definition.get("scope")
+            self.stream_item = compile_selector(stream["item"]) if stream.get("item") else self.item
+            self.stream_parser = HtmlParser(backend=backend)
+            self.stop_after = stream.get("stop_after", STOP_AFTER)
+
+    def fetch(self, seen=None):
+        """Busca e extrai a fonte; ``seen(item)`` diz se um item já foi visto (usado no modo stream)."""
+        if self.stream_unit and seen is not None:
+            return self.fetch_stream(seen)
+        if self.websub and not self.hub_checked:
+            # Procura o hub na primeira busca lendo o feed inteiro, mesmo que ele não tenha mudado.
+            response = get_session().get(self.url)
+            response.raise_for_status()
+        else:
+            response = conditional_get(self.url)
+        if response is None:
+            print(f"Página sem alterações ({self.name}).")
+            return []
+        FETCH_BYTES.labels(self.name).inc(len(response.content))
+        if self.type == "rss":
+            return self.parse_feed(response.content)
+        return self.parse(response.text)
+
+    def fetch_stream(self, seen, now=None):
+        """Lê a listagem aos pedaços e fecha a conexão após ``stop_after`` itens velhos seguidos."""
+        response = conditional_get(self.url, stream=True)
+        if response is None:
+            print(f"Página sem alterações ({self.name}).")
+            return []
+        try:
+            news_list, received, stopped = self.parse_stream(
+                response.iter_content(STREAM_CHUNK), seen, response.encoding, now
+            )
+        finally:
+            response.close()
+        save_validators(self.url, response)
+        FETCH_BYTES.labels(self.name).inc(received)
+        stopped = " (leitura interrompida: itens já vistos)" if stopped else ""
+        print(f"Itens lidos em stream ({self.name}): {len(news_list)}, {received} bytes{stopped}")
+        return news_list
+
+    def parse_stream(self, chunks, seen, encoding=None, now=None):
+        """Extrai itens de ``chunks`` (bytes) conforme chegam; devolve (itens, bytes lidos, interrompido)."""
+        now = now or datetime.now(TZ)
+        decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        units = StreamingUnits(self.stream_unit)
+        chunks = iter(chunks)
+        news_list = []
+        stale = 0
+        received = 0
+        parse_time = 0.0
+        while stale < self.stop_after:
+            chunk = next(chunks, None)
+            start = time.perf_counter()
+            if chunk is None:
+                markups = units.close(decoder.decode(b"", final=True))
+            else:
+                received += len(chunk)
+                markups = units.feed(decoder.decode(chunk))
+            for markup in markups:
+                for item in self.stream_parser.parse(markup).select(self.stream_item):
+                    news_item = self._extract(item)
+                    if news_item is None:
+                        continue
+                    if self._finish(news_item, news_item.get("date"), now):
+                        news_list.append(news_item)
+                        stale = stale + 1 if seen(news_item) else 0
+                    else:
+                        stale += 1
+                if stale >= self.stop_after:
+                    break
+            parse_time += time.perf_counter() - start
+            if chunk is None:
+                break
+        PARSE_SECONDS.labels(self.name).observe(parse_time)
+        return news_list, received, stale >= self.stop_after
+
+    def _extract(self, item):
+        try:
+            news_item = {field.name: field.extract(item, self.url) for field in self.fields}
+        except Exception as e:
+            print(f"Erro ao extrair notícia ({self.name}): {str(e)}")
+            return None
+        if not all(news_item.get(name) for name in self.required):
+            return None
+        return news_item
+
+    def _finish(self, news_item, raw_date, now):
+        """Aplica a regra de data da definição; devolve False se o item deve ser descartado.
+
+        Datas que não são reconhecidas não descartam o item: sem data
+        confiável não há como afirmar que a notícia é antiga.
+        """
+        news_item["source"] = self.name
+        if self.date_now:
+            news_item["date"] = now.strftime(DATE_OUTPUT)
+        elif self.date_rules:
+            pub_date = parse_date(raw_date, now)
+            if pub_date is not None:
+                if self.only_today and pub_date.date() != now.date():
+                    return False
+                if self.max_age is not None and now - pub_date > self.max_age:
+                    return False
+            if not self.keep_text:
+                news_item["date"] = pub_date.strftime(DATE_OUTPUT) if pub_date else (raw_date or "")
+        return True
+
+    def parse(self, text, now=None):
+        start = time.perf_counter()
+        now = now or datetime.now(TZ)
+        items = self.parser.parse(text).select(self.item)
+        print(f"Itens encontrados ({self.name}): {len(items)}")
+        news_list = []
+        for item in items:
+            news_item = self._extract(item)
+            if news_item is not None and self._finish(news_item, news_item.get("date"), now):
+                news_list.append(news_item)
+        PARSE_SECONDS.labels(self.name).observe(time.perf_counter() - start)
+        return news_list
+
+    def parse_feed(self, content, now=None):
+        import feedparser  # só carrega quando a primeira fonte RSS é buscada
+        start = time.perf_counter()
+        now = now or datetime.now(TZ)
+        feed = feedparser.parse(content)
+        print(f"Entradas encontradas no RSS ({self.name}): {len(feed.entries)}")
+        if self.websub:
+            self.hub_checked = True
+            links = {link.get("rel"): link.get("href") for link in feed.feed.get("links", [])}
+            if links.get("hub"):
+                self.hub = (links["hub"], links.get("self") or self.url)
+        news_list = []
+        for entry in feed.entries:
+            news_item = {"title": entry.title, "link": entry.link}
+            if entry.get("media_content"):
+                news_item["image"] = entry.media_content[0].get("url")
+            if self._finish(news_item, entry.get("published", ""), now):
+                news_list.append(news_item)
+            else:
+                print(f"Notícia ignorada (fora da janela de data): {entry.title}")
+        PARSE_SECONDS.labels(self.name).observe(time.perf_counter() - start)
+        return news_list
+
+
+def compile_sources(definitions, backend=None):
+    return [CompiledSource(definition, backend) for definition in definitions]
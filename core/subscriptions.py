@@ -0,0 +1,205 @@
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SUBSCRIPTIONS_FILE = os.path.join(BASE_DIR, "subscriptions.json")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def fold(text):
+    """Minúsculas, sem acentos e sem pontuação, com um espaço em cada ponta.
+
+    As palavras-chave passam pela mesma função, então ``" dengue "`` só
+    casa com a palavra inteira: não acha "dengue" dentro de "dengueiro".
+    """
+    text = unicodedata.normalize("NFKD", (text or "").lower())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return f" {_NON_WORD.sub(' ', text).strip()} "
+
+
+class KeywordAutomaton:
+    """Autômato de Aho-Corasick: acha todas as palavras-chave numa só passada pelo texto.
+
+    ``add`` devolve o id de cada palavra-chave; depois de ``compile`` (que
+    monta os links de falha em largura e junta as saídas de cada estado),
+    ``search`` devolve o conjunto de ids encontrados. O custo da busca
+    depende do tamanho do texto e do número de ocorrências, não de quantas
+    palavras-chave existem.
+    """
+
+    def __init__(self):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [()]
+        self.keywords = []
+        self._ids = {}
+
+    def add(self, keyword):
+        if keyword in self._ids:
+            return self._ids[keyword]
+        state = 0
+        for ch in keyword:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append(())
+            state = nxt
+        keyword_id = self._ids[keyword] = len(self.keywords)
+        self.keywords.append(keyword)
+        self.out[state] = self.out[state] + (keyword_id,)
+        return keyword_id
+
+    def compile(self):
+        goto, fail, out = self.goto, self.fail, self.out
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                back = fail[state]
+                while back and ch not in goto[back]:
+                    back = fail[back]
+                target = goto[back].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                if out[fail[nxt]]:
+                    out[nxt] = out[nxt] + out[fail[nxt]]
+        return self
+
+    def search(self, text):
+        goto, fail, out = self.goto, self.fail, self.out
+        state, found = 0, set()
+        for ch in text:
+            nxt = goto[state].get(ch)
+            while nxt is None and state:
+                state = fail[state]
+                nxt = goto[state].get(ch)
+            state = nxt or 0
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+class Subscription:
+    """Um chat interessado em parte das notícias.
+
+    Cada filtro vazio libera tudo; os preenchidos precisam casar ao mesmo
+    tempo (qualquer palavra-chave no título ou resumo, e qualquer uma das
+    fontes, e qualquer uma das categorias).
+    """
+
+    __slots__ = ("name", "chat_id", "keywords", "sources", "categories")
+
+    def __init__(self, chat_id, name=None, keywords=(), sources=(), categories=()):
+        self.chat_id = str(chat_id)
+        self.name = name or self.chat_id
+        self.keywords = [k for k in (fold(keyword) for keyword in keywords) if k.strip()]
+        self.sources = frozenset(sources)
+        self.categories = frozenset(fold(category) for category in categories)
+
+    def accepts(self, news):
+        if self.sources and news.get("source") not in self.sources:
+            return False
+        return not self.categories or fold(news.get("category")) in self.categories
+
+
+class SubscriptionRouter:
+    """Distribui cada notícia nova entre os chats assinantes.
+
+    Todas as palavras-chave de todas as assinaturas vão para um único
+    ``KeywordAutomaton``; cada notícia é percorrida uma vez e só as
+    assinaturas cujas palavras apareceram (mais as sem palavras-chave,
+    indexadas por fonte) têm fonte e categoria conferidas.
+    """
+
+    def __init__(self, subscriptions):
+        self.subscriptions = list(subscriptions)
+        self.automaton = KeywordAutomaton()
+        self.by_keyword = []
+        self.open = {}
+        for index, subscription in enumerate(self.subscriptions):
+            if not subscription.keywords:
+                for source in subscription.sources or (None,):
+                    self.open.setdefault(source, []).append(index)
+                continue
+            for keyword in subscription.keywords:
+                keyword_id = self.automaton.add(keyword)
+                if keyword_id == len(self.by_keyword):
+                    self.by_keyword.append([])
+                self.by_keyword[keyword_id].append(index)
+        self.automaton.compile()
+
+    def route(self, news):
+        """Chats que devem receber a notícia, na ordem das assinaturas e sem repetição."""
+        candidates = set(self.open.get(None, ()))
+        candidates.update(self.open.get(news.get("source"), ()))
+        if self.by_keyword:
+            text = fold(f"{news.get('title', '')} {news.get('summary') or ''}")
+            for keyword_id in self.automaton.search(text):
+                candidates.update(self.by_keyword[keyword_id])
+        chats = {}
+        for index in sorted(candidates):
+            subscription = self.subscriptions[index]
+            if subscription.chat_id not in chats and subscription.accepts(news):
+                chats[subscription.chat_id] = None
+        return list(chats)
+
+
+def load_subscriptions(path=SUBSCRIPTIONS_FILE, default_chat=None):
+    """Lê ``subscriptions.json``; sem o arquivo, tudo vai para ``default_chat``."""
+    if not os.path.exists(path):
+        return [Subscription(default_chat, name="geral")] if default_chat else []
+    with open(path, "r", encoding="utf-8") as f:
+        return [Subscription(**entry) for entry in json.load(f)]
+
+
+class RouterLoader:
+    """Mantém o roteador em dia com ``subscriptions.json`` sem reiniciar o monitor.
+
+    ``get`` confere a data de modificação do arquivo e recompila só quando
+    ela muda; um arquivo inválido é ignorado e o roteador anterior continua.
+    """
+
+    def __init__(self, path=SUBSCRIPTIONS_FILE, default_chat=None):
+        self.path = path
+        self.default_chat = default_chat
+        self.mtime = None
+        self.router = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        with self.lock:
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                mtime = None
+            if self.router is None or mtime != self.mtime:
+                try:
+                    self.router = SubscriptionRouter(load_subscriptions(self.path, self.default_chat))
+                    logging.info(f"{len(self.router.subscriptions)} assinaturas carregadas "
+                                 f"({len(self.router.automaton.keywords)} palavras-chave).")
+                except (OSError, ValueError, TypeError) as e:
+                    logging.error(f"Assinaturas em {self.path} ignoradas: {str(e)}")
+                    if self.router is None:
+                        fallback = [Subscription(self.default_chat, name="geral")] if self.default_chat else []
+                        self.router = SubscriptionRouter(fallback)
+                self.mtime = mtime
+            return self.router
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def get_router(default_chat=None):
+    """Roteador compartilhado do processo, recarregado se ``subscriptions.json`` mudar."""
+    global _loader
+    with _loader_lock:
+        if _loader is None:
+            _loader = RouterLoader(default_chat=default_chat)
+    return _loader.get()
@@ -0,0 +1,99 @@
+import hashlib
+import sqlite3
+import threading
+
+from core.http import conditional_allowed, get_session
+from core.seen_store import DB_FILE
+
+
+class ValidatorStore:
+    """ETag, Last-Modified e digest do corpo da última resposta de cada URL."""
+
+    def __init__(self, path=DB_FILE):
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS validators ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body_digest TEXT)"
+        )
+        self.entries = {
+            row[0]: {"etag": row[1], "last_modified": row[2], "body_digest": row[3]}
+            for row in self.conn.execute("SELECT url, etag, last_modified, body_digest FROM validators")
+        }
+
+    def get(self, url):
+        return self.entries.get(url, {})
+
+    def put(self, url, etag, last_modified, body_digest):
+        with self.lock:
+            self.entries[url] = {"etag": etag, "last_modified": last_modified, "body_digest": body_digest}
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO validators (url, etag, last_modified, body_digest) "
+                    "VALUES (?, ?, ?, ?)",
+                    (url, etag, last_modified, body_digest)
+                )
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_validator_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ValidatorStore()
+        return _store
+
+
+def conditional_get(url, store=None, stream=False, **kwargs):
+    """GET condicional: devolve a resposta, ou None se a página não mudou.
+
+    Envia If-None-Match/If-Modified-Since com os validadores salvos. Se o
+    servidor ignorar os validadores e devolver 200, o digest do corpo é
+    comparado com o da última busca; corpo idêntico também devolve None,
+    e o chamador pula o parsing.
+
+    Com ``stream=True`` o corpo não é lido aqui: a resposta volta aberta,
+    sem comparação de digest, e o chamador grava os validadores com
+    ``save_validators`` depois de consumir o que precisava. É uma troca
+    consciente: o digest exigiria ler a página inteira, e o stream já
+    para nos primeiros itens vistos quando a página não mudou.
+
+    Numa cópia de busca do motor (``conditional_allowed()`` falso) os
+    validadores salvos são ignorados e a página vem sempre inteira.
+    """
+    store = store or get_validator_store()
+    saved = store.get(url) if conditional_allowed() else {}
+    headers = dict(kwargs.pop("headers", None) or {})
+    if saved.get("etag"):
+        headers["If-None-Match"] = saved["etag"]
+    if saved.get("last_modified"):
+        headers["If-Modified-Since"] = saved["last_modified"]
+    response = get_session().get(url, headers=headers, stream=stream, **kwargs)
+    if response.status_code == 304:
+        response.close()
+        return None
+    response.raise_for_status()
+    if stream:
+        return response
+    body_digest = hashlib.sha1(response.content).hexdigest()
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if body_digest == saved.get("body_digest"):
+        if etag != saved.get("etag") or last_modified != saved.get("last_modified"):
+            store.put(url, etag, last_modified, body_digest)
+        return None
+    store.put(url, etag, last_modified, body_digest)
+    return response
+
+
+def save_validators(url, response, store=None):
+    """Grava ETag e Last-Modified de uma resposta lida em modo stream (sem digest do corpo).
+
+    ``url`` é a URL pedida, a mesma que ``conditional_get`` consulta; depois
+    de um redirecionamento ``response.url`` aponta para outro endereço.
+    """
+    store = store or get_validator_store()
+    store.put(url, response.headers.get("ETag"), response.headers.get("Last-Modified"), None)
@@ -0,0 +1,265 @@
+import hashlib
+import hmac
+import logging
+import queue
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from core.engine import FetchResult
+from core.http import get_session
+
+WEBSUB_HOST = "0.0.0.0"
+WEBSUB_PORT = 5001
+LEASE_SECONDS = 86400
+RENEW_AT = 0.9
+VERIFY_TIMEOUT = 60
+RETRY_INTERVAL = 300
+MAINTAIN_INTERVAL = 30
+MAX_BODY = 5 * 1024 * 1024
+SIGNATURE_METHODS = ("sha1", "sha256", "sha384", "sha512")
+
+
+class _Subscription:
+    __slots__ = ("agent", "source", "hub", "topic", "path", "secret", "state",
+                 "requested", "expires", "renew_at", "retry_at", "pushes", "last_push")
+
+    def __init__(self, agent, source, hub, topic, path):
+        self.agent = agent
+        self.source = source
+        self.hub = hub
+        self.topic = topic
+        self.path = path
+        self.secret = secrets.token_hex(20)
+        self.state = "new"
+        self.requested = None
+        self.expires = None
+        self.renew_at = None
+        self.retry_at = 0
+        self.pushes = 0
+        self.last_push = None
+
+
+class WebSubSubscriber:
+    """Recebe por push (WebSub) as entradas dos feeds que anunciam um hub.
+
+    Cada fonte RSS com ``"websub": true`` que expõe ``<link rel="hub">`` é
+    assinada no hub com um segredo próprio; o hub confirma a assinatura
+    com um GET no ``callback_url`` e depois entrega cada atualização do
+    feed num POST assinado (``X-Hub-Signature``). As entradas passam pelo
+    mesmo ``parse_feed`` do polling e chegam ao manager como
+    ``FetchResult`` em ``wait`` (ou na fila ``results`` informada, como a
+    do ``FetchEngine``). ``maintain`` renova a assinatura aos
+    ``RENEW_AT`` do prazo e devolve as fontes cuja assinatura caducou
+    (hub recusou, não confirmou em ``VERIFY_TIMEOUT`` ou o prazo venceu),
+    que voltam a ser consultadas por polling.
+    """
+
+    def __init__(self, callback_url, port=WEBSUB_PORT, host=WEBSUB_HOST, lease_seconds=LEASE_SECONDS, results=None):
+        self.callback_url = callback_url.rstrip("/")
+        self.port = port
+        self.host = host
+        self.lease_seconds = lease_seconds
+        self.subscriptions = {}
+        self.by_path = {}
+        self.lapsed = []
+        self.results = results if results is not None else queue.Queue()
+        self.lock = threading.Lock()
+        self.server = None
+
+    def start(self):
+        """Abre o servidor de callback numa thread daemon; devolve None se a porta estiver ocupada."""
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), _CallbackHandler)
+        except OSError as e:
+            logging.error(f"Não foi possível abrir o callback WebSub na porta {self.port}: {str(e)}")
+            return None
+        self.server.daemon_threads = True
+        self.server.subscriber = self
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        logging.info(f"Callback WebSub em {self.callback_url} (porta {self.port}).")
+        return self
+
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def discover(self, agents):
+        """Assina os hubs anunciados pelas fontes dos agentes que ainda não têm assinatura."""
+        for agent in agents:
+            for name, (hub, topic) in agent.hubs().items():
+                with self.lock:
+                    current = self.subscriptions.get(name)
+                    if current is not None and (current.hub, current.topic) == (hub, topic):
+                        continue
+                    source = next(s for s in agent.sources() if s["name"] == name)
+                    path = "/websub/" + hashlib.sha1(name.encode("utf-8")).hexdigest()[:16]
+                    subscription = self.subscriptions[name] = _Subscription(agent, source, hub, topic, path)
+                    self.by_path[path] = subscription
+                logging.info(f"Hub WebSub encontrado para {name}: {hub}")
+                self._subscribe(subscription)
+
+    def _subscribe(self, subscription, now=None):
+        now = time.time() if now is None else now
+        with self.lock:
+            if subscription.state != "active":
+                subscription.state = "pending"
+            subscription.requested = now
+            subscription.renew_at = now + VERIFY_TIMEOUT if subscription.state == "active" else None
+        try:
+            response = get_session().post(subscription.hub, data={
+                "hub.mode": "subscribe",
+                "hub.topic": subscription.topic,
+                "hub.callback": self.callback_url + subscription.path,
+                "hub.secret": subscription.secret,
+                "hub.lease_seconds": str(self.lease_seconds)
+            })
+        except Exception as e:
+            logging.error(f"Erro ao assinar {subscription.topic} em {subscription.hub}: {str(e)}")
+            return
+        if response.status_code not in (202, 204):
+            logging.error(f"Hub {subscription.hub} recusou a assinatura de {subscription.topic}: "
+                          f"HTTP {response.status_code}")
+
+    def maintain(self, now=None):
+        """Renova assinaturas perto do fim do prazo e devolve as fontes que voltaram ao polling."""
+        now = time.time() if now is None else now
+        renew = []
+        with self.lock:
+            for name, subscription in self.subscriptions.items():
+                if subscription.state == "active" and now >= subscription.expires:
+                    logging.warning(f"Assinatura WebSub de {name} expirou; voltando ao polling.")
+                    self._lapse(subscription, now)
+                elif subscription.state == "pending" and now - subscription.requested >= VERIFY_TIMEOUT:
+                    logging.warning(f"Hub não confirmou a assinatura de {name}; mantendo o polling.")
+                    self._lapse(subscription, now)
+                elif subscription.state == "active" and now >= subscription.renew_at:
+                    renew.append(subscription)
+                elif subscription.state == "lapsed" and now >= subscription.retry_at:
+                    renew.append(subscription)
+            lapsed, self.lapsed = self.lapsed, []
+        for subscription in renew:
+            self._subscribe(subscription, now)
+        return lapsed
+
+    def _lapse(self, subscription, now):
+        if subscription.state == "active":
+            self.lapsed.append(subscription.source["name"])
+        subscription.state = "lapsed"
+        subscription.expires = None
+        subscription.retry_at = now + RETRY_INTERVAL
+
+    def active(self, name, now=None):
+        subscription = self.subscriptions.get(name)
+        return subscription is not None and subscription.state == "active" and \
+            (time.time() if now is None else now) < subscription.expires
+
+    def expires(self, name):
+        subscription = self.subscriptions.get(name)
+        return subscription.expires if subscription is not None else None
+
+    def wait(self, timeout):
+        """Espera até ``timeout`` segundos por entregas do hub; devolve os ``FetchResult`` recebidos."""
+        try:
+            results = [self.results.get(timeout=max(0, timeout))]
+        except queue.Empty:
+            return []
+        while True:
+            try:
+                results.append(self.results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def verify(self, path, params, now=None):
+        """Confirmação do hub (GET no callback); devolve o ``hub.challenge`` ou None para recusar."""
+        now = time.time() if now is None else now
+        mode = params.get("hub.mode")
+        with self.lock:
+            subscription = self.by_path.get(path)
+            if subscription is None or params.get("hub.topic") != subscription.topic:
+                return None
+            if mode == "denied":
+                logging.warning(f"Hub recusou a assinatura de {subscription.source['name']}: "
+                                f"{params.get('hub.reason', 'sem motivo')}")
+                self._lapse(subscription, now)
+                return ""
+            if mode != "subscribe" or subscription.state not in ("pending", "active"):
+                return None
+            lease = int(params.get("hub.lease_seconds") or self.lease_seconds)
+            subscription.state = "active"
+            subscription.expires = now + lease
+            subscription.renew_at = now + lease * RENEW_AT
+        logging.info(f"Assinatura WebSub de {subscription.source['name']} confirmada por {lease}s.")
+        return params.get("hub.challenge", "")
+
+    def deliver(self, path, body, signature):
+        """Entrega do hub (POST no callback): confere a assinatura e enfileira as entradas."""
+        subscription = self.by_path.get(path)
+        if subscription is None:
+            return False
+        method, _, digest = (signature or "").partition("=")
+        if method not in SIGNATURE_METHODS:
+            logging.warning(f"Entrega WebSub sem assinatura válida para {subscription.source['name']}; ignorada.")
+            return True
+        expected = hmac.new(subscription.secret.encode("utf-8"), body, method).hexdigest()
+        if not hmac.compare_digest(expected, digest):
+            logging.warning(f"Assinatura WebSub não confere para {subscription.source['name']}; entrega ignorada.")
+            return True
+        start = time.monotonic()
+        try:
+            items, error = subscription.agent.parse_pushed(subscription.source, body), None
+        except Exception as e:
+            items, error = [], e
+            logging.error(f"Erro ao ler a entrega WebSub de {subscription.source['name']}: {str(e)}")
+        with self.lock:
+            subscription.pushes += 1
+            subscription.last_push = time.time()
+        self.results.put(FetchResult(subscription.agent, subscription.source, items, error, time.monotonic() - start))
+        return True
+
+    def status(self):
+        now = time.time()
+        with self.lock:
+            return {
+                name: {
+                    "state": subscription.state,
+                    "hub": subscription.hub,
+                    "expires_in": round(subscription.expires - now) if subscription.expires else None,
+                    "pushes": subscription.pushes,
+                    "last_push_ago": round(now - subscription.last_push) if subscription.last_push else None
+                }
+                for name, subscription in self.subscriptions.items()
+            }
+
+
+class _CallbackHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body=b""):
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        challenge = self.server.subscriber.verify(url.path, params)
+        if challenge is None:
+            self._reply(404)
+        else:
+            self._reply(200, challenge.encode("utf-8"))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY:
+            self._reply(413)
+            return
+        body = self.rfile.read(length)
+        accepted = self.server.subscriber.deliver(urlsplit(self.path).path, body, self.headers.get("X-Hub-Signature"))
+        self._reply(202 if accepted else 404)
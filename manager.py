@@ -1,19 +1,36 @@
-import os
-import json
+import signal
 import time
 import logging
-from datetime import datetime
-from agents.g1_agent import G1Agent
-from agents.hora_campinas import HoraCampinasAgent
-from agents.prefeitura import PrefeituraCampinasAgent
-from agents.sampi import SampiCampinasAgent
-from agents.jornal_local import JornalLocalAgent
-from telegram import Bot # type: ignore
+from agents.registry import registered_agents
+from agents.source_agent import load_source_agents
+from core.engine import FetchEngine
+from core.archive import get_archive
+from core.delivery import get_worker
+from core.digest import format_single
+from core.enrichment import get_enricher
+from core.events import get_event_log
+from core.http import connection_stats
+from core.metrics import ITEMS_NEW, ITEMS_ROUTED, ITEMS_SEEN, QUEUE_DEPTH, REGISTRY, STAGE_SECONDS, start_status_server
+from core.near_duplicates import NearDuplicateIndex
+from core.process_pool import ProcessAgentPool
+from core.scheduler import AdaptiveScheduler
+from core.seen_store import compute_key, get_seen_store
+from core.snapshot import SNAPSHOT_INTERVAL, load_snapshot, write_snapshot
+from core.subscriptions import get_router
+from core.websub import MAINTAIN_INTERVAL, WebSubSubscriber
 
-CACHE_FILE = "news_cache.json"
-LOG_FILE = "logs.json"
 TELEGRAM_BOT_TOKEN = "xxxxxxxxxx"
 TELEGRAM_CHAT_ID = "xxxxxxxx"
+MAX_CONCURRENCY = 16
+# Prazo (s) de cada ciclo: fontes que ainda não responderam são adiadas e entregues quando terminarem.
+CYCLE_BUDGET = 30.0
+STATUS_PORT = 5000
+# Tempo máximo (s) que a busca de imagem/resumo das matérias pode segurar o envio; 0 desliga.
+ENRICH_DEADLINE = 3.0
+# Endereço público do callback WebSub (ex.: "http://<IP_DA_VPS>:5001"); None mantém só o polling.
+WEBSUB_CALLBACK_URL = None
+# "digest" junta as notícias de um ciclo em poucas mensagens; "single" manda uma por notícia.
+DELIVERY_MODE = "digest"
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,85 +38,187 @@ logging.basicConfig(
     handlers=[logging.StreamHandler()]
 )
 
-def load_cache():
-    if os.path.exists(CACHE_FILE):
-        try:
-            with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                content = f.read()
-                if content.strip():
-                    return set(json.loads(content))
-        except json.JSONDecodeError:
-            logging.error("Erro ao decodificar o arquivo de cache. Criando um novo cache.")
-    return set()
-
-def save_cache(cache):
-    with open(CACHE_FILE, "w", encoding="utf-8") as f:
-        json.dump(list(cache), f, ensure_ascii=False, indent=4)
+def send_to_telegram(news, agent_name=None, chats=(TELEGRAM_CHAT_ID,)):
+    worker = get_worker(TELEGRAM_BOT_TOKEN)
+    if DELIVERY_MODE == "digest":
+        for chat_id in chats:
+            worker.enqueue_item(chat_id, news, agent=agent_name)
+        return
+    message = format_single(news)
+    for chat_id in chats:
+        worker.enqueue(chat_id, message, parse_mode="HTML", agent=agent_name)
 
-def update_logs(agent_name, news_sent):
-    logs = {}
-    if os.path.exists(LOG_FILE):
+def process_results(results, global_cache, scheduler, clusters):
+    """Deduplica, agrupa e envia o resultado de um ciclo; devolve quantas notícias foram enfileiradas."""
+    events = get_event_log()
+    archive = get_archive()
+    start = time.perf_counter()
+    collected = {}
+    accepted = []
+    for result in results:
+        new_news = []
+        events.emit(
+            "fetch", result.agent.name, source=result.source["name"],
+            items=len(result.items) if isinstance(result.items, list) else 0,
+            elapsed=round(result.elapsed, 3), error=str(result.error) if result.error else None
+        )
+        if isinstance(result.items, list):
+            for news in result.items:
+                try:
+                    news_hash = compute_key(news["title"], news["link"])
+                    if global_cache.add(news_hash):
+                        new_news.append(news)
+                        accepted.append((news, news_hash))
+                except Exception as e:
+                    logging.error(f"Item inválido de {result.source['name']} ignorado ({str(e)}): {news}")
+            ITEMS_SEEN.labels(result.source["name"]).inc(len(result.items))
+            ITEMS_NEW.labels(result.source["name"]).inc(len(new_news))
+        else:
+            logging.error(f"Erro: A fonte {result.source['name']} retornou um valor inválido: {result.items}")
+        interval = scheduler.record(result.source["name"], len(new_news), error=result.error is not None)
+        logging.info(f"Fonte {result.source['name']}: próxima consulta em {interval:.0f}s.")
+        collected.setdefault(result.agent, []).extend(new_news)
+    STAGE_SECONDS.labels("dedup").observe(time.perf_counter() - start)
+    start = time.perf_counter()
+    survivors = clusters.filter([n for news in collected.values() for n in news])
+    unique = {id(news) for news in survivors}
+    STAGE_SECONDS.labels("cluster").observe(time.perf_counter() - start)
+    if survivors and ENRICH_DEADLINE > 0:
+        start = time.perf_counter()
+        enriched = get_enricher().enrich(survivors, deadline=ENRICH_DEADLINE)
+        STAGE_SECONDS.labels("enrich").observe(time.perf_counter() - start)
+        logging.info(f"{enriched} de {len(survivors)} notícias completadas com dados da matéria.")
+    # Arquivadas depois do enriquecimento, para o resumo e a imagem da matéria entrarem no índice.
+    for news, news_hash in accepted:
         try:
-            with open(LOG_FILE, "r", encoding="utf-8") as f:
-                logs = json.load(f)
-        except json.JSONDecodeError:
-            logs = {}
-    logs[agent_name] = {
-        "news_sent": news_sent,
-        "last_update": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    }
-    with open(LOG_FILE, "w", encoding="utf-8") as f:
-        json.dump(logs, f, ensure_ascii=False, indent=4)
+            archive.add(news, news_hash)
+        except Exception as e:
+            logging.error(f"Erro ao arquivar {news.get('link')}: {str(e)}")
+    start = time.perf_counter()
+    router = get_router(default_chat=TELEGRAM_CHAT_ID)
+    sent = 0
+    for agent, new_news in collected.items():
+        try:
+            for news in new_news:
+                events.emit(
+                    "item", agent.name, source=news["source"], title=news["title"],
+                    link=news["link"], duplicate=id(news) not in unique
+                )
+            new_news = [news for news in new_news if id(news) in unique]
+            if new_news:
+                logging.info(f"Agente {agent.name} encontrou {len(new_news)} notícias novas.")
+                for news in new_news:
+                    logging.info(f"Notícia encontrada: {news['title']}")
+                    chats = router.route(news)
+                    if not chats:
+                        logging.info(f"Nenhuma assinatura para: {news['title']}")
+                        continue
+                    send_to_telegram(news, agent.name, chats)
+                    for chat_id in chats:
+                        ITEMS_ROUTED.labels(chat_id).inc()
+                    sent += 1
+            else:
+                logging.info(f"Agente {agent.name} não encontrou novas notícias.")
+        except Exception as e:
+            logging.error(f"Erro ao executar o agente {agent.name}: {str(e)}")
+    global_cache.commit()
+    archive.commit()
+    STAGE_SECONDS.labels("send").observe(time.perf_counter() - start)
+    return sent
+
+def _process(results, global_cache, scheduler, clusters):
+    # Um resultado problemático não pode derrubar o monitor: registra e segue para o próximo lote.
+    try:
+        return process_results(results, global_cache, scheduler, clusters)
+    except Exception as e:
+        logging.error(f"Erro ao processar {len(results)} resultados: {str(e)}")
+        return 0
 
-def send_to_telegram(news):
-    bot = Bot(token=TELEGRAM_BOT_TOKEN)
-    message = (
-        f"📰 *Nova notícia encontrada!*\n\n"
-        f"📌 *Título:* {news['title']}\n"
-        f"🔗 *Link:* [Clique aqui]({news['link']})\n"
-        f"📅 *Data:* {news.get('date', 'Não informada')}\n"
-        f"📸 *Imagem:* {news.get('image', 'Sem imagem')}"
-    )
-    bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message, parse_mode="Markdown")
+def _terminate(signum, frame):
+    raise SystemExit(0)
 
 def monitor():
-    global_cache = load_cache()
-    agents = [
-        G1Agent(),
-        HoraCampinasAgent(),
-        PrefeituraCampinasAgent(),
-        SampiCampinasAgent(),
-        JornalLocalAgent()
-    ]
-    while True:
-        logging.info("Iniciando ciclo de monitoramento...")
+    start = time.monotonic()
+    snapshot = load_snapshot()
+    global_cache = get_seen_store(snapshot)
+    agents = load_source_agents() + registered_agents()
+    pool = ProcessAgentPool()
+    REGISTRY.add_section("process_pool", pool.status)
+    engine = FetchEngine(max_concurrency=MAX_CONCURRENCY, pool=pool)
+    scheduler = AdaptiveScheduler()
+    clusters = NearDuplicateIndex()
+    for agent in agents:
+        for source in agent.sources():
+            scheduler.add(source["name"])
+    if snapshot is not None:
+        scheduler.restore(snapshot.scheduler)
+    logging.info(f"Pronto em {(time.monotonic() - start) * 1000:.0f} ms"
+                 f"{' (estado retomado do snapshot)' if snapshot is not None else ''}.")
+    websub = None
+    if WEBSUB_CALLBACK_URL:
+        websub = WebSubSubscriber(WEBSUB_CALLBACK_URL, results=engine.results).start()
+    if websub is not None:
+        REGISTRY.add_section("websub", websub.status)
+        # O hub é descoberto na primeira busca de cada feed, então elas não esperam o agendamento salvo.
         for agent in agents:
-            try:
-                logging.info(f"Iniciando agente {agent.name}...")
-                news_list = agent.run()
-                if not isinstance(news_list, list):
-                    logging.error(f"Erro: O agente {agent.name} retornou um valor inválido: {news_list}")
-                    continue
-                new_news = []
-                for news in news_list:
-                    news_hash = hash(news["title"] + news["link"])
-                    if news_hash not in global_cache:
-                        new_news.append(news)
-                        global_cache.add(news_hash)
-                if new_news:
-                    logging.info(f"Agente {agent.name} encontrou {len(new_news)} notícias novas.")
-                    for news in new_news:
-                        logging.info(f"Notícia encontrada: {news['title']}")
-                        send_to_telegram(news)
-                        time.sleep(5)
-                    save_cache(global_cache)
-                    update_logs(agent.name, len(new_news))
-                else:
-                    logging.info(f"Agente {agent.name} não encontrou novas notícias.")
-            except Exception as e:
-                logging.error(f"Erro ao executar o agente {agent.name}: {str(e)}")
-        logging.info("Aguardando 5 minutos para o próximo ciclo...")
-        time.sleep(300)
+            for source in agent.sources():
+                if source.get("websub"):
+                    scheduler.postpone(source["name"], time.time())
+    start_status_server(STATUS_PORT)
+    signal.signal(signal.SIGTERM, _terminate)
+    try:
+        _loop(agents, engine, scheduler, global_cache, clusters, websub)
+    finally:
+        write_snapshot(global_cache, scheduler)
+
+def _loop(agents, engine, scheduler, global_cache, clusters, websub=None):
+    last_snapshot = time.monotonic()
+    while True:
+        if time.monotonic() - last_snapshot >= SNAPSHOT_INTERVAL:
+            write_snapshot(global_cache, scheduler)
+            last_snapshot = time.monotonic()
+        arrived = engine.wait_results(0)
+        if arrived:
+            logging.info(f"Recebidos {len(arrived)} resultados fora do ciclo (fontes adiadas ou WebSub).")
+            _process(arrived, global_cache, scheduler, clusters)
+        due = scheduler.pop_due()
+        if websub is not None:
+            websub.discover(agents)
+            for name in websub.maintain():
+                scheduler.postpone(name, time.time())
+            for name in [name for name in due if websub.active(name)]:
+                due.remove(name)
+                scheduler.postpone(name, websub.expires(name))
+        if not due:
+            next_due = scheduler.next_due()
+            # Sem nada agendado, todas as fontes estão em andamento ou adiadas: espera os resultados delas.
+            wait = CYCLE_BUDGET if next_due is None else max(0, next_due - time.time())
+            if websub is not None:
+                wait = min(wait, MAINTAIN_INTERVAL)
+            logging.info(f"Aguardando {wait:.0f}s para a próxima fonte...")
+            arrived = engine.wait_results(wait)
+            if arrived:
+                logging.info(f"Recebidos {len(arrived)} resultados fora do ciclo (fontes adiadas ou WebSub).")
+                _process(arrived, global_cache, scheduler, clusters)
+            continue
+        logging.info(f"Iniciando ciclo de monitoramento ({len(due)} fontes)...")
+        start = time.monotonic()
+        processing, received = 0.0, 0
+        # Cada lote é deduplicado e enviado assim que chega, sem esperar as fontes mais lentas.
+        for batch in engine.iter_cycle(agents, only=set(due), budget=CYCLE_BUDGET):
+            batch_start = time.monotonic()
+            _process(batch, global_cache, scheduler, clusters)
+            processing += time.monotonic() - batch_start
+            received += len(batch)
+        elapsed = time.monotonic() - start
+        STAGE_SECONDS.labels("fetch").observe(elapsed - processing)
+        STAGE_SECONDS.labels("cycle").observe(elapsed)
+        logging.info(f"Ciclo concluído em {elapsed:.1f}s: {received} de {len(due)} fontes no prazo.")
+        depth = get_worker(TELEGRAM_BOT_TOKEN).queue_depth()
+        QUEUE_DEPTH.labels().observe(depth)
+        logging.info(f"Fila de envio ao Telegram: {depth} mensagens.")
+        for host, stats in connection_stats().items():
+            logging.info(f"Conexões {host}: {stats['requests']} requisições, {stats['connections']} conexões abertas.")
 
 if __name__ == "__main__":
     monitor()
\ No newline at end of file